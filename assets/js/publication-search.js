@@ -0,0 +1,192 @@
+// Search and filters for the publications page.
+// Uses the inverted index written by search_index.py: every query word and
+// facet becomes a set of document ids, and the page only flips `hidden` on the
+// entries whose visibility changed. The index is only trusted if its digest
+// matches the entries on the page; otherwise (e.g. after a hand edit the index
+// was not rebuilt for) the same index is built from the page itself.
+(function () {
+  'use strict';
+
+  // Must match STOPWORDS in search_index.py
+  var STOPWORDS = new Set(['a', 'an', 'and', 'at', 'by', 'for', 'from', 'in', 'of', 'on', 'or',
+                           'the', 'to', 'via', 'with']);
+  var TYPE_LABELS = {journal: 'Journal', conference: 'Conference', preprint: 'Preprint'};
+
+  // Same rules as search_index.tokenize()
+  function tokenize(text) {
+    var words = text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '')
+      .match(/[\p{L}\p{N}]+/gu) || [];
+    return words.filter(function (w) { return w.length > 1 && !STOPWORDS.has(w); });
+  }
+
+  // Same as search_index.page_text()
+  function pageText(item) {
+    return item.textContent.split(/\s+/).filter(Boolean).join(' ') + '\u001f' +
+      (item.dataset.year || '') + '\u001f' + (item.dataset.type || '');
+  }
+
+  // Same as search_index.page_digest(): 32-bit FNV-1a over code points, in id order
+  // (preprints come last on the page but keep their position in the YAML file)
+  function pageDigest(items) {
+    var digest = 0x811c9dc5;
+    items.slice().sort(function (a, b) {
+      return a.dataset.pubId - b.dataset.pubId;
+    }).forEach(function (item, i) {
+      var text = (i ? '\n' : '') + pageText(item);
+      for (var char of text) digest = Math.imul(digest ^ char.codePointAt(0), 0x01000193) >>> 0;
+    });
+    return digest;
+  }
+
+  function decode(gaps) {
+    var ids = new Array(gaps.length), id = 0;
+    for (var i = 0; i < gaps.length; i++) {
+      id += gaps[i];
+      ids[i] = id;
+    }
+    return ids;
+  }
+
+  // {terms, postings: [[id]], facets: {year: {value: [id]}, type: {...}}} from the JSON file
+  function fromJson(index) {
+    var facets = {};
+    ['year', 'type'].forEach(function (name) {
+      facets[name] = {};
+      Object.keys(index.facets[name]).forEach(function (value) {
+        facets[name][value] = decode(index.facets[name][value]);
+      });
+    });
+    return {terms: index.terms, postings: index.postings.map(decode), facets: facets};
+  }
+
+  function add(map, key, id) {
+    (map[key] || (map[key] = [])).push(id);
+  }
+
+  function sortedFacet(map, compare) {
+    var out = {};
+    Object.keys(map).sort(compare).forEach(function (key) { out[key] = map[key]; });
+    return out;
+  }
+
+  // The same index, built from the entries on the page (search_index.build_search_index())
+  function fromPage(items) {
+    var postings = {}, years = {}, types = {};
+    items.forEach(function (item) {
+      var id = +item.dataset.pubId;
+      var words = new Set();
+      ['.pub-title', '.pub-authors', '.pub-venue'].forEach(function (selector) {
+        var field = item.querySelector(selector);
+        if (field) tokenize(field.textContent).forEach(function (w) { words.add(w); });
+      });
+      words.forEach(function (word) { add(postings, word, id); });
+      add(years, item.dataset.year || 'Unknown', id);
+      add(types, item.dataset.type || 'other', id);
+    });
+    var terms = Object.keys(postings).sort();
+    Object.keys(postings).forEach(function (word) {
+      postings[word].sort(function (a, b) { return a - b; });
+    });
+    return {
+      terms: terms,
+      postings: terms.map(function (term) { return postings[term]; }),
+      facets: {
+        // Newest first, Unknown last
+        year: sortedFacet(years, function (a, b) {
+          return (a === 'Unknown') - (b === 'Unknown') || (a < b ? 1 : a > b ? -1 : 0);
+        }),
+        type: sortedFacet(types)
+      }
+    };
+  }
+
+  // Index of the first term >= word
+  function lowerBound(terms, word) {
+    var lo = 0, hi = terms.length;
+    while (lo < hi) {
+      var mid = (lo + hi) >>> 1;
+      if (terms[mid] < word) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+  }
+
+  // Ids of documents with a term starting with `word` (typing "neuro" finds "neuromorphic")
+  function prefixMatches(index, word) {
+    var ids = new Set();
+    for (var i = lowerBound(index.terms, word);
+         i < index.terms.length && index.terms[i].lastIndexOf(word, 0) === 0; i++) {
+      index.postings[i].forEach(function (id) { ids.add(id); });
+    }
+    return ids;
+  }
+
+  function intersect(a, b) {
+    if (a === null) return b;
+    var out = new Set();
+    b.forEach(function (id) { if (a.has(id)) out.add(id); });
+    return out;
+  }
+
+  function addOptions(select, facet, label) {
+    Object.keys(facet).forEach(function (value) {
+      var option = document.createElement('option');
+      option.value = value;
+      option.textContent = label ? label(value) : value;
+      select.appendChild(option);
+    });
+  }
+
+  function init(form, items, index) {
+    var sections = Array.prototype.slice.call(document.querySelectorAll('.pub-section'));
+    var count = form.querySelector('.pub-filter-count');
+    var facets = {year: {}, type: {}};
+    ['year', 'type'].forEach(function (name) {
+      Object.keys(index.facets[name]).forEach(function (value) {
+        facets[name][value] = new Set(index.facets[name][value]);
+      });
+    });
+    addOptions(form.elements.year, index.facets.year);
+    addOptions(form.elements.type, index.facets.type, function (value) {
+      return TYPE_LABELS[value] || value;
+    });
+
+    function apply() {
+      var visible = null;
+      tokenize(form.elements.q.value).forEach(function (word) {
+        visible = intersect(visible, prefixMatches(index, word));
+      });
+      ['year', 'type'].forEach(function (name) {
+        var value = form.elements[name].value;
+        if (value) visible = intersect(visible, facets[name][value] || new Set());
+      });
+
+      var shown = 0;
+      items.forEach(function (item) {
+        var hide = visible !== null && !visible.has(+item.dataset.pubId);
+        if (item.hidden !== hide) item.hidden = hide;
+        if (!hide) shown++;
+      });
+      sections.forEach(function (section) {
+        section.hidden = !section.querySelector('.pub-item:not([hidden])');
+      });
+      count.textContent = visible === null ? '' : shown + ' of ' + items.length;
+    }
+
+    form.addEventListener('input', apply);
+    form.addEventListener('submit', function (event) { event.preventDefault(); });
+    form.hidden = false;
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    var form = document.getElementById('pub-filters');
+    if (!form) return;
+    var items = Array.prototype.slice.call(document.querySelectorAll('.pub-item[data-pub-id]'));
+    fetch(form.dataset.index)
+      .then(function (response) { return response.ok ? response.json() : null; })
+      .catch(function () { return null; })
+      .then(function (index) {
+        var current = index && index.count === items.length && index.digest === pageDigest(items);
+        init(form, items, current ? fromJson(index) : fromPage(items));
+      });
+  });
+})();
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Author-list helpers shared by the publication scripts.
+Repairs broken author fields, indexes authors and highlights you and your lab.
+Author lists are rebuilt by a single-pass tokenizer, so even consortium papers
+with thousands of authors are linear in the length of the field.
+"""
+
+import re
+from dataclasses import dataclass
+
+from scholar_profile import LAB_MEMBERS, YOUR_ALIASES, YOUR_NAME
+
+# Piece kinds produced by the tokenizers
+TEXT, SPACE, SEP = 0, 1, 2
+
+# Characters that separate two authors
+SEPARATORS = {',', ';', '&'}
+
+# The separator of BibTeX author lists
+AND_RE = re.compile(r'\s+and\s+')
+
+# Inline markup (the <strong> highlighting) is kept in names but not in Author fields
+TAG_RE = re.compile(r'<[^>]*>')
+
+@dataclass(frozen=True, slots=True)
+class Author:
+    """One author, split into given name(s) and family name
+
+    `member` is the person id of one of our people and `highlight` marks
+    names shown in bold, as in the author_list entries of publications.yml.
+    """
+    given: str
+    family: str
+    member: str | None = None
+    highlight: bool = False
+
+    @property
+    def name(self):
+        return f"{self.given} {self.family}" if self.given else self.family
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def from_name(cls, name):
+        """Split 'Given Names Family' (markup is dropped)"""
+        words = TAG_RE.sub('', name).split()
+        if not words:
+            return cls('', '')
+        # Lowercase particles belong to the family name: "Jan van der Berg"
+        split = len(words) - 1
+        while split > 1 and words[split - 1].islower():
+            split -= 1
+        return cls(' '.join(words[:split]), ' '.join(words[split:]))
+
+    @classmethod
+    def from_dict(cls, record):
+        """From an author_list entry"""
+        return cls(record.get('given') or '', record.get('family') or '',
+                   record.get('member'), bool(record.get('highlight')))
+
+    def to_dict(self):
+        """The author_list entry, leaving out unset member/highlight"""
+        record = {'given': self.given, 'family': self.family}
+        if self.member:
+            record['member'] = self.member
+        if self.highlight:
+            record['highlight'] = True
+        return record
+
+def _char_list_pieces(char_list):
+    """Classify the items of a one-character-per-item authors list
+
+    These lists lose some of the spaces between names, so a lowercase letter
+    directly followed by an uppercase one ("SmithBob") is treated as two
+    run-together names. Only this broken format gets that repair.
+    """
+    prev_lower = False
+    for item in char_list:
+        char = str(item).strip()
+        if char == '':
+            yield SPACE, None  # Empty strings stand for the spaces of the original string
+        elif char in SEPARATORS:
+            yield SEP, None
+        else:
+            if prev_lower and char[0].isupper():
+                yield SEP, None
+            yield TEXT, char
+        prev_lower = char[-1:].islower()
+
+def _string_pieces(authors_str):
+    """Classify the characters of an authors string
+
+    Markup tags are passed through whole. Case is left alone, so names like
+    "LeCun" or "McDonald" stay in one piece.
+    """
+    i, n = 0, len(authors_str)
+    while i < n:
+        char = authors_str[i]
+        if char == '<':
+            end = authors_str.find('>', i)
+            if end != -1:
+                yield TEXT, authors_str[i:end + 1]
+                i = end + 1
+                continue
+        if char.isspace():
+            yield SPACE, None
+        elif char in SEPARATORS:
+            yield SEP, None
+        else:
+            yield TEXT, char
+        i += 1
+
+def _group_names(pieces):
+    """Single-pass state machine turning pieces into author names (lists of words)
+
+    Words are delimited by spaces; authors by separators or a standalone "and".
+    Runs in O(n) regardless of how many blanks or authors there are.
+    """
+    names, words, word = [], [], []
+    for kind, text in pieces:
+        if kind == TEXT:
+            word.append(text)
+            continue
+        if word:
+            token = ''.join(word)
+            word = []
+            if token.lower() == 'and':
+                kind = SEP
+            else:
+                words.append(token)
+        if kind == SEP and words:
+            names.append(words)
+            words = []
+    if word:
+        token = ''.join(word)
+        if token.lower() != 'and':
+            words.append(token)
+    if words:
+        names.append(words)
+    return names
+
+def author_names_from_chars(char_list):
+    """Author names from a one-character-per-item list"""
+    return [' '.join(words) for words in _group_names(_char_list_pieces(char_list or []))]
+
+def author_names_from_string(authors_str):
+    """Author names from 'A, B and C' style strings
+
+    BibTeX-style 'Family, Given and Family, Given' strings are split on 'and'
+    only, and each name is turned into 'Given Family'.
+    """
+    parts = AND_RE.split(authors_str or '')
+    if len(parts) > 1 and all(part.count(',') == 1 for part in parts):
+        return [' '.join(w for w in (given.strip(), family.strip()) if w)
+                for family, given in (part.split(',') for part in parts)]
+    return [' '.join(words) for words in _group_names(_string_pieces(authors_str or ''))]
+
+def reconstruct_authors_from_chars(char_list):
+    """Reconstruct author names from a list of individual characters"""
+    # The pattern is: ['C', 'h', 'e', 'n', 'y', 'u', '', 'T', 'a', 'n', 'g', '', 'a', 'n', 'd', '', ...]
+    # Empty strings represent spaces, and "and" separates authors
+    return ', '.join(author_names_from_chars(char_list))
+
+def is_char_list(authors):
+    """True if an authors list is the broken one-character-per-item format"""
+    if not authors:
+        return False
+    # Check if most items are single characters
+    char_count = sum(1 for c in authors if isinstance(c, str) and len(c.strip()) == 1 and c.strip().isalnum())
+    return char_count > len(authors) * 0.5  # More than 50% are single chars
+
+def format_author_string(authors_str):
+    """Put an authors string into 'A, B, C' form in a single pass"""
+    return ', '.join(author_names_from_string(authors_str))
+
+def author_names(authors):
+    """Author names from any authors value (string, name list or char list)"""
+    if isinstance(authors, list):
+        if is_char_list(authors):
+            return author_names_from_chars(authors)
+        return [str(a).strip() for a in authors if str(a).strip()]
+    if isinstance(authors, str):
+        return author_names_from_string(authors)
+    return []
+
+def parse_authors(authors):
+    """Structured Author records from any authors value"""
+    return [Author.from_name(name) for name in author_names(authors)]
+
+def normalize_authors(authors):
+    """Turn any authors value (string, name list or char list) into 'A, B, C'"""
+    return ', '.join(author_names(authors))
+
+def name_variations(name):
+    """Ways a name is commonly written in author lists"""
+    parts = name.split()
+    if not parts:
+        return []
+    return [
+        name,
+        parts[0] + " " + parts[-1],  # First Last
+        parts[0][0] + ". " + parts[-1],  # F. Last
+    ]
+
+def name_key(name):
+    """Case-, dot- and markup-insensitive lookup key for a name"""
+    return ' '.join(TAG_RE.sub('', name).replace('.', ' ').lower().split())
+
+def person_id(name):
+    """Slug used to refer to a person, e.g. 'shengbo-wang'"""
+    return '-'.join(name_key(name).split())
+
+def profile_people(your_name=YOUR_NAME, aliases=YOUR_ALIASES, lab_members=LAB_MEMBERS):
+    """{person id: [names]} for you and your lab, as configured in scholar_profile.py"""
+    people = {person_id(your_name): [your_name, *aliases]}
+    for member, names in lab_members.items():
+        people.setdefault(member, []).extend(names)
+    return people
+
+class AuthorMatcher:
+    """Recognises you and your lab members in author lists
+
+    Every accepted spelling of every person is normalised into one dict when
+    the matcher is built, so matching is a single lookup per author and can
+    never hit part of someone else's name.
+    """
+
+    def __init__(self, people):
+        self._people = {}
+        for pid, names in people.items():
+            for name in names:
+                for variation in name_variations(name):
+                    self._people.setdefault(name_key(variation), pid)
+
+    def match(self, name):
+        """Person id for an author name, or None"""
+        return self._people.get(name_key(name))
+
+    def index(self, authors):
+        """Ordered author records plus the ids of the people found among them
+
+        Authors that were already bold (e.g. highlighted by hand) stay bold.
+        """
+        author_list, members = [], []
+        for name in author_names(authors):
+            author = Author.from_name(name)
+            member = self.match(author.name)
+            if member and member not in members:
+                members.append(member)
+            author_list.append(Author(author.given, author.family, member,
+                                      bool(member) or '<strong>' in name).to_dict())
+        return author_list, members
+
+def render_authors(author_list):
+    """The 'A, <strong>B</strong>, C' string shown on the site"""
+    names = []
+    for record in author_list:
+        name = f"{record['given']} {record['family']}" if record.get('given') else record['family']
+        # Use HTML strong tag for Jekyll
+        names.append(f"<strong>{name}</strong>" if record.get('highlight') else name)
+    return ', '.join(names)
+
+def highlight_author(authors_str, name):
+    """Bold a name in the authors string (no-op if it is already bold)"""
+    if not authors_str or not name:
+        return authors_str
+    author_list, _ = AuthorMatcher({person_id(name): [name]}).index(authors_str)
+    return render_authors(author_list)
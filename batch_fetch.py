@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Script to fetch the publications of a whole lab roster from Google Scholar
+Profiles are listed in parallel on a process pool. Papers shared by several
+members are filled only once, then written to one YAML file per member plus a
+merged lab file.
+Usage: python batch_fetch.py [--roster roster.yml] [--processes N] [--workers N] [--rate REQ_PER_SEC]
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from dedupe import merge_duplicates
+from fetch_publications import (DEFAULT_RATE, DEFAULT_WORKERS, build_yaml_data, make_backend,
+                                raw_entry)
+from fetch_state import title_hash
+from metadata_index import MetadataIndex
+from pub_io import load_yaml, save_yaml
+from publication_pipeline import Pipeline, build_stages
+from rate_limiter import AdaptiveRateLimiter, fill_concurrently
+from scholar_cache import CACHE_FILE
+
+ROSTER_FILE = 'roster.yml'
+OUTPUT_DIR = '_data/lab'
+MERGED_FILE = '_data/lab_publications.yml'
+DEFAULT_PROCESSES = 4
+
+def load_roster(filename=ROSTER_FILE):
+    """Read the roster: a `members` list of {id, name, scholar_id, aliases}"""
+    roster = load_yaml(filename) or {}
+    members = roster.get('members') or []
+    for member in members:
+        missing = [key for key in ('id', 'name', 'scholar_id') if not member.get(key)]
+        if missing:
+            raise ValueError(f"Roster entry {member} is missing {', '.join(missing)}")
+    return members
+
+def roster_people(members):
+    """{person id: [names]} for highlighting every member in author lists"""
+    return {m['id']: [m['name'], *(m.get('aliases') or [])] for m in members}
+
+def list_member_publications(member, backend_options):
+    """Worker: the (unfilled) publications on one member's profile"""
+    backend = make_backend(**backend_options)
+    try:
+        author = backend.fill(backend.search_author_id(member['scholar_id']))
+    except Exception as e:
+        print(f"  Error fetching profile of {member['name']}: {e}")
+        return member['id'], None
+    pubs = author.get('publications', [])
+    print(f"  {member['name']}: {len(pubs)} publications")
+    return member['id'], pubs
+
+def fill_chunk(pubs, backend_options, workers, rate):
+    """Worker: fill a share of the unique publications with its own rate limiter"""
+    backend = make_backend(**backend_options)
+
+    def report_error(index, e):
+        print(f"  Error processing publication: {e}")
+
+    return fill_concurrently(pubs, backend.fill, workers=workers,
+                             limiter=AdaptiveRateLimiter(rate=rate), on_error=report_error,
+                             cached=getattr(backend, 'is_cached', None))
+
+def dedupe_publications(listings):
+    """Collapse papers listed on several profiles
+
+    Returns the unique publications (first listing wins) and, for each, the ids
+    of the members whose profiles list it.
+    """
+    unique, owners, seen = [], [], {}
+    for member_id, pubs in listings:
+        for pub in pubs or []:
+            key = title_hash(pub.get('bib', {}).get('title'))
+            if key in seen:
+                if member_id not in owners[seen[key]]:
+                    owners[seen[key]].append(member_id)
+                continue
+            seen[key] = len(unique)
+            unique.append(pub)
+            owners.append([member_id])
+    return unique, owners
+
+def batch_fetch(members, processes=DEFAULT_PROCESSES, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                backend_options=None, metadata=None):
+    """Fetch all members' publications; returns the deduplicated list of lab entries
+
+    With a `metadata` index (see metadata_index.py), entries are matched against
+    it in one batch before the pipeline stages run.
+    """
+    backend_options = backend_options or {}
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        print(f"Listing {len(members)} profiles...")
+        listings = list(pool.map(list_member_publications, members,
+                                 [backend_options] * len(members)))
+
+        unique, owners = dedupe_publications(listings)
+        total = sum(len(pubs or []) for _, pubs in listings)
+        print(f"Found {total} listings, {len(unique)} unique publications")
+
+        # Round-robin chunks; the overall request rate is split between processes
+        chunks = [unique[i::processes] for i in range(processes)]
+        futures = [pool.submit(fill_chunk, chunk, backend_options, workers, rate / processes)
+                   for chunk in chunks if chunk]
+        filled = [None] * len(unique)
+        for i, future in enumerate(futures):
+            filled[i::processes] = future.result()
+
+    raw = [(raw_entry(filled_pub), pub_owners)
+           for filled_pub, pub_owners in zip(filled, owners) if filled_pub is not None]
+    raw = [(entry, pub_owners) for entry, pub_owners in raw if entry is not None]
+    if metadata is not None:
+        enriched = metadata.enrich(entry for entry, _ in raw)
+        print(f"Enriched {enriched} publications from {metadata.filename}")
+
+    pipeline = Pipeline(build_stages(people=roster_people(members)))
+    entries = []
+    for entry, pub_owners in raw:
+        entry = pipeline.process(entry)
+        if entry is None:
+            continue
+        # Profile ownership counts even when the name is spelled unexpectedly
+        entry['members'] = pub_owners + [m for m in entry.get('members', []) if m not in pub_owners]
+        entries.append(entry)
+        print(f"  - {entry['title'][:60]}... ({entry['year']})")
+    # Exact title matches were collapsed before filling; now catch preprint/published pairs
+    return merge_duplicates(entries)
+
+def save_lab_files(entries, members, output_dir=OUTPUT_DIR, merged_file=MERGED_FILE):
+    """Write one YAML file per member plus the merged lab file"""
+    os.makedirs(output_dir, exist_ok=True)
+    for member in members:
+        own = [entry for entry in entries if member['id'] in entry['members']]
+        filename = os.path.join(output_dir, f"{member['id']}.yml")
+        save_yaml(build_yaml_data(own), filename)
+        print(f"✓ Saved {len(own)} publications to {filename}")
+    save_yaml(build_yaml_data(list(entries)), merged_file)
+    print(f"✓ Saved {len(entries)} lab publications to {merged_file}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch publications for every member of a lab roster")
+    parser.add_argument('--roster', default=ROSTER_FILE, help=f"roster YAML file (default: {ROSTER_FILE})")
+    parser.add_argument('--processes', type=int, default=DEFAULT_PROCESSES,
+                        help=f"worker processes (default: {DEFAULT_PROCESSES})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"concurrent fill requests per process (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"max Scholar requests per second across all processes (default: {DEFAULT_RATE})")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help=f"directory for per-member YAML files (default: {OUTPUT_DIR})")
+    parser.add_argument('--merged', default=MERGED_FILE,
+                        help=f"merged lab YAML file (default: {MERGED_FILE})")
+    parser.add_argument('--cache-file', default=CACHE_FILE,
+                        help=f"on-disk Scholar response cache (default: {CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="talk to Scholar directly without the response cache")
+    parser.add_argument('--metadata-index', metavar='FILE',
+                        help="fill in DOIs, venues, volumes and pages from an index built by metadata_index.py")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument('--cache-only', action='store_true',
+                            help="answer every lookup from the cache and never contact Scholar")
+    cache_mode.add_argument('--refresh', action='store_true',
+                            help="ignore cached responses but record fresh ones")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print("=" * 60)
+    print("Google Scholar Lab Roster Fetcher")
+    print("=" * 60)
+
+    members = load_roster(args.roster)
+    backend_options = {
+        'cache_file': args.cache_file,
+        'no_cache': args.no_cache,
+        'cache_only': args.cache_only,
+        'refresh': args.refresh,
+    }
+    metadata = MetadataIndex(args.metadata_index) if args.metadata_index else None
+    entries = batch_fetch(members, processes=args.processes, workers=args.workers, rate=args.rate,
+                          backend_options=backend_options, metadata=metadata)
+
+    if entries:
+        save_lab_files(entries, members, args.output_dir, args.merged)
+        print("\n✓ Done! Lab publications have been updated.")
+    else:
+        print("\n✗ Failed to fetch publications. Please check the error messages above.")
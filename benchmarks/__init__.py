@@ -0,0 +1 @@
+"""Offline benchmarks for the publication scripts; run from the repo root with python -m benchmarks.<name>"""
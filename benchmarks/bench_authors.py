@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Benchmark for author-list reconstruction.
+Builds broken one-character-per-item author lists (the format Scholar exports
+sometimes end up in) and "A and B and C" strings for consortium-sized papers,
+then times the single-pass tokenizer in authors.py. Time per author should
+stay flat as the list grows.
+Usage: python -m benchmarks.bench_authors [--authors 100 1000 10000]
+"""
+
+import argparse
+import random
+import time
+
+from authors import format_author_string, parse_authors, reconstruct_authors_from_chars
+
+GIVEN = ['Chenyu', 'Shuo', 'Luigi G', 'Jean-Luc', 'Mengtian', 'Peter', 'Wenhui', 'Arokia']
+FAMILY = ['Tang', 'Gao', 'Occhipinti', 'van der Berg', 'Kang', 'Smielewski', 'Song', 'Nathan']
+
+def author_string(count, seed=0):
+    rng = random.Random(seed)
+    return ' and '.join(f"{rng.choice(GIVEN)} {rng.choice(FAMILY)}" for _ in range(count))
+
+def char_list(authors_str, seed=0):
+    """Explode a string into the broken format, with occasional runs of blanks"""
+    rng = random.Random(seed)
+    chars = []
+    for char in authors_str:
+        if char == ' ':
+            chars.extend([''] * rng.choice([1, 1, 1, 3, 10]))
+        else:
+            chars.append(char)
+    return chars
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def bench(count):
+    text = author_string(count)
+    chars = char_list(text)
+    t_chars = best_of(lambda: reconstruct_authors_from_chars(chars))
+    t_string = best_of(lambda: format_author_string(text))
+    t_parse = best_of(lambda: parse_authors(chars))
+    print(f"{count:>6} authors ({len(chars):>7} items)  "
+          f"chars->string {t_chars * 1000:8.2f} ms ({t_chars / count * 1e6:5.2f} us/author)  "
+          f"string {t_string * 1000:8.2f} ms  chars->Author {t_parse * 1000:8.2f} ms")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark author-list reconstruction")
+    parser.add_argument('--authors', type=int, nargs='+', default=[100, 1000, 10000])
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    for count in args.authors:
+        bench(count)
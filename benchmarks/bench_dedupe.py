@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark for near-duplicate detection.
+Generates synthetic publication lists in which a share of the papers also
+appear as a lightly edited preprint, then times dedupe.find_duplicates. With
+LSH blocking the time per record stays roughly flat as the list grows, where
+an all-pairs comparison would grow linearly per record.
+Usage: python -m benchmarks.bench_dedupe [--entries 5000 20000 50000] [--dup-rate 0.1]
+"""
+
+import argparse
+import random
+import time
+
+from dedupe import candidate_pairs, find_duplicates, shingles, sketch
+
+SYLLABLES = ('neu ro mor phic mem ris tor spi king net work lear ning e dge sto chas tic com pu '
+             'ting hard ware ef fi cient in fe rence wea ra ble sen sor gra ph trans for mer re ser '
+             'voir ana log cross bar sy nap tic car bon na no tube pho to nic quan tum').split()
+
+def vocabulary(size=5000, seed=0):
+    """Pseudo-words, so that unrelated titles share as little as real ones do"""
+    rng = random.Random(seed)
+    return sorted({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                   for _ in range(size)})
+
+def preprint_title(words, rng):
+    """How the preprint of a paper tends to differ: case, punctuation, hyphens"""
+    variant = list(words)
+    edit = rng.randrange(3)
+    if edit == 0:
+        i = rng.randrange(len(variant) - 1)
+        variant[i:i + 2] = [variant[i] + '-' + variant[i + 1]]
+    elif edit == 1:
+        variant.insert(rng.randrange(len(variant)), rng.choice(['a', 'the', 'for', 'with']))
+    title = ' '.join(variant)
+    if rng.random() < 0.5:
+        title = title.title()
+    return title + rng.choice(['', '.', ' (extended version)'])
+
+def synthetic_records(count, dup_rate=0.1, seed=0):
+    """Records plus the number of planted duplicate pairs"""
+    rng = random.Random(seed)
+    words_pool = vocabulary()
+    records, planted = [], 0
+    while len(records) < count:
+        words = [rng.choice(words_pool) for _ in range(rng.randint(7, 14))]
+        title = ' '.join(words).capitalize()
+        records.append({'title': title, 'type': 'journal',
+                        'links': {'pdf': f"https://example.org/{len(records)}"}})
+        if rng.random() < dup_rate and len(records) < count:
+            records.append({'title': preprint_title(words, rng), 'type': 'preprint',
+                            'venue': 'arXiv preprint',
+                            'links': {'pdf': f"https://arxiv.org/abs/{len(records)}"}})
+            planted += 1
+    return records, planted
+
+def bench(count, dup_rate):
+    records, planted = synthetic_records(count, dup_rate)
+    start = time.perf_counter()
+    groups = find_duplicates(records)
+    elapsed = time.perf_counter() - start
+    candidates = len(candidate_pairs([sketch(shingles(r['title'])) for r in records]))
+    found = sum(len(g) - 1 for g in groups)
+    print(f"{count:>7} records  {elapsed:6.2f} s  ({elapsed / count * 1e6:6.1f} us/record)  "
+          f"planted {planted}, merged {found}  "
+          f"compared {candidates:,} pairs (all-pairs: {count * (count - 1) // 2:,})")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection")
+    parser.add_argument('--entries', type=int, nargs='+', default=[5000, 20000, 50000])
+    parser.add_argument('--dup-rate', type=float, default=0.1,
+                        help="share of papers that also appear as a preprint")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    for count in args.entries:
+        bench(count, args.dup_rate)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Load test of fetch_publications() against a replayed Scholar.
+Serves a synthetic profile (or a fixture recorded with --record) through
+ReplayScholar with per-request latency and injected rate limiting, and runs
+the fetcher at several worker counts. Each run reports wall time, requests,
+rate-limited responses, retries, publications that failed for good, and how
+far the adaptive limiter backed off. With --cache the profile is fetched twice
+through a fresh response cache, so the warm run shows the cache's effect.
+Usage: python -m benchmarks.bench_fetch_replay [--entries 1000] [--workers 1 4 16]
+       [--latency 0.05] [--error-rate 0.05] [--max-rate 40] [--rate 50] [--cache] [--fixture FILE]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks import fake_scholarly
+
+fake_scholarly.install()
+
+import fetch_publications  # noqa: E402  (needs the scholarly module in place)
+from benchmarks.corpus import scholar_corpus  # noqa: E402
+from run_metrics import RunMetrics  # noqa: E402
+from scholar_cache import CachedScholar, ResponseCache  # noqa: E402
+from scholar_replay import ReplayScholar, fixture_from_publications, load_fixture  # noqa: E402
+
+def run(backend, workers, rate):
+    metrics = RunMetrics()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # the fetcher prints per entry
+        data = fetch_publications.fetch_publications(workers=workers, rate=rate, backend=backend,
+                                                     metrics=metrics)
+    elapsed = time.perf_counter() - start
+    failed = sum(metrics.errors.get('fill', {}).values())
+    limiter = metrics.sections.get('limiter', {})
+    return (f"{elapsed:8.2f} s  {len((data or {}).get('publications', [])):>6} saved  "
+            f"{metrics.counters.get('retries', 0):>5} retries  {failed:>4} failed  "
+            f"{limiter.get('backoffs', 0):>4} backoffs  final rate {limiter.get('final_rate', 0):7.2f}/s")
+
+def bench(responses, workers, args):
+    replay = ReplayScholar(responses, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           max_rate=args.max_rate, seed=args.seed)
+    if not args.cache:
+        line = run(replay, workers, args.rate)
+        stats = replay.stats()
+        print(f"  {workers:>3} workers  {line}  {stats['requests']:>6} requests "
+              f"({stats['rate_limited']} rate-limited)")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(os.path.join(directory, 'cache.sqlite3'))
+        for label in ('cold', 'warm'):
+            before = replay.stats()['requests']
+            line = run(CachedScholar(replay, cache), workers, args.rate)
+            print(f"  {workers:>3} workers {label}  {line}  "
+                  f"{replay.stats()['requests'] - before:>6} requests  {cache.hits} cache hits")
+        cache.close()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the fetcher against a replayed Scholar")
+    parser.add_argument('--entries', type=int, default=1000, help="synthetic profile size (default: 1000)")
+    parser.add_argument('--fixture', help="replay this recorded fixture instead of a synthetic profile")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16],
+                        help="worker counts to compare (default: 1 4 16)")
+    parser.add_argument('--rate', type=float, default=50.0,
+                        help="fetcher's starting request rate per second (default: 50)")
+    parser.add_argument('--latency', type=float, default=0.02,
+                        help="seconds per simulated request (default: 0.02)")
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="up to this many extra seconds per request (default: 0)")
+    parser.add_argument('--error-rate', type=float, default=0.02,
+                        help="fraction of fills answered as rate-limited (default: 0.02)")
+    parser.add_argument('--max-rate', type=float,
+                        help="rate-limit fills beyond this many per second")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the injected faults")
+    parser.add_argument('--cache', action='store_true',
+                        help="fetch through a fresh response cache, cold then warm")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    responses = (load_fixture(args.fixture) if args.fixture
+                 else fixture_from_publications(scholar_corpus(args.entries)))
+    print(f"{args.fixture or f'{args.entries} synthetic publications'}: latency {args.latency}s, "
+          f"error rate {args.error_rate}, server limit {args.max_rate or 'none'}")
+    for workers in args.workers:
+        bench(responses, workers, args)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the pre-rendered publication fragments.
+Builds a throwaway Jekyll site holding publications.html and a synthetic
+publications.yml, and times `jekyll build` with the Liquid loops and again
+with fragments from render_publications.py. The fragment render itself is
+timed too: from scratch, and again after one entry changed (only its year is
+rewritten). Without a jekyll executable only the render times are reported.
+Usage: python -m benchmarks.bench_fragments [--entries 100 1000 10000] [--jekyll "bundle exec jekyll"]
+"""
+
+import argparse
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import time
+
+from benchmarks.bench_yaml import synthetic_publications
+from pub_io import save_yaml
+from render_publications import write_fragments
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the page under test; the real layout needs plugins the benchmark does not
+SITE_CONFIG = {'title': 'Benchmark', 'baseurl': '', 'markdown': 'kramdown', 'plugins': [],
+               'prerendered_publications': True}
+LAYOUT = '<!DOCTYPE html>\n<html><body>{{ content }}</body></html>\n'
+
+def make_site(directory, publications):
+    os.makedirs(os.path.join(directory, '_layouts'))
+    os.makedirs(os.path.join(directory, '_data'))
+    with open(os.path.join(directory, '_layouts', 'default.html'), 'w') as f:
+        f.write(LAYOUT)
+    shutil.copy(os.path.join(REPO_ROOT, 'publications.html'), directory)
+    save_yaml(SITE_CONFIG, os.path.join(directory, '_config.yml'))
+    save_yaml({'publications': publications}, os.path.join(directory, '_data', 'publications.yml'))
+
+def jekyll_build(jekyll, directory):
+    start = time.perf_counter()
+    subprocess.run(jekyll + ['build', '--quiet', '--source', directory,
+                             '--destination', os.path.join(directory, '_site')],
+                   check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+def bench(count, jekyll):
+    publications = synthetic_publications(count)['publications']
+    publications.sort(key=lambda p: p['year'], reverse=True)
+    with tempfile.TemporaryDirectory() as directory:
+        make_site(directory, publications)
+        fragment_dir = os.path.join(directory, '_includes', 'publications')
+        manifest = os.path.join(directory, '_data', 'publication_fragments.yml')
+
+        loops = jekyll_build(jekyll, directory) if jekyll else None
+
+        start = time.perf_counter()
+        write_fragments(publications, fragment_dir, manifest)
+        render = time.perf_counter() - start
+        publications[count // 2]['title'] += ' (revised)'
+        start = time.perf_counter()
+        written = write_fragments(publications, fragment_dir, manifest)
+        rerender = time.perf_counter() - start
+
+        line = (f"{count:>7} entries  render {render:6.2f}s  "
+                f"re-render {rerender:6.2f}s ({len(written)} written)")
+        if jekyll:
+            line += f"  jekyll loops {loops:6.2f}s  fragments {jekyll_build(jekyll, directory):6.2f}s"
+        print(line)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Jekyll builds with and without fragments")
+    parser.add_argument('--entries', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--jekyll', default='jekyll',
+                        help="command that runs Jekyll (default: jekyll)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    jekyll = shlex.split(args.jekyll)
+    if not shutil.which(jekyll[0]):
+        print(f"{jekyll[0]} not found; reporting render times only")
+        jekyll = None
+    for count in args.entries:
+        bench(count, jekyll)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark for offline metadata enrichment.
+Writes a synthetic Crossref-style JSONL dump, indexes it with
+metadata_index.build_index, then matches a publication list against it one
+record per query and in batches. Peak memory of the lookups stays flat however
+large the dump is, because the index is queried on disk rather than loaded.
+Usage: python -m benchmarks.bench_metadata [--works 200000] [--records 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from metadata_index import MetadataIndex, build_index
+
+WORDS = ('memristor neuromorphic spiking network learning edge stochastic computing hardware '
+         'efficient inference wearable sensor graph transformer reservoir analog crossbar '
+         'synaptic carbon nanotube photonic quantum adaptive perception tactile').split()
+
+def synthetic_dump(filename, count, seed=0):
+    """Crossref-style works; returns (title, year, doi) of each"""
+    rng = random.Random(seed)
+    works = []
+    with open(filename, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))) + f" {i}"
+            year = rng.randint(2000, 2025)
+            doi = f"10.{1000 + i % 9000}/synthetic.{i}"
+            works.append((title, year, doi))
+            f.write(json.dumps({
+                'DOI': doi, 'title': [title], 'container-title': [f"Journal of {rng.choice(WORDS)}"],
+                'volume': str(rng.randint(1, 60)), 'page': f"{i}-{i + 9}",
+                'issued': {'date-parts': [[year]]},
+            }) + '\n')
+    return works
+
+def make_records(works, count, seed=0):
+    """Half with a DOI link, half matched by title only, some not in the dump"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        title, year, doi = rng.choice(works)
+        if i % 10 == 0:
+            records.append({'title': f"unpublished draft {i}", 'venue': '', 'year': year})
+        elif i % 2:
+            records.append({'title': title, 'venue': 'IEEE', 'year': year,
+                            'links': {'doi': f"https://doi.org/{doi}"}})
+        else:
+            records.append({'title': title.upper(), 'venue': '', 'year': year})
+    return records
+
+def bench_lookup(index_file, records, batch_size):
+    index = MetadataIndex(index_file, batch_size=batch_size)
+    tracemalloc.start()
+    start = time.perf_counter()
+    matches = index.lookup(records) if batch_size > 1 else [index.lookup([r])[0] for r in records]
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    index.close()
+    return elapsed, peak, sum(m is not None for m in matches)
+
+def bench(works_count, records_count):
+    with tempfile.TemporaryDirectory() as tmp:
+        dump_file = os.path.join(tmp, 'dump.jsonl')
+        index_file = os.path.join(tmp, 'index.sqlite3')
+        works = synthetic_dump(dump_file, works_count)
+
+        start = time.perf_counter()
+        build_index(dump_file, index_file, verbose=False)
+        build_time = time.perf_counter() - start
+        print(f"Indexed {works_count} works in {build_time:.2f} s "
+              f"({os.path.getsize(dump_file) / 1e6:.0f} MB dump -> "
+              f"{os.path.getsize(index_file) / 1e6:.0f} MB index)")
+
+        records = make_records(works, records_count)
+        for batch_size in (1, 500):
+            elapsed, peak, matched = bench_lookup(index_file, records, batch_size)
+            print(f"  batch {batch_size:>4}  {elapsed:6.3f} s  ({elapsed / len(records) * 1e6:6.1f} us/record)  "
+                  f"peak {peak / 1e6:5.2f} MB  matched {matched}/{len(records)}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline metadata enrichment")
+    parser.add_argument('--works', type=int, default=200000, help="works in the synthetic dump")
+    parser.add_argument('--records', type=int, default=5000, help="publications to match")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    bench(args.works, args.records)
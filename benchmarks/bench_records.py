@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the typed publication records.
+Loads a synthetic, fully processed publications.yml (with author_list and
+members, as in a merged lab file) once as plain dicts with load_yaml() and
+once as validated records with load_records(), and reports the load time and
+the memory the loaded data keeps alive (tracemalloc, after the load).
+Usage: python -m benchmarks.bench_records [--entries 1000 10000 50000]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_yaml import synthetic_publications
+from pub_io import load_yaml, save_yaml
+from publication_pipeline import Pipeline, build_stages
+from records import load_records
+
+def retained(load, filename):
+    """(seconds, MiB still allocated once load(filename) returned)"""
+    start = time.perf_counter()
+    load(filename)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = load(filename)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del data
+    return elapsed, size / 2 ** 20
+
+def bench(count, directory):
+    filename = os.path.join(directory, f"publications-{count}.yml")
+    pipeline = Pipeline(build_stages(['highlight'], people={'author3': ['Author3 Surname5']}))
+    save_yaml({'publications': list(pipeline.run(synthetic_publications(count)['publications']))},
+              filename)
+    dict_time, dict_size = retained(load_yaml, filename)
+    record_time, record_size = retained(load_records, filename)
+    print(f"{count:>7} entries  dicts {dict_time:6.2f}s {dict_size:8.1f} MiB  "
+          f"records {record_time:6.2f}s {record_size:8.1f} MiB  "
+          f"({1 - record_size / dict_size:.0%} less memory)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare loading publications as dicts and as records")
+    parser.add_argument('--entries', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help="corpus sizes")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.entries:
+            bench(count, directory)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the three publication scripts on synthetic corpora.
+For each corpus size it runs a full fetch_publications() against a local
+FakeScholar, fix_publications.py and extract_venues.py on a YAML file, the
+YAML round trip, and the hot helpers on their own
+(reconstruct_authors_from_chars, extract_venue_from_url, highlight_author).
+Each stage reports throughput and peak Python heap (tracemalloc), measured in
+a separate run so the timing is not slowed down by tracing. Runs entirely
+offline; scholarly does not need to be installed.
+Usage: python -m benchmarks.bench_scripts [--entries 100 1000 10000 100000] [--latency 0] [--no-memory]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import fake_scholarly
+
+fake_scholarly.install()
+
+import fetch_publications  # noqa: E402  (needs the scholarly module in place)
+from authors import highlight_author, is_char_list, reconstruct_authors_from_chars  # noqa: E402
+from benchmarks.corpus import scholar_corpus, synthetic_corpus  # noqa: E402
+from extract_venues import update_venues  # noqa: E402
+from fix_publications import fix_publications_file  # noqa: E402
+from pub_io import load_yaml, save_yaml  # noqa: E402
+from scholar_profile import YOUR_NAME  # noqa: E402
+from venues import extract_venue_from_url  # noqa: E402
+
+def measure(setup, run, memory=True):
+    """(seconds, peak MiB or None) of run(setup()); setup is not measured"""
+    arg = setup()
+    with contextlib.redirect_stdout(io.StringIO()):  # the scripts print per entry
+        start = time.perf_counter()
+        run(arg)
+        elapsed = time.perf_counter() - start
+        if not memory:
+            return elapsed, None
+        arg = setup()
+        tracemalloc.start()
+        try:
+            run(arg)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+def stages(count, directory, latency):
+    """(name, records, setup, run) for every stage at one corpus size"""
+    raw = synthetic_corpus(count)
+    raw_file = os.path.join(directory, 'raw.yml')
+    save_yaml({'publications': raw}, raw_file)
+    fixed_file = os.path.join(directory, 'fixed.yml')
+    work_file = os.path.join(directory, 'work.yml')
+    scholar = scholar_corpus(count)
+
+    def copy_of(source):
+        def setup():
+            with open(source, 'rb') as src, open(work_file, 'wb') as dst:
+                dst.write(src.read())
+            return work_file
+        return setup
+
+    def fetch(backend):
+        data = fetch_publications.fetch_publications(workers=4, rate=1e9, backend=backend)
+        save_yaml(data, fixed_file)
+
+    char_lists = [r['authors'] for r in raw if isinstance(r['authors'], list) and is_char_list(r['authors'])]
+    urls = [url for r in raw for url in (r['links'] or {}).values()]
+    author_strings = [a if isinstance(a, str) else ', '.join(a) for a in (r['authors'] for r in raw)
+                      if not (isinstance(a, list) and is_char_list(a))]
+
+    return [
+        ('fetch_publications', count, lambda: fake_scholarly.FakeScholar(scholar, latency), fetch),
+        ('yaml load', count, lambda: fixed_file, load_yaml),
+        ('yaml dump', count, lambda: load_yaml(fixed_file),
+         lambda data: save_yaml(data, os.path.join(directory, 'dump.yml'))),
+        ('fix_publications', count, copy_of(raw_file), fix_publications_file),
+        ('extract_venues', count, copy_of(raw_file), update_venues),
+        ('reconstruct_authors', len(char_lists), lambda: char_lists,
+         lambda lists: [reconstruct_authors_from_chars(c) for c in lists]),
+        ('extract_venue_from_url', len(urls), lambda: urls,
+         lambda items: [extract_venue_from_url(u) for u in items]),
+        ('highlight_author', len(author_strings), lambda: author_strings,
+         lambda items: [highlight_author(a, YOUR_NAME) for a in items]),
+    ]
+
+def bench(count, latency, memory):
+    print(f"\n{count} publications")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, records, setup, run in stages(count, directory, latency):
+            elapsed, peak = measure(setup, run, memory)
+            rate = records / elapsed if elapsed else float('inf')
+            line = f"  {name:<24} {records:>7} items  {elapsed:8.3f} s  {rate:>12,.0f} items/s"
+            if peak is not None:
+                line += f"  peak {peak:8.1f} MiB"
+            print(line)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the publication scripts on synthetic corpora")
+    parser.add_argument('--entries', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="corpus sizes (up to 100000 is practical)")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="seconds the fake Scholar waits per request (default: 0)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the tracemalloc runs and report times only")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    for count in args.entries:
+        bench(count, args.latency, not args.no_memory)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the publications page search index.
+Builds the index for synthetic publication lists and reports build time, the
+size of the JSON the page downloads, and the number of distinct terms.
+Usage: python -m benchmarks.bench_search_index [--entries 1000 10000 50000]
+"""
+
+import argparse
+import gzip
+import json
+import time
+
+from benchmarks.bench_yaml import synthetic_publications
+from search_index import build_search_index
+
+def bench(count):
+    publications = synthetic_publications(count)['publications']
+    start = time.perf_counter()
+    index = build_search_index(publications)
+    elapsed = time.perf_counter() - start
+    text = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    print(f"{count:>7} entries  build {elapsed:6.2f}s  {len(index['terms']):>7} terms  "
+          f"JSON {len(text) / 1024:8.1f} KiB  gzipped {len(gzip.compress(text)) / 1024:7.1f} KiB")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the publications search index")
+    parser.add_argument('--entries', type=int, nargs='+', default=[1000, 10000, 50000])
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    for count in args.entries:
+        bench(count)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for venue resolution.
+Resolves a batch of synthetic URLs with the rules from venue_rules.yml, optionally
+padded with extra synthetic host and path rules to see how lookups scale as
+the rule set grows.
+Usage: python -m benchmarks.bench_venues [--urls 100000] [--extra-rules 0 200 1000]
+"""
+
+import argparse
+import random
+import time
+
+from pub_io import load_yaml
+from venues import VENUE_RULES_FILE, VenueResolver
+
+SAMPLE_URLS = [
+    'https://www.nature.com/articles/s41467-025-59872-2',
+    'https://www.nature.com/articles/s43588-024-00001-1',
+    'https://advanced.onlinelibrary.wiley.com/doi/abs/10.1002/adma.202312783',
+    'https://onlinelibrary.wiley.com/doi/full/10.1002/aelm.202300123',
+    'https://jamanetwork.com/journals/jamanetworkopen/article-abstract/2844223',
+    'https://www.mdpi.com/2079-6374/15/2/110',
+    'https://ieeexplore.ieee.org/abstract/document/10123456',
+    'https://arxiv.org/abs/2401.01234',
+    'https://iopscience.iop.org/article/10.1088/2634-4386/ad1234/meta',
+    'https://pmc.ncbi.nlm.nih.gov/articles/PMC1234567/',
+    'https://www.sciencedirect.com/science/article/pii/S0000000000000000',
+    'https://example.org/journal/neural-systems/42',
+]
+
+def load_rules(extra_rules=0, seed=0):
+    """Rules from venue_rules.yml plus `extra_rules` synthetic host and path rules"""
+    rules = load_yaml(VENUE_RULES_FILE)
+    hosts = dict(rules['hosts'])
+    paths = list(rules['paths'])
+    rng = random.Random(seed)
+    for i in range(extra_rules):
+        domain = f"journal{i}.publisher{rng.randrange(extra_rules // 10 + 1)}.org"
+        hosts[domain] = f"Synthetic Journal {i}"
+        paths.append({'host': domain, 'pattern': f"vol{i}-", 'venue': f"Synthetic Letters {i}"})
+    return hosts, paths
+
+def make_urls(count, hosts, seed=0):
+    """A realistic mix of known publishers, synthetic journals and unknown hosts"""
+    rng = random.Random(seed)
+    synthetic = [h for h in hosts if h.startswith('journal')]
+    urls = []
+    for i in range(count):
+        if synthetic and rng.random() < 0.3:
+            urls.append(f"https://www.{rng.choice(synthetic)}/vol{rng.randrange(1000)}-{i}/article")
+        else:
+            urls.append(rng.choice(SAMPLE_URLS) + f"?v={i}")
+    return urls
+
+def bench(url_count, extra_rules):
+    hosts, paths = load_rules(extra_rules)
+    start = time.perf_counter()
+    resolver = VenueResolver(hosts, paths)
+    compile_time = time.perf_counter() - start
+    
+    urls = make_urls(url_count, hosts)
+    start = time.perf_counter()
+    resolved = sum(1 for url in urls if resolver.resolve(url))
+    elapsed = time.perf_counter() - start
+    
+    rules = len(hosts) + len(paths)
+    print(f"{rules:>6} rules  compile {compile_time * 1000:7.1f} ms  "
+          f"{url_count} URLs in {elapsed:6.3f} s  ({url_count / elapsed:,.0f} URLs/s, "
+          f"{resolved} resolved)")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark venue resolution")
+    parser.add_argument('--urls', type=int, default=100_000, help="URLs to resolve per run")
+    parser.add_argument('--extra-rules', type=int, nargs='+', default=[0, 200, 1000],
+                        help="synthetic rules to add on top of venue_rules.yml")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    for extra in args.extra_rules:
+        bench(args.urls, extra)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark for loading and dumping publications.yml.
+Compares the pure-Python PyYAML loader, libyaml's C loader (if available) and
+the marshal sidecar used by pub_io.load_publications on a synthetic file.
+Usage: python -m benchmarks.bench_yaml [--entries 1000 10000 50000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import yaml
+
+import pub_io
+
+def synthetic_publications(count):
+    return {'publications': [
+        {
+            'title': f"Synthetic publication number {i} on neuromorphic computing hardware",
+            'authors': ', '.join(f"Author{j} Surname{(i + j) % 97}" for j in range(8)),
+            'venue': ['Nature Communications', 'Advanced Materials', 'arXiv'][i % 3],
+            'year': 2000 + i % 26,
+            'type': ['journal', 'journal', 'preprint'][i % 3],
+            'links': {'pdf': f"https://example.org/articles/{i}", 'doi': f"https://doi.org/10.1/{i}"},
+        }
+        for i in range(count)
+    ]}
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def bench(count, directory):
+    filename = os.path.join(directory, f"publications-{count}.yml")
+    data = synthetic_publications(count)
+    
+    dump_py = timed(lambda: open(filename, 'w').write(
+        yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False)))
+    dump_c = timed(lambda: pub_io.save_yaml(data, filename))
+    load_py = timed(lambda: yaml.load(open(filename).read(), Loader=yaml.SafeLoader))
+    load_c = timed(lambda: pub_io.load_yaml(filename))
+    cold = timed(lambda: pub_io.load_publications(filename))  # parses and writes the sidecar
+    warm = timed(lambda: pub_io.load_publications(filename))
+    
+    print(f"{count:>7} entries  dump py {dump_py:6.2f}s  dump C {dump_c:6.2f}s  "
+          f"load py {load_py:6.2f}s  load C {load_c:6.2f}s  "
+          f"sidecar cold {cold:6.2f}s  warm {warm * 1000:7.1f} ms")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark publications.yml load/dump")
+    parser.add_argument('--entries', type=int, nargs='+', default=[1000, 10000, 50000])
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"libyaml available: {yaml.__with_libyaml__}")
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.entries:
+            bench(count, directory)
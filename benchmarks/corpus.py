@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Synthetic publication corpora for the benchmarks.
+Records look like what Scholar hands us: some author fields arrive as the
+broken one-character-per-item lists, others as "A and B" strings or name
+lists; venues are often missing and have to be guessed from links spread over
+real publisher domains, unknown hosts and arXiv. The same seed always gives
+the same corpus.
+"""
+
+import random
+
+from benchmarks.bench_authors import FAMILY, GIVEN, char_list
+from benchmarks.bench_venues import SAMPLE_URLS
+from scholar_profile import YOUR_NAME
+
+TITLE_WORDS = ('memristor neuromorphic spiking network learning edge stochastic computing hardware '
+               'efficient inference wearable sensor graph transformer reservoir analog crossbar '
+               'synaptic carbon nanotube photonic quantum adaptive perception tactile').split()
+
+VENUES = ['Nature Communications', 'Advanced Materials', 'JAMA Network Open', 'Biosensors',
+          'Proceedings of the IEEE Conference on Computer Vision', 'arXiv preprint']
+
+OTHER_HOSTS = ['https://www.researchgate.net/publication/', 'https://scholar.archive.org/work/',
+               'https://example.edu/~lab/papers/']
+
+def _authors(rng):
+    names = [f"{rng.choice(GIVEN)} {rng.choice(FAMILY)}" for _ in range(rng.choice([2, 4, 6, 12, 40]))]
+    if rng.random() < 0.3:
+        names[rng.randrange(len(names))] = YOUR_NAME
+    return names
+
+def _links(rng, i):
+    roll = rng.random()
+    if roll < 0.6:
+        return {'pdf': rng.choice(SAMPLE_URLS) + f"?id={i}"}
+    if roll < 0.75:
+        return {'pdf': f"https://arxiv.org/pdf/{2000 + i % 500}.{i:05d}", 'arxiv': f"https://arxiv.org/abs/{i}"}
+    if roll < 0.9:
+        return {'pdf': f"{rng.choice(OTHER_HOSTS)}{i}"}
+    return None
+
+def synthetic_corpus(count, seed=0):
+    """`count` unprocessed publications.yml entries, as fetched before any fix-ups"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        names = _authors(rng)
+        roll = rng.random()
+        if roll < 0.4:
+            authors = char_list(' and '.join(names), seed=i)  # the broken Scholar export format
+        elif roll < 0.8:
+            authors = ' and '.join(names)
+        else:
+            authors = names
+        records.append({
+            'title': ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(6, 14))).capitalize()
+                     + f" {i}",
+            'authors': authors,
+            'venue': rng.choice(VENUES) if rng.random() < 0.5 else '',
+            'year': rng.randint(2005, 2026),
+            'type': None,
+            'links': _links(rng, i),
+        })
+    return records
+
+def scholar_corpus(count, seed=0):
+    """The same corpus shaped like filled scholarly publications"""
+    pubs = []
+    for i, record in enumerate(synthetic_corpus(count, seed)):
+        bib = {'title': record['title'], 'author': record['authors'], 'pub_year': str(record['year'])}
+        if record['venue']:
+            bib['venue'] = record['venue']
+        pub = {'container_type': 'Publication', 'author_pub_id': f"FAKE:{i:07d}",
+               'num_citations': (i * 7) % 300, 'bib': bib}
+        links = record['links'] or {}
+        if links.get('arxiv'):
+            pub['eprint_url'] = links['arxiv']
+        elif links.get('pdf'):
+            pub['pub_url'] = links['pdf']
+        pubs.append(pub)
+    return pubs
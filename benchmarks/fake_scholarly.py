@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the scholarly module.
+FakeScholar is a ReplayScholar (see scholar_replay.py) whose fixture is
+generated from an in-memory corpus instead of recorded, so fetch runs can be
+benchmarked at any size without network access, optionally with a fixed
+latency per request and injected rate-limit errors. install() also registers
+it as the `scholarly` module when the real package is not installed.
+"""
+
+import sys
+import types
+
+from scholar_replay import ReplayScholar, fixture_from_publications
+
+class FakeScholar(ReplayScholar):
+    """Serves one author profile whose publications are `publications` (filled scholarly dicts)
+
+    Takes ReplayScholar's fault options (jitter, error_rate, max_rate, seed).
+    """
+
+    def __init__(self, publications, latency=0.0, **faults):
+        super().__init__(fixture_from_publications(publications), latency, **faults)
+
+def install(backend=None):
+    """Make `import scholarly` work offline; returns the module that import will see"""
+    try:
+        import scholarly  # noqa: F401
+        return sys.modules['scholarly']
+    except ImportError:
+        module = types.ModuleType('scholarly')
+        module.scholarly = backend or FakeScholar([])
+        sys.modules['scholarly'] = module
+        return module
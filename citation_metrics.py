@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Citation-count history for the Scholar profile.
+Every fetch adds a snapshot of the per-publication citation counts and the
+author's citations per year to an append-only SQLite store. A row is only
+written when a count differs from the last one stored for it, so years of
+nightly runs stay small. h-index, i10-index and totals are computed in SQL
+over the counts as of any day (the history of them in a single windowed
+query), and a summary for the site is written to _data/citation_metrics.yml.
+Usage: python citation_metrics.py [--db FILE] [--summary FILE] [--history DAYS]
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import date
+
+from fetch_state import pub_key
+from pub_io import load_yaml, save_yaml
+
+CITATIONS_FILE = 'citations.sqlite3'
+SUMMARY_FILE = '_data/citation_metrics.yml'
+HISTORY_LIMIT = 365  # change days kept in the summary
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT
+);
+-- citations is NULL from the day a publication left the profile
+CREATE TABLE IF NOT EXISTS pub_citations (
+    pub INTEGER NOT NULL REFERENCES publications(id),
+    day INTEGER NOT NULL,
+    citations INTEGER,
+    PRIMARY KEY (pub, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS author_citations (
+    year INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    citations INTEGER NOT NULL,
+    PRIMARY KEY (year, day)
+) WITHOUT ROWID;
+"""
+
+# Counts per publication as of :day (the latest row on or before it)
+LATEST_SQL = """
+SELECT c.pub, c.citations FROM pub_citations c
+WHERE c.day = (SELECT MAX(day) FROM pub_citations WHERE pub = c.pub AND day <= :day)
+"""
+
+METRICS_SQL = f"""
+WITH latest AS ({LATEST_SQL}),
+ranked AS (
+    SELECT citations, ROW_NUMBER() OVER (ORDER BY citations DESC) AS rank
+    FROM latest WHERE citations IS NOT NULL
+)
+SELECT COUNT(*), COALESCE(SUM(citations), 0),
+       COALESCE(SUM(citations >= rank), 0), COALESCE(SUM(citations >= 10), 0)
+FROM ranked
+"""
+
+# The same metrics on each of the latest :limit days a count changed (before :before),
+# in one pass: every row is valid from its day until the publication's next row
+HISTORY_SQL = """
+WITH days AS (
+    SELECT day FROM (SELECT day FROM pub_citations UNION SELECT day FROM author_citations)
+    WHERE day < :before ORDER BY day DESC LIMIT :limit
+),
+spans AS (
+    SELECT day, citations, LEAD(day) OVER (PARTITION BY pub ORDER BY day) AS until
+    FROM pub_citations
+),
+ranked AS (
+    SELECT d.day, s.citations,
+           ROW_NUMBER() OVER (PARTITION BY d.day ORDER BY s.citations DESC) AS rank
+    FROM days d JOIN spans s ON s.day <= d.day AND (s.until IS NULL OR s.until > d.day)
+    WHERE s.citations IS NOT NULL
+)
+SELECT d.day, COUNT(r.citations), COALESCE(SUM(r.citations), 0),
+       COALESCE(SUM(r.citations >= r.rank), 0), COALESCE(SUM(r.citations >= 10), 0)
+FROM days d LEFT JOIN ranked r ON r.day = d.day
+GROUP BY d.day ORDER BY d.day
+"""
+
+PER_YEAR_SQL = """
+WITH latest AS (
+    SELECT a.year, a.citations FROM author_citations a
+    WHERE a.day = (SELECT MAX(day) FROM author_citations WHERE year = a.year AND day <= :day)
+)
+SELECT year, citations, citations - LAG(citations) OVER (ORDER BY year) FROM latest ORDER BY year
+"""
+
+def day_number(day=None):
+    """Days are stored as proleptic Gregorian ordinals (one small INTEGER)"""
+    return (day or date.today()).toordinal()
+
+class CitationStore:
+    """Append-only store of citation counts that only grows when counts change"""
+
+    def __init__(self, filename=CITATIONS_FILE):
+        self.filename = filename
+        self._db = sqlite3.connect(filename)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _latest_counts(self):
+        rows = self._db.execute(
+            "SELECT p.key, c.citations FROM publications p JOIN (" + LATEST_SQL + ") c ON c.pub = p.id",
+            {'day': day_number(date.max)})
+        return dict(rows)
+
+    def _pub_ids(self, keys_titles):
+        self._db.executemany("INSERT OR IGNORE INTO publications (key, title) VALUES (?, ?)", keys_titles)
+        return dict(self._db.execute("SELECT key, id FROM publications"))
+
+    def record(self, author, pubs, day=None):
+        """Add a snapshot from a filled author and its publication listing
+
+        Returns (publication counts written, per-year counts written); both are
+        0 when nothing changed since the last snapshot. An empty listing is
+        ignored rather than recorded as every publication vanishing.
+        """
+        if not pubs:
+            return 0, 0
+        day = day_number(day)
+        previous = self._latest_counts()
+        current = {pub_key(p): (int(p.get('num_citations') or 0), p.get('bib', {}).get('title'))
+                   for p in pubs}
+
+        changed = [(key, count) for key, (count, _) in current.items() if previous.get(key) != count]
+        # Publications that left the profile get a NULL row so they stop counting
+        changed += [(key, None) for key, count in previous.items()
+                    if key not in current and count is not None]
+
+        per_year = {int(year): int(count) for year, count in (author.get('cites_per_year') or {}).items()}
+        previous_years = dict(self._db.execute(
+            "SELECT a.year, a.citations FROM author_citations a WHERE a.day = "
+            "(SELECT MAX(day) FROM author_citations WHERE year = a.year)"))
+        changed_years = [(year, day, count) for year, count in per_year.items()
+                         if previous_years.get(year) != count]
+
+        with self._db:
+            if changed:
+                ids = self._pub_ids([(key, current[key][1] if key in current else None)
+                                     for key, _ in changed])
+                self._db.executemany("INSERT OR REPLACE INTO pub_citations VALUES (?, ?, ?)",
+                                     [(ids[key], day, count) for key, count in changed])
+            if changed_years:
+                self._db.executemany("INSERT OR REPLACE INTO author_citations VALUES (?, ?, ?)",
+                                     changed_years)
+        return len(changed), len(changed_years)
+
+    def metrics(self, day=None):
+        """Totals, h-index and i10-index as of `day` (default: today)"""
+        count, total, h_index, i10 = self._db.execute(METRICS_SQL, {'day': day_number(day)}).fetchone()
+        return {'publications': count, 'citations': total, 'h_index': h_index, 'i10_index': i10}
+
+    def per_year(self, day=None):
+        """[{year, citations, growth}] from the author's citations per year as of `day`"""
+        return [{'year': year, 'citations': count, 'growth': growth}
+                for year, count, growth in self._db.execute(PER_YEAR_SQL, {'day': day_number(day)})]
+
+    def history(self, limit=HISTORY_LIMIT, before=None):
+        """Metrics on the latest `limit` days a count changed, oldest first
+
+        `limit=None` returns every day; pass the first date of one page as
+        `before` to get the page of days preceding it.
+        """
+        params = {'limit': -1 if limit is None else limit, 'before': day_number(before or date.max)}
+        return [{'date': date.fromordinal(day).isoformat(), 'publications': count, 'citations': total,
+                 'h_index': h_index, 'i10_index': i10}
+                for day, count, total, h_index, i10 in self._db.execute(HISTORY_SQL, params)]
+
+def write_summary(store, filename=SUMMARY_FILE, history_limit=HISTORY_LIMIT):
+    """Write the metrics the site shows; returns False if the file was already current"""
+    summary = dict(store.metrics(), per_year=store.per_year(), history=store.history(history_limit))
+    if os.path.exists(filename) and load_yaml(filename) == summary:
+        return False
+    save_yaml(summary, filename)
+    return True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Show citation metrics and rewrite the site summary")
+    parser.add_argument('--db', default=CITATIONS_FILE,
+                        help=f"citation store written by fetch_publications.py (default: {CITATIONS_FILE})")
+    parser.add_argument('--summary', default=SUMMARY_FILE,
+                        help=f"YAML summary for the site (default: {SUMMARY_FILE})")
+    parser.add_argument('--history', type=int, default=HISTORY_LIMIT, metavar='DAYS',
+                        help=f"change days of history in the summary (default: {HISTORY_LIMIT})")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    store = CitationStore(args.db)
+    current = store.metrics()
+    print(f"Citations: {current['citations']}  h-index: {current['h_index']}  "
+          f"i10-index: {current['i10_index']}  ({current['publications']} publications)")
+    for row in store.per_year():
+        growth = f"{row['growth']:+d}" if row['growth'] is not None else ''
+        print(f"  {row['year']}  {row['citations']:>6}  {growth}")
+    if write_summary(store, args.summary, args.history):
+        print(f"✓ Updated {args.summary}")
+    store.close()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for publication lists.
+Scholar often lists an arXiv preprint and its published version separately.
+Titles are shingled into character n-grams and sketched with one-permutation
+MinHash; records whose sketches agree on a whole LSH band become candidate
+pairs, so only a handful of pairs are ever compared instead of all n^2.
+Candidates are confirmed by the exact Jaccard similarity of their shingles,
+shared authors and close years; titles that are similar but not the same
+also need one side to be a preprint. Each group of duplicates is merged into
+one canonical record and every merge is logged.
+"""
+
+import gc
+import re
+import zlib
+
+from authors import TAG_RE, parse_authors
+
+SHINGLE_SIZE = 4
+NUM_BINS = 32      # sketch length
+BAND_ROWS = 4      # bins per LSH band -> 8 bands, candidate threshold ~0.6
+THRESHOLD = 0.8    # Jaccard similarity required to call two titles duplicates
+MAX_BUCKET = 500   # ignore LSH buckets this crowded (e.g. many "Editorial" entries)
+MIN_SHINGLES = 20  # shorter titles must match exactly (after normalization)
+MAX_YEAR_GAP = 1   # published versions of the same paper, e.g. online vs. issue year
+
+# Links worth carrying over from a duplicate to the canonical record
+MERGED_LINKS = ('pdf', 'arxiv', 'doi', 'code')
+
+_EMPTY_BIN = 0xFFFFFFFF
+
+def normalize_title(title):
+    """Lowercase, markup- and punctuation-free title"""
+    text = TAG_RE.sub('', str(title or '')).lower()
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
+
+def shingles(title, size=SHINGLE_SIZE):
+    """Set of hashed character n-grams of a normalized title"""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return {zlib.crc32(text.encode('utf-8'))} if text else set()
+    return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+def sketch(shingle_set, num_bins=NUM_BINS):
+    """One-permutation MinHash: the smallest hash falling into each of num_bins bins"""
+    bins = [_EMPTY_BIN] * num_bins
+    for h in shingle_set:
+        # crc32 is uniform enough to use the top bits for the bin
+        b = (h * num_bins) >> 32
+        if h < bins[b]:
+            bins[b] = h
+    # Densify: borrow empty bins from the next non-empty one so short titles still band
+    for i in range(num_bins):
+        if bins[i] == _EMPTY_BIN:
+            for step in range(1, num_bins):
+                candidate = bins[(i + step) % num_bins]
+                if candidate != _EMPTY_BIN:
+                    bins[i] = candidate ^ step
+                    break
+    return bins
+
+def _numbers(title):
+    return sorted(re.findall(r'\d+', normalize_title(title)))
+
+def is_preprint(record):
+    return record.get('type') == 'preprint' or 'arxiv' in (record.get('venue') or '').lower()
+
+def _families(record):
+    return {a.family.lower() for a in parse_authors(record.get('authors')) if a.family}
+
+def is_duplicate(record_a, record_b, shingles_a, shingles_b, threshold=THRESHOLD):
+    """Confirm a candidate pair
+
+    Titles that differ in a number ("Part 1" / "Part 2") are never duplicates,
+    and short titles have too few shingles for Jaccard to mean much. Papers
+    with no author in common, or published years apart, are kept apart.
+    Similar but different titles ("... simulated annealing" / "... quantum
+    annealing") only merge as a preprint and its published version.
+    """
+    title_a, title_b = record_a.get('title'), record_b.get('title')
+    if _numbers(title_a) != _numbers(title_b):
+        return False
+    same_title = normalize_title(title_a) == normalize_title(title_b)
+    if not same_title:
+        if min(len(shingles_a), len(shingles_b)) < MIN_SHINGLES:
+            return False
+        if is_preprint(record_a) == is_preprint(record_b):
+            return False
+        if jaccard(shingles_a, shingles_b) < threshold:
+            return False
+    families_a, families_b = _families(record_a), _families(record_b)
+    if families_a and families_b and not families_a & families_b:
+        return False
+    year_a, year_b = record_a.get('year'), record_b.get('year')
+    if (isinstance(year_a, int) and isinstance(year_b, int) and abs(year_a - year_b) > MAX_YEAR_GAP
+            and is_preprint(record_a) == is_preprint(record_b)):
+        return False  # A preprint can precede its publication by years
+    return True
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def candidate_pairs(sketches, rows=BAND_ROWS, max_bucket=MAX_BUCKET):
+    """Index pairs that share at least one LSH band"""
+    pairs = set()
+    num_bins = len(sketches[0]) if sketches else 0
+    for start in range(0, num_bins, rows):
+        buckets = {}
+        for i, sk in enumerate(sketches):
+            buckets.setdefault(tuple(sk[start:start + rows]), []).append(i)
+        for members in buckets.values():
+            if 1 < len(members) <= max_bucket:
+                for x in range(len(members)):
+                    for y in range(x + 1, len(members)):
+                        pairs.add((members[x], members[y]))
+    return pairs
+
+def find_duplicates(records, threshold=THRESHOLD):
+    """Groups (lists of indices, in order) of records with near-identical titles"""
+    # Only acyclic sets and lists are created here; pausing the cyclic GC avoids
+    # full-heap collections that would otherwise make large runs superlinear
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _find_duplicates(records, threshold)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+def _find_duplicates(records, threshold):
+    shingle_sets = [shingles(r.get('title')) for r in records]
+    sketches = [sketch(s) for s in shingle_sets]
+
+    parent = list(range(len(records)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in candidate_pairs(sketches):
+        if is_duplicate(records[i], records[j], shingle_sets[i], shingle_sets[j], threshold):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+    groups = {}
+    for i in range(len(records)):
+        groups.setdefault(find(i), []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+def _canonical_rank(record, index):
+    """Prefer the published version, then the one with more links, then the first"""
+    return (is_preprint(record), -len(record.get('links') or {}), index)
+
+def merge_group(records):
+    """Merge duplicate records into the canonical one (modified in place and returned)"""
+    ranked = sorted(range(len(records)), key=lambda i: _canonical_rank(records[i], i))
+    canonical = records[ranked[0]]
+    links = dict(canonical.get('links') or {})
+    members = list(canonical.get('members') or [])
+    for i in ranked[1:]:
+        other = records[i]
+        other_links = other.get('links') or {}
+        for key in MERGED_LINKS:
+            if other_links.get(key) and not links.get(key):
+                links[key] = other_links[key]
+        # A preprint's PDF is usually the arXiv copy
+        pdf = other_links.get('pdf') or ''
+        if 'arxiv.org' in pdf and not links.get('arxiv'):
+            links['arxiv'] = pdf
+        members.extend(m for m in other.get('members') or [] if m not in members)
+    canonical['links'] = links or None
+    if members:
+        canonical['members'] = members
+    return canonical
+
+def merge_duplicates(records, threshold=THRESHOLD, verbose=True):
+    """Return records with each group of near-duplicates merged into one"""
+    drop = set()
+    for group in find_duplicates(records, threshold):
+        canonical = merge_group([records[i] for i in group])
+        for i in group:
+            if records[i] is not canonical:
+                drop.add(i)
+                if verbose:
+                    print(f"  Merged duplicate ({records[i].get('year')}) {records[i].get('title', '')[:60]!r}\n"
+                          f"              into ({canonical.get('year')}) {canonical.get('title', '')[:60]!r}")
+    return [r for i, r in enumerate(records) if i not in drop]
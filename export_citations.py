@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Citation exports of the publication list.
+Streams publication records (from publications.yml or straight from
+fetch_publications()) one at a time into BibTeX, CSL-JSON and RIS files, plus
+one file per year and format, all in a single pass. Each output is written
+through pub_io.atomic_write() while its hash is computed and only replaces the
+existing file when the contents changed, so unchanged exports never show up
+in a deploy.
+Usage: python export_citations.py [--input FILE] [--output-dir DIR] [--formats bibtex,csl-json,ris] [--no-split]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import unicodedata
+
+from authors import TAG_RE, parse_authors
+from metadata_index import record_doi
+from pub_io import PUBLICATIONS_FILE, atomic_write, iter_publications
+
+EXPORT_DIR = 'assets/citations'
+EXPORT_BASENAME = 'publications'
+YEAR_DIR = 'by-year'
+
+def _plain(value):
+    """Field text without the <strong> highlighting or other markup"""
+    return ' '.join(TAG_RE.sub('', str(value or '')).split())
+
+def _authors(pub):
+    """(given, family) pairs, from author_list when the pipeline produced one"""
+    if pub.get('author_list'):
+        return [(a.get('given') or '', a.get('family') or '') for a in pub['author_list']]
+    return [(a.given, a.family) for a in parse_authors(_plain(pub.get('authors')))]
+
+def _page_range(pages):
+    """(first, last) page; last is None for a single page or article number"""
+    parts = re.split(r'\s*[-–—]+\s*', str(pages or '').strip(), maxsplit=1)
+    return parts[0], (parts[1] if len(parts) > 1 else None)
+
+def _url(pub):
+    links = pub.get('links') or {}
+    return links.get('pdf') or links.get('arxiv') or links.get('doi')
+
+def citation_key(pub):
+    """'wang2025scalable': first author's family name, year and first title word"""
+    authors = _authors(pub)
+    family = authors[0][1] if authors else 'anon'
+    words = [w for w in re.findall(r'[a-z0-9]+', _ascii(_plain(pub.get('title'))).lower())
+             if w not in ('a', 'an', 'the', 'on', 'of')]
+    return f"{re.sub(r'[^a-z]', '', _ascii(family).lower()) or 'anon'}{pub.get('year') or ''}" \
+           f"{words[0] if words else ''}"
+
+def _ascii(text):
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+class BibTeX:
+    extension = 'bib'
+    separator = '\n'
+    header = ''
+    footer = ''
+
+    ENTRY_TYPES = {'journal': ('article', 'journal'), 'conference': ('inproceedings', 'booktitle')}
+    SPECIAL_RE = re.compile(r'([&%$#_{}])')
+
+    @classmethod
+    def _escape(cls, text):
+        return cls.SPECIAL_RE.sub(r'\\\1', text)
+
+    def entry(self, pub, key):
+        entry_type, venue_field = self.ENTRY_TYPES.get(pub.get('type'), ('misc', 'howpublished'))
+        first, last = _page_range(pub.get('pages'))
+        doi = record_doi(pub)
+        fields = [
+            ('title', '{' + self._escape(_plain(pub.get('title'))) + '}'),
+            ('author', ' and '.join(self._escape(f"{family}, {given}" if given else family)
+                                    for given, family in _authors(pub))),
+            (venue_field, self._escape(_plain(pub.get('venue')))),
+            ('year', str(pub.get('year') or '')),
+            ('volume', self._escape(str(pub.get('volume') or ''))),
+            ('pages', f"{first}--{last}" if last else first),
+            ('doi', doi or ''),
+            ('url', '' if doi else (_url(pub) or '')),
+        ]
+        body = ',\n'.join(f"  {name} = {{{value}}}" for name, value in fields if value)
+        return f"@{entry_type}{{{key},\n{body}\n}}\n"
+
+class CSLJSON:
+    extension = 'json'
+    separator = ',\n'
+    header = '[\n'
+    footer = '\n]\n'
+
+    TYPES = {'journal': 'article-journal', 'conference': 'paper-conference', 'preprint': 'article'}
+
+    def entry(self, pub, key):
+        item = {
+            'id': key,
+            'type': self.TYPES.get(pub.get('type'), 'document'),
+            'title': _plain(pub.get('title')),
+            'author': [{'family': family, 'given': given} if given else {'family': family}
+                       for given, family in _authors(pub)],
+        }
+        if pub.get('year'):
+            item['issued'] = {'date-parts': [[pub['year']]]}
+        optional = {
+            'container-title': _plain(pub.get('venue')),
+            'volume': str(pub.get('volume') or ''),
+            'page': str(pub.get('pages') or ''),
+            'DOI': record_doi(pub) or '',
+            'URL': _url(pub) or '',
+        }
+        item.update((name, value) for name, value in optional.items() if value)
+        return json.dumps(item, ensure_ascii=False)
+
+class RIS:
+    extension = 'ris'
+    separator = '\n'
+    header = ''
+    footer = ''
+
+    TYPES = {'journal': 'JOUR', 'conference': 'CONF', 'preprint': 'UNPB'}
+
+    def entry(self, pub, key):
+        lines = [('TY', self.TYPES.get(pub.get('type'), 'GEN')), ('ID', key),
+                 ('TI', _plain(pub.get('title')))]
+        lines += [('AU', f"{family}, {given}" if given else family) for given, family in _authors(pub)]
+        first, last = _page_range(pub.get('pages'))
+        lines += [
+            ('T2', _plain(pub.get('venue'))),
+            ('PY', str(pub.get('year') or '')),
+            ('VL', str(pub.get('volume') or '')),
+            ('SP', first),
+            ('EP', last or ''),
+            ('DO', record_doi(pub) or ''),
+            ('UR', _url(pub) or ''),
+        ]
+        return ''.join(f"{tag}  - {value}\n" for tag, value in lines if value) + 'ER  - \n'
+
+FORMATS = {'bibtex': BibTeX, 'csl-json': CSLJSON, 'ris': RIS}
+
+class _Unchanged(Exception):
+    """Makes atomic_write() drop its temp file instead of replacing the target"""
+
+class ExportFile:
+    """An output file written through atomic_write(), hashed as it goes
+
+    close() only moves the temp file into place if its hash differs from the
+    existing file's, so the old file (and its mtime) is kept otherwise.
+    """
+
+    def __init__(self, filename, fmt):
+        self.filename = filename
+        self.format = fmt
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        self._output = atomic_write(filename)
+        self._file = self._output.__enter__()
+        self._hash = hashlib.sha1()
+        self._empty = True
+        self._write(fmt.header)
+
+    def _write(self, text):
+        self._file.write(text)
+        self._hash.update(text.encode('utf-8'))
+
+    def add(self, pub, key):
+        if not self._empty:
+            self._write(self.format.separator)
+        self._empty = False
+        self._write(self.format.entry(pub, key))
+
+    def close(self):
+        """Finish the file; returns True if it was written, False if unchanged"""
+        self._write(self.format.footer)
+        self._file.flush()
+        if _file_sha1(self.filename) == self._hash.hexdigest():
+            self.discard()
+            return False
+        self._output.__exit__(None, None, None)
+        return True
+
+    def discard(self):
+        self._output.__exit__(_Unchanged, _Unchanged(), None)
+
+def _file_sha1(filename, chunk_size=1 << 16):
+    digest = hashlib.sha1()
+    try:
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def export_citations(records, directory=EXPORT_DIR, formats=tuple(FORMATS), split_years=True):
+    """Stream `records` into every format, plus per-year files when `split_years`
+
+    Records are formatted as they arrive and never collected; only the
+    citation keys seen so far are kept, to make duplicates unique. Per-year
+    files of years that no longer have publications are removed.
+    Returns (files written, files unchanged).
+    """
+    formats = [FORMATS[name]() for name in formats]
+    outputs = {}  # (year or None, extension) -> ExportFile
+
+    def output(year, fmt):
+        key = (year, fmt.extension)
+        if key not in outputs:
+            if year is None:
+                filename = os.path.join(directory, f"{EXPORT_BASENAME}.{fmt.extension}")
+            else:
+                filename = os.path.join(directory, YEAR_DIR, f"{year}.{fmt.extension}")
+            outputs[key] = ExportFile(filename, fmt)
+        return outputs[key]
+
+    seen_keys = set()
+    try:
+        for fmt in formats:
+            output(None, fmt)  # the combined files exist even for an empty list
+        for pub in records:
+            key = base = citation_key(pub)
+            suffix = ord('a')
+            while key in seen_keys:
+                key, suffix = f"{base}{chr(suffix)}", suffix + 1
+            seen_keys.add(key)
+            year = str(pub.get('year') or 'unknown')
+            for fmt in formats:
+                output(None, fmt).add(pub, key)
+                if split_years:
+                    output(year, fmt).add(pub, key)
+    except BaseException:
+        for out in outputs.values():
+            out.discard()
+        raise
+
+    written = unchanged = 0
+    for out in outputs.values():
+        if out.close():
+            written += 1
+        else:
+            unchanged += 1
+
+    year_dir = os.path.join(directory, YEAR_DIR)
+    current = {os.path.basename(out.filename) for (year, _), out in outputs.items() if year is not None}
+    extensions = {fmt.extension for fmt in formats}
+    if os.path.isdir(year_dir):
+        for name in os.listdir(year_dir):
+            if name.rsplit('.', 1)[-1] in extensions and name not in current:
+                os.unlink(os.path.join(year_dir, name))
+    return written, unchanged
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export publications as BibTeX, CSL-JSON and RIS")
+    parser.add_argument('--input', default=PUBLICATIONS_FILE,
+                        help=f"publications YAML to export (default: {PUBLICATIONS_FILE})")
+    parser.add_argument('--output-dir', default=EXPORT_DIR,
+                        help=f"directory for the exports (default: {EXPORT_DIR})")
+    parser.add_argument('--formats', default=','.join(FORMATS),
+                        help=f"comma-separated formats (default: {','.join(FORMATS)})")
+    parser.add_argument('--no-split', action='store_true', help="skip the per-year files")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    formats = [f for f in args.formats.split(',') if f]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        raise SystemExit(f"Unknown format(s): {', '.join(unknown)}")
+    written, unchanged = export_citations(iter_publications(args.input), args.output_dir, formats,
+                                          split_years=not args.no_split)
+    print(f"✓ Exported to {args.output_dir}: {written} file(s) written, {unchanged} unchanged")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Append-only checkpoint journal for fetch runs.
+Every filled publication is appended to a JSONL file as soon as it arrives, so
+a crash, Ctrl-C or Scholar ban loses at most the request in flight. A run
+started with resume=True reuses the recorded fills instead of asking again.
+"""
+
+import json
+import os
+import threading
+import time
+
+JOURNAL_FILE = '.fetch_journal.jsonl'
+
+class FetchJournal:
+    """JSONL journal of filled publications for one Scholar profile"""
+
+    def __init__(self, filename=JOURNAL_FILE, scholar_id=None, resume=False):
+        self.filename = filename
+        self.scholar_id = scholar_id
+        self._lock = threading.Lock()
+        self._end = 0  # byte offset just past the last intact line
+        self._recorded = self._read() if resume else {}
+        if resume and self._recorded:
+            print(f"Resuming: {len(self._recorded)} publications already filled in {filename}")
+            # Cut off a torn last line, or the next record would be glued onto it and lost
+            os.truncate(filename, self._end)
+            self._file = open(filename, 'a', encoding='utf-8')
+        else:
+            self._file = open(filename, 'w', encoding='utf-8')
+            self._append({'type': 'run', 'scholar_id': scholar_id, 'started': time.time()})
+
+    def _read(self):
+        """Read recorded fills, ignoring a torn last line and other profiles' journals"""
+        recorded = {}
+        if not os.path.exists(self.filename):
+            return recorded
+        with open(self.filename, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("unterminated line")
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    break  # Interrupted mid-write; everything before it is intact
+                self._end += len(line)
+                if record.get('type') == 'run':
+                    if record.get('scholar_id') != self.scholar_id:
+                        print(f"  Ignoring {self.filename}: it belongs to another profile")
+                        return {}
+                elif record.get('type') == 'fill':
+                    recorded[record['key']] = record['pub']
+        return recorded
+
+    def _append(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def completed(self):
+        """Filled publications recorded so far, keyed by pub_key"""
+        return dict(self._recorded)
+
+    def record(self, key, filled_pub):
+        """Checkpoint one filled publication"""
+        self._append({'type': 'fill', 'key': key, 'pub': filled_pub})
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def finish(self):
+        """The run was saved successfully: the journal is no longer needed"""
+        self.close()
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
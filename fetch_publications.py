@@ -1,45 +1,60 @@
 #!/usr/bin/env python3
 """
 Script to fetch publications from Google Scholar and generate publications.yml
-Usage: python fetch_publications.py
+Usage: python fetch_publications.py [--workers N] [--rate REQ_PER_SEC] [--incremental]
+       [--cache-only | --refresh] [--no-cache] [--resume] [--report FILE] [--profile FILE]
+       [--record FIXTURE | --replay FIXTURE [--replay-latency S] [--replay-error-rate P] [--replay-max-rate N]]
 """
 
-import yaml
+import argparse
+import os
 import re
-from scholarly import scholarly
-import time
-from urllib.parse import urlparse
+import sys
 
-# Your Google Scholar user ID
-SCHOLAR_ID = "VywDS3AAAAAJ"
+try:
+    from scholarly import scholarly
+except ImportError:  # Only needed for live requests; --replay runs without it
+    scholarly = None
 
-# Your name for highlighting in author lists
-YOUR_NAME = "Shengbo Wang"  # Update this to match how your name appears
+from citation_metrics import CITATIONS_FILE, SUMMARY_FILE, CitationStore, write_summary
+from dedupe import merge_duplicates
+from export_citations import EXPORT_DIR, export_citations
+from fetch_journal import JOURNAL_FILE, FetchJournal
+from fetch_state import (STATE_FILE, fingerprint, load_state, merge_links,
+                         plan_incremental, pub_key, save_state, title_hash)
+from metadata_index import MetadataIndex
+from pub_io import load_yaml, save_yaml
+from publication_pipeline import Pipeline
+from rate_limiter import AdaptiveRateLimiter, fill_concurrently
+from render_publications import write_fragments
+from run_metrics import REPORT_FILE, RunMetrics, limiter_report, profiled
+from scholar_cache import CACHE_FILE, CachedScholar, ResponseCache
+from scholar_profile import SCHOLAR_ID, YOUR_NAME
+from scholar_replay import RecordingScholar, ReplayScholar
+from search_index import SEARCH_INDEX_FILE, write_search_index
+# Shared venue detection; re-exported for existing imports
+from venues import extract_venue_from_url
 
-def highlight_author(authors_str, your_name):
-    """Bold your name in the authors string"""
-    # Try different variations of the name
-    name_variations = [
-        your_name,
-        your_name.split()[0] + " " + your_name.split()[-1],  # First Last
-        your_name.split()[0][0] + ". " + your_name.split()[-1],  # F. Last
-    ]
-    
-    for name_var in name_variations:
-        if name_var in authors_str:
-            # Use HTML strong tag for Jekyll
-            authors_str = authors_str.replace(name_var, f"<strong>{name_var}</strong>")
-            break
-    
-    return authors_str
+# Concurrent fill defaults (override with --workers / --rate)
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 1.0  # requests per second, shared by all workers
+
+OUTPUT_FILE = '_data/publications.yml'
+
+def normalize_year(year):
+    """Scholar reports years as strings; store them as ints like hand-written entries"""
+    try:
+        return int(year)
+    except (TypeError, ValueError):
+        return year
 
 def extract_year(publication):
     """Extract year from publication data"""
     if 'pub_year' in publication:
-        return publication['pub_year']
+        return normalize_year(publication['pub_year'])
     # Try to extract from bib entry
     if 'bib' in publication and 'pub_year' in publication['bib']:
-        return publication['bib']['pub_year']
+        return normalize_year(publication['bib']['pub_year'])
     # Try to extract from title or venue
     if 'bib' in publication:
         venue = publication['bib'].get('venue', '')
@@ -48,43 +63,6 @@ def extract_year(publication):
             return int(year_match.group())
     return None
 
-def extract_venue_from_url(url):
-    """Extract venue name from URL (simplified version)"""
-    if not url:
-        return ''
-    
-    try:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        # Common journal/conference domains
-        if 'nature.com' in domain:
-            if 's41467' in url:
-                return 'Nature Communications'
-            elif 's43588' in url:
-                return 'Nature Computational Science'
-            return 'Nature'
-        elif 'ieeexplore.ieee.org' in domain or 'ieee.org' in domain:
-            return 'IEEE'
-        elif 'arxiv.org' in domain:
-            return 'arXiv'
-        elif 'jamanetwork.com' in domain:
-            return 'JAMA Network Open'
-        elif 'wiley.com' in domain or 'onlinelibrary.wiley.com' in domain:
-            if 'adma' in url.lower():
-                return 'Advanced Materials'
-            elif 'aelm' in url.lower():
-                return 'Advanced Electronic Materials'
-            return 'Wiley'
-        elif 'mdpi.com' in domain:
-            return 'MDPI'
-        elif 'iopscience.iop.org' in domain:
-            return 'IOP Publishing'
-    except:
-        pass
-    
-    return ''
-
 def extract_links(publication):
     """Extract relevant links from publication"""
     links = {}
@@ -108,138 +86,487 @@ def extract_links(publication):
     
     return links
 
-def fetch_publications():
-    """Fetch publications from Google Scholar"""
+def raw_entry(filled_pub):
+    """Turn a filled scholarly publication into an unprocessed publications.yml entry"""
+    bib = filled_pub.get('bib', {})
+    title = bib.get('title', 'Untitled')
+    
+    # Skip if no title
+    if not title or title == 'Untitled':
+        return None
+    
+    # Get venue - try multiple fields (resolve_venue falls back to the URL)
+    venue = bib.get('venue', '') or bib.get('journal', '') or bib.get('publisher', '')
+    
+    links = extract_links(filled_pub)
+    
+    return {
+        'title': title,
+        'authors': bib.get('author', []),  # list or string; normalized by the pipeline
+        'venue': venue,
+        'year': extract_year(filled_pub),
+        'type': None,  # set by the classify_type stage
+        'links': links if links else None
+    }
+
+def build_entry(filled_pub, pipeline=None):
+    """Turn a filled scholarly publication into a publications.yml entry"""
+    entry = raw_entry(filled_pub)
+    if entry is None:
+        return None
+    return (pipeline or Pipeline()).process(entry)
+
+def year_key(year):
+    """Sort key for years, newest first with reverse=True; a missing or non-numeric year sorts last"""
+    return (isinstance(year, int), year if isinstance(year, int) else 0)
+
+def build_yaml_data(publications_list):
+    """Sort entries newest first and wrap them in the publications.yml structure"""
+    # Sort by year (newest first); hand-added entries may have no year at all
+    publications_list.sort(key=lambda x: year_key(x.get('year')), reverse=True)
+    
+    # Group by year
+    publications_by_year = {}
+    for pub in publications_list:
+        year = pub.get('year') or 'Unknown'
+        if year not in publications_by_year:
+            publications_by_year[year] = []
+        publications_by_year[year].append(pub)
+    
+    # Convert to YAML structure - keep year in each entry for grouping
+    yaml_data = {'publications': []}
+    for year in sorted(publications_by_year, key=year_key, reverse=True):
+        for pub in publications_by_year[year]:
+            # Keep year in entry for template grouping
+            yaml_data['publications'].append(pub)
+    
+    return yaml_data
+
+def fetch_publications(workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, state=None, existing=None,
+                       backend=None, journal=None, pipeline=None, dedupe=True, metadata=None,
+                       metrics=None, citations=None):
+    """Fetch publications from Google Scholar
+    
+    Publications are filled on a pool of `workers` threads sharing an adaptive
+    token bucket that starts at `rate` requests per second.
+    
+    If `state` (see fetch_state.py) is given it is updated in place. When
+    `existing` publications.yml data is given as well, only new or changed
+    publications are filled and the rest of `existing` is kept untouched.
+    
+    `backend` is anything with scholarly's search_author_id/fill interface,
+    e.g. a CachedScholar; it defaults to the live scholarly module.
+    
+    Each filled publication is checkpointed to `journal` (a FetchJournal) as
+    it arrives, and publications already recorded there are not filled again.
+    
+    Every new entry is run through `pipeline` (default: all stages of
+    publication_pipeline.py) so the output needs no separate fix-up passes.
+    With a `metadata` index (see metadata_index.py), new entries are first
+    matched against it in one batch to fill in DOIs, venues, volumes and pages.
+    With `dedupe`, preprint/published pairs and other near-duplicate titles
+    are merged into one entry (see dedupe.py).
+    
+    Stage timings, request and retry counts and failures by kind are recorded
+    in `metrics` (a RunMetrics, see run_metrics.py) for the run report.
+    
+    With a `citations` store (see citation_metrics.py), the citation counts of
+    the profile listing are added to it as today's snapshot.
+    """
+    backend = backend or scholarly
+    pipeline = pipeline or Pipeline()
+    metrics = metrics or RunMetrics()
     print(f"Fetching publications for Scholar ID: {SCHOLAR_ID}")
     
     try:
         # Get the author
-        author = scholarly.fill(scholarly.search_author_id(SCHOLAR_ID))
+        with metrics.timer('search'):
+            author = backend.fill(backend.search_author_id(SCHOLAR_ID))
+        
+        pubs = author.get('publications', [])
+        metrics.count('publications', len(pubs))
+        print(f"Found {len(pubs)} publications")
+        
+        if citations is not None:
+            changed, changed_years = citations.record(author, pubs)
+            print(f"Citation history: {changed} publication and {changed_years} per-year counts changed")
+        
+        incremental = state is not None and existing is not None
+        if incremental:
+            to_fill, unchanged = plan_incremental(pubs, state)
+            print(f"Incremental run: {len(to_fill)} new or changed, {len(unchanged)} unchanged")
+        else:
+            to_fill = list(range(len(pubs)))
+        
+        filled = {}
+        if journal is not None:
+            recorded = journal.completed()
+            for i in to_fill:
+                if pub_key(pubs[i]) in recorded:
+                    filled[i] = recorded[pub_key(pubs[i])]
+        pending = [i for i in to_fill if i not in filled]
+        metrics.count('resumed', len(filled))
+        
+        def report_error(index, e):
+            metrics.error('fill', e)
+            print(f"  Error processing publication: {e}")
+        
+        def report_retry(index, e):
+            metrics.count('retries')
+            metrics.error('fill_retried', e)
         
-        publications_list = []
+        def checkpoint(index, filled_pub):
+            if journal is not None:
+                journal.record(pub_key(pubs[pending[index]]), filled_pub)
         
-        # Fetch publications
-        print(f"Found {len(author.get('publications', []))} publications")
+        limiter = AdaptiveRateLimiter(rate=rate)
+        with metrics.timer('fill'):
+            results = fill_concurrently([pubs[i] for i in pending],
+                                        metrics.timed('fill_request', backend.fill), workers=workers,
+                                        limiter=limiter, on_error=report_error,
+                                        cached=getattr(backend, 'is_cached', None),
+                                        on_result=checkpoint, on_retry=report_retry)
+        filled.update(zip(pending, results))
+        metrics.sections['limiter'] = limiter_report(limiter)
         
-        for pub in author.get('publications', []):
+        # Results keep the profile order, so output is deterministic
+        raw_entries = {}
+        for i in to_fill:
+            filled_pub = filled[i]
+            if filled_pub is None:
+                continue
             try:
-                # Fill in publication details
-                filled_pub = scholarly.fill(pub)
-                
-                bib = filled_pub.get('bib', {})
-                title = bib.get('title', 'Untitled')
-                
-                # Handle authors - can be a list or string
-                author_list = bib.get('author', [])
-                if isinstance(author_list, str):
-                    authors = author_list
-                elif isinstance(author_list, list):
-                    authors = ', '.join(str(a) for a in author_list if a)
-                else:
-                    authors = ''
-                
-                # Get venue - try multiple fields
-                venue = bib.get('venue', '') or bib.get('journal', '') or bib.get('publisher', '')
-                
-                # If venue is still empty, try to extract from URL
-                if not venue or venue.strip() == '':
-                    venue = extract_venue_from_url(filled_pub.get('eprint_url') or filled_pub.get('pub_url', ''))
-                
-                # Skip if no title
-                if not title or title == 'Untitled':
-                    continue
-                
-                year = extract_year(filled_pub)
-                links = extract_links(filled_pub)
-                
-                # Determine type
-                pub_type = "journal"
-                venue_lower = venue.lower()
-                if any(word in venue_lower for word in ['conference', 'proceedings', 'workshop']):
-                    pub_type = "conference"
-                elif any(word in venue_lower for word in ['arxiv', 'preprint']):
-                    pub_type = "preprint"
-                
-                # Highlight author name
-                authors_highlighted = highlight_author(authors, YOUR_NAME)
-                
-                pub_entry = {
-                    'title': title,
-                    'authors': authors_highlighted,
-                    'venue': venue,
-                    'year': year,
-                    'type': pub_type,
-                    'links': links if links else None
-                }
-                
-                publications_list.append(pub_entry)
-                
-                print(f"  - {title[:60]}... ({year})")
-                
-                # Be polite to Google Scholar
-                time.sleep(1)
-                
+                entry = raw_entry(filled_pub)
             except Exception as e:
+                metrics.error('normalize', e)
                 print(f"  Error processing publication: {e}")
                 continue
+            if entry is not None:
+                raw_entries[i] = entry
         
-        # Sort by year (newest first)
-        publications_list.sort(key=lambda x: x['year'] if x['year'] else 0, reverse=True)
+        if metadata is not None:
+            with metrics.timer('enrich'):
+                enriched = metadata.enrich(raw_entries.values())
+            metrics.count('enriched', enriched)
+            print(f"Enriched {enriched} publications from {metadata.filename}")
         
-        # Group by year
-        publications_by_year = {}
-        for pub in publications_list:
-            year = pub['year'] if pub['year'] else 'Unknown'
-            if year not in publications_by_year:
-                publications_by_year[year] = []
-            publications_by_year[year].append(pub)
+        new_entries = {}
+        for i, entry in raw_entries.items():
+            try:
+                with metrics.timer('normalize'):
+                    pub_entry = pipeline.process(entry)
+            except Exception as e:
+                metrics.error('normalize', e)
+                print(f"  Error processing publication: {e}")
+                continue
+            if pub_entry is None:
+                continue
+            
+            new_entries[i] = pub_entry
+            print(f"  - {pub_entry['title'][:60]}... ({pub_entry['year']})")
+        
+        if incremental:
+            publications_list = merge_incremental(pubs, new_entries, state, existing)
+        else:
+            publications_list = [new_entries[i] for i in sorted(new_entries)]
         
-        # Convert to YAML structure - keep year in each entry for grouping
-        yaml_data = {'publications': []}
-        for year in sorted(publications_by_year.keys(), reverse=True):
-            for pub in publications_by_year[year]:
-                # Keep year in entry for template grouping
-                yaml_data['publications'].append(pub)
+        if state is not None:
+            update_state(state, pubs, new_entries, full=not incremental)
         
-        return yaml_data
+        if dedupe:
+            with metrics.timer('dedupe'):
+                before = len(publications_list)
+                publications_list = merge_duplicates(publications_list)
+            metrics.count('merged_duplicates', before - len(publications_list))
+        
+        metrics.count('filled', len(new_entries))
+        metrics.sections['pipeline'] = {name: round(seconds, 4)
+                                        for name, seconds in pipeline.timings.items()}
+        return build_yaml_data(publications_list)
         
     except Exception as e:
+        metrics.error('fetch', e)
         print(f"Error fetching publications: {e}")
         print("\nTroubleshooting:")
         print("1. Make sure you have installed: pip install scholarly")
         print("2. Check your internet connection")
-        print("3. Google Scholar may rate-limit requests - try again later")
+        print("3. Google Scholar may rate-limit requests - try again later (or lower --rate)")
         return None
 
-def save_to_yaml(data, filename='_data/publications.yml'):
-    """Save publications data to YAML file"""
+def merge_incremental(pubs, new_entries, state, existing):
+    """Merge freshly filled entries into the existing publications list
+    
+    Entries we did not re-fill are kept verbatim, including manual edits.
+    Entries that disappeared from the Scholar profile are dropped, and entries
+    that were never generated by this script (added by hand) are kept.
+    """
+    known = state.get('publications', {})
+    existing_pubs = list((existing or {}).get('publications') or [])
+    by_title = {title_hash(p.get('title')): p for p in existing_pubs}
+    
+    current_keys = {pub_key(p) for p in pubs}
+    vanished_titles = {rec.get('title_hash') for key, rec in known.items() if key not in current_keys}
+    
+    replaced = set()
+    refreshed = {}
+    for i, entry in new_entries.items():
+        record = known.get(pub_key(pubs[i]))
+        old_hash = record.get('title_hash') if record else title_hash(entry['title'])
+        old = by_title.get(old_hash)
+        if old is not None:
+            entry['links'] = merge_links(entry.get('links'), old.get('links'))
+            replaced.add(old_hash)
+        refreshed[old_hash] = entry
+    
+    publications_list = []
+    for pub in existing_pubs:
+        h = title_hash(pub.get('title'))
+        if h in replaced:
+            publications_list.append(refreshed.pop(h))
+        elif h in vanished_titles:
+            print(f"  Removed (no longer on Scholar): {pub.get('title', '')[:50]}...")
+        else:
+            # Unchanged generated entry, or a manually added one
+            publications_list.append(pub)
+    
+    # Brand new publications
+    publications_list.extend(refreshed.values())
+    return publications_list
+
+def update_state(state, pubs, new_entries, full=False):
+    """Record fingerprints for filled publications and forget vanished ones"""
+    known = state.setdefault('publications', {})
+    if full:
+        known.clear()
+    for i, entry in new_entries.items():
+        known[pub_key(pubs[i])] = {
+            'fingerprint': fingerprint(pubs[i]),
+            'title_hash': title_hash(entry['title']),
+        }
+    current_keys = {pub_key(p) for p in pubs}
+    for key in list(known):
+        if key not in current_keys:
+            del known[key]
+
+def make_backend(cache_file=CACHE_FILE, no_cache=False, cache_only=False, refresh=False,
+                 replay=None, replay_options=None):
+    """The scholarly module, wrapped in the response cache unless disabled
+
+    With a `replay` fixture (see scholar_replay.py) requests are answered from
+    it instead, with `replay_options` (latency, error_rate, ...) simulating
+    Scholar; the cache is bypassed so every request reaches the replay.
+    """
+    if replay:
+        return ReplayScholar.load(replay, **(replay_options or {}))
+    if scholarly is None:
+        raise SystemExit("scholarly is not installed: pip install scholarly (or use --replay FIXTURE)")
+    if no_cache:
+        return scholarly
+    return CachedScholar(scholarly, ResponseCache(cache_file), cache_only=cache_only, refresh=refresh)
+
+def save_to_yaml(data, filename=OUTPUT_FILE, search_index=SEARCH_INDEX_FILE, fragments=True,
+                 export_dir=EXPORT_DIR, metrics=None):
+    """Save publications data to YAML file
+    
+    The page's search index is rebuilt unless `search_index` is None, its
+    pre-rendered fragments (see render_publications.py) unless `fragments` is
+    false, and the citation exports (see export_citations.py) unless `export_dir` is None.
+    Each step is timed in `metrics` when given.
+    """
     if data is None:
         return
+    metrics = metrics or RunMetrics()
     
     # Ensure authors are strings, not lists
     for pub in data.get('publications', []):
         if 'authors' in pub and isinstance(pub['authors'], list):
             pub['authors'] = ', '.join(str(a) for a in pub['authors'] if a)
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    # Written to a temp file and renamed, so a crash never leaves a partial file
+    with metrics.timer('save'):
+        save_yaml(data, filename)
     
     print(f"\n✓ Saved {len(data['publications'])} publications to {filename}")
+    if search_index:
+        with metrics.timer('search_index'):
+            updated = write_search_index(data['publications'], search_index)
+        if updated:
+            print(f"✓ Updated search index {search_index}")
+    if fragments:
+        with metrics.timer('fragments'):
+            written = write_fragments(data['publications'])
+        print(f"✓ Re-rendered {len(written)} publication fragment(s)")
+    if export_dir:
+        with metrics.timer('export'):
+            written, _ = export_citations(data['publications'], export_dir)
+        print(f"✓ Updated {written} citation export(s) in {export_dir}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch publications from Google Scholar")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"number of concurrent fill requests (default: {DEFAULT_WORKERS})")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f"max Scholar requests per second; backs off on rate limits (default: {DEFAULT_RATE})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only fill new or changed publications and merge them into the existing YAML")
+    parser.add_argument('--output', default=OUTPUT_FILE,
+                        help=f"publications YAML file (default: {OUTPUT_FILE})")
+    parser.add_argument('--state-file',
+                        help=f"fingerprint state used by --incremental (default: {STATE_FILE})")
+    parser.add_argument('--cache-file', default=CACHE_FILE,
+                        help=f"on-disk Scholar response cache (default: {CACHE_FILE})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="talk to Scholar directly without the response cache")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument('--cache-only', action='store_true',
+                            help="answer every lookup from the cache and never contact Scholar")
+    cache_mode.add_argument('--refresh', action='store_true',
+                            help="ignore cached responses but record fresh ones")
+    parser.add_argument('--no-dedupe', action='store_true',
+                        help="keep near-duplicate entries (e.g. a preprint and its published version)")
+    parser.add_argument('--metadata-index', metavar='FILE',
+                        help="fill in DOIs, venues, volumes and pages from an index built by metadata_index.py")
+    parser.add_argument('--search-index',
+                        help=f"search index for the publications page (default: {SEARCH_INDEX_FILE})")
+    parser.add_argument('--no-search-index', action='store_true',
+                        help="do not rebuild the publications page search index")
+    parser.add_argument('--no-fragments', action='store_true',
+                        help="do not re-render the publications page fragments")
+    parser.add_argument('--no-export', action='store_true',
+                        help=f"do not update the BibTeX/CSL-JSON/RIS exports in {EXPORT_DIR}")
+    parser.add_argument('--citations-db',
+                        help=f"citation count history (default: {CITATIONS_FILE})")
+    parser.add_argument('--no-citations', action='store_true',
+                        help="do not record citation counts or update the citation metrics summary")
+    parser.add_argument('--report',
+                        help=f"JSON report of stage timings, request counts and errors (default: {REPORT_FILE})")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="also dump cProfile stats of the run to FILE (view with python -m pstats FILE)")
+    replay = parser.add_mutually_exclusive_group()
+    replay.add_argument('--record', metavar='FIXTURE',
+                        help="save every Scholar response of this run to a replay fixture")
+    replay.add_argument('--replay', metavar='FIXTURE',
+                        help="answer all requests from a fixture recorded with --record (no network)")
+    parser.add_argument('--replay-latency', type=float, default=0.0, metavar='SECONDS',
+                        help="simulated seconds per request with --replay (default: 0)")
+    parser.add_argument('--replay-error-rate', type=float, default=0.0, metavar='P',
+                        help="fraction of --replay requests that fail as rate-limited (default: 0)")
+    parser.add_argument('--replay-max-rate', type=float, metavar='N',
+                        help="with --replay, rate-limit requests beyond N per second")
+    parser.add_argument('--resume', action='store_true',
+                        help=f"reuse publications already filled by an interrupted run ({JOURNAL_FILE})")
+    parser.add_argument('--journal-file',
+                        help=f"checkpoint journal of filled publications (default: {JOURNAL_FILE})")
+    return side_outputs(parser.parse_args(argv))
+
+def side_outputs(args):
+    """Fill in the paths of everything the run writes besides --output
+
+    A replayed run, or one writing somewhere other than the site's
+    publications file, is a trial run and must not touch the site: the search
+    index, page fragments, citation exports and citation history are skipped
+    unless --search-index or --citations-db name a file, and the fetch state,
+    journal, report and citation summary become dotfiles next to --output
+    (e.g. /tmp/.x.yml.state.json for --output /tmp/x.yml).
+    """
+    args.trial = bool(args.replay) or os.path.abspath(args.output) != os.path.abspath(OUTPUT_FILE)
+    directory, name = os.path.split(args.output)
+
+    def default(path, suffix):
+        return os.path.join(directory, f".{name}.{suffix}") if args.trial else path
+
+    if args.trial:
+        args.no_fragments = args.no_export = True
+        args.no_search_index = args.no_search_index or args.search_index is None
+        args.no_citations = args.no_citations or args.citations_db is None
+    args.search_index = args.search_index or SEARCH_INDEX_FILE
+    args.citations_db = args.citations_db or CITATIONS_FILE
+    args.citations_summary = default(SUMMARY_FILE, 'metrics.yml')
+    args.state_file = args.state_file or default(STATE_FILE, 'state.json')
+    args.journal_file = args.journal_file or default(JOURNAL_FILE, 'journal.jsonl')
+    args.report = args.report or default(REPORT_FILE, 'report.json')
+    return args
 
 if __name__ == "__main__":
+    args = parse_args()
+    
     print("=" * 60)
     print("Google Scholar Publications Fetcher")
     print("=" * 60)
+    if args.trial:
+        print(f"Trial run: the site's derived files are left alone; state and report go next to {args.output}")
+    
+    state = load_state(args.state_file)
+    existing = None
+    if args.incremental and os.path.exists(args.output):
+        existing = load_yaml(args.output) or {'publications': []}
     
-    data = fetch_publications()
+    backend = make_backend(args.cache_file, args.no_cache, args.cache_only, args.refresh,
+                           replay=args.replay,
+                           replay_options={'latency': args.replay_latency,
+                                           'error_rate': args.replay_error_rate,
+                                           'max_rate': args.replay_max_rate})
+    recorder = RecordingScholar(backend) if args.record else None
+    metadata = MetadataIndex(args.metadata_index) if args.metadata_index else None
+    citations = None if args.no_citations else CitationStore(args.citations_db)
+    
+    journal = FetchJournal(args.journal_file, scholar_id=SCHOLAR_ID, resume=args.resume)
+    metrics = RunMetrics()
+    metrics.sections['run'] = {'scholar_id': SCHOLAR_ID, 'workers': args.workers, 'rate': args.rate,
+                               'incremental': args.incremental, 'resume': args.resume}
+    
+    def write_report(outcome):
+        metrics.sections['run']['outcome'] = outcome
+        if isinstance(backend, CachedScholar):
+            metrics.sections['cache'] = {'hits': backend.cache.hits, 'misses': backend.cache.misses}
+        if isinstance(backend, ReplayScholar):
+            metrics.sections['replay'] = backend.stats()
+        metrics.write_report(args.report)
+        print(f"\nRun report written to {args.report}")
+        for line in metrics.summary():
+            print(line)
+    
+    with profiled(args.profile):
+        try:
+            data = fetch_publications(workers=args.workers, rate=args.rate, state=state,
+                                      existing=existing, backend=recorder or backend, journal=journal,
+                                      dedupe=not args.no_dedupe, metadata=metadata, metrics=metrics,
+                                      citations=citations)
+        except KeyboardInterrupt:
+            journal.close()
+            write_report('interrupted')
+            print(f"\n✗ Interrupted. Progress is saved in {args.journal_file}; re-run with --resume to continue.")
+            sys.exit(130)
+        
+        if isinstance(backend, CachedScholar):
+            print(f"\nCache: {backend.cache.hits} hits, {backend.cache.misses} misses ({args.cache_file})")
+        if recorder is not None:
+            recorder.save(args.record)
+            print(f"Recorded {len(recorder.responses)} responses to {args.record}")
+        
+        if data:
+            save_to_yaml(data, args.output, None if args.no_search_index else args.search_index,
+                         fragments=not args.no_fragments,
+                         export_dir=None if args.no_export else EXPORT_DIR, metrics=metrics)
+            save_state(state, args.state_file)
+            journal.finish()
+        
+        if citations is not None:
+            if write_summary(citations, args.citations_summary):
+                print(f"✓ Updated citation metrics summary {args.citations_summary}")
+            citations.close()
+    
+    write_report('saved' if data else 'failed')
     
     if data:
-        save_to_yaml(data)
         print("\n✓ Done! Your publications have been updated.")
         print("\nNote: You may need to manually:")
         print("  - Review and edit the generated YAML file")
         print("  - Add additional links (code, project pages, etc.)")
         print("  - Verify author name highlighting")
     else:
+        journal.close()
         print("\n✗ Failed to fetch publications. Please check the error messages above.")
-
+        print(f"  Filled publications are checkpointed in {args.journal_file}; re-run with --resume.")
+    if args.profile:
+        print(f"Profile written to {args.profile}")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Per-publication fingerprints for incremental Google Scholar fetches.
+The state file remembers, for every Scholar publication id, a fingerprint of
+what Scholar reported last time and the title of the entry we generated from it,
+so unchanged entries in publications.yml can be kept exactly as they are.
+"""
+
+import hashlib
+import json
+import os
+
+from pub_io import atomic_write
+
+STATE_FILE = '.publications_state.json'
+STATE_VERSION = 1
+
+def title_hash(title):
+    """Hash a title after collapsing case and whitespace"""
+    normalized = ' '.join(str(title or '').lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+def pub_key(pub):
+    """Stable key for an (unfilled) scholarly publication"""
+    if pub.get('author_pub_id'):
+        return pub['author_pub_id']
+    return 'title:' + title_hash(pub.get('bib', {}).get('title'))
+
+def fingerprint(pub):
+    """Fingerprint of the fields Scholar exposes without a fill request"""
+    bib = pub.get('bib', {})
+    parts = [pub_key(pub), str(pub.get('num_citations', 0)), title_hash(bib.get('title'))]
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+def load_state(filename=STATE_FILE):
+    """Load the fingerprint state, or an empty state if there is none"""
+    if not os.path.exists(filename):
+        return {'version': STATE_VERSION, 'publications': {}}
+    with open(filename, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    if state.get('version') != STATE_VERSION:
+        print(f"  Ignoring {filename}: unsupported state version")
+        return {'version': STATE_VERSION, 'publications': {}}
+    return state
+
+def save_state(state, filename=STATE_FILE):
+    """Write the fingerprint state"""
+    with atomic_write(filename) as f:
+        json.dump(state, f, indent=1, sort_keys=True, ensure_ascii=False)
+
+def plan_incremental(pubs, state):
+    """Split profile publications into (changed, unchanged) index lists"""
+    known = state.get('publications', {})
+    changed, unchanged = [], []
+    for i, pub in enumerate(pubs):
+        record = known.get(pub_key(pub))
+        if record and record.get('fingerprint') == fingerprint(pub):
+            unchanged.append(i)
+        else:
+            changed.append(i)
+    return changed, unchanged
+
+def merge_links(new_links, old_links):
+    """Refresh generated links while keeping manually added ones (code, project, ...)"""
+    if not old_links:
+        return new_links
+    merged = dict(old_links)
+    merged.update(new_links or {})
+    return merged or None
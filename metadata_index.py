@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Offline DOI/venue enrichment from a local bibliographic dump.
+A Crossref or OpenAlex JSONL snapshot (optionally gzipped) is indexed once into
+a SQLite file keyed by DOI and by a hash of the normalized title. Publications
+are then matched in batches, one IN (...) query per few hundred records, over a
+memory-mapped read-only connection, so even a multi-GB dump costs a few index
+page reads per record and almost no memory. Matches fill in the DOI link and
+the exact venue, volume and pages; preprints are not enriched.
+Usage: python metadata_index.py --build DUMP.jsonl[.gz] [--index FILE]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+from dedupe import normalize_title
+from venues import classify_type, default_resolver
+
+METADATA_INDEX = '.metadata_index.sqlite3'
+INDEX_VERSION = 1
+
+BATCH_SIZE = 500           # records matched per query (below SQLite's variable limit)
+INSERT_BATCH = 50000       # dump rows inserted per transaction while building
+MMAP_SIZE = 1024 ** 3      # map up to 1 GB of the index instead of reading pages into the heap
+YEAR_TOLERANCE = 1         # preprint/online-first vs issue year
+
+DOI_RE = re.compile(r'10\.\d{4,9}/[^\s"<>?#]+', re.IGNORECASE)
+# URL suffixes publishers append after the DOI
+DOI_SUFFIXES = ('/full', '/abstract', '/abs', '/pdf', '/epdf', '/meta', '/fulltext')
+
+SCHEMA = """
+CREATE TABLE works (
+    doi TEXT PRIMARY KEY,
+    title_key INTEGER NOT NULL,
+    year INTEGER,
+    venue TEXT,
+    volume TEXT,
+    pages TEXT
+) WITHOUT ROWID;
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def title_key(title):
+    """64-bit key of a normalized title (an INTEGER column keeps the index small)"""
+    digest = hashlib.sha1(normalize_title(title).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+def normalize_doi(doi):
+    """Bare lowercase DOI from a DOI, doi.org URL or publisher URL, or None"""
+    match = DOI_RE.search(str(doi or ''))
+    if not match:
+        return None
+    doi = match.group().rstrip('.,;').lower()
+    for suffix in DOI_SUFFIXES:
+        if doi.endswith(suffix):
+            doi = doi[:-len(suffix)]
+    return doi
+
+def record_doi(record):
+    """DOI of a publications.yml record, from its doi link or a publisher URL"""
+    links = record.get('links') or {}
+    for key in ('doi', 'pdf'):
+        doi = normalize_doi(links.get(key))
+        if doi:
+            return doi
+    return None
+
+def _first(value):
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+def _year(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def work_row(obj):
+    """(doi, title_key, year, venue, volume, pages) from a Crossref or OpenAlex work"""
+    if 'DOI' in obj:  # Crossref
+        doi = obj['DOI']
+        title = _first(obj.get('title'))
+        venue = _first(obj.get('container-title'))
+        date = (obj.get('issued') or obj.get('published') or {}).get('date-parts') or [[None]]
+        year = date[0][0] if date and date[0] else None
+        volume, pages = obj.get('volume'), obj.get('page')
+    else:  # OpenAlex
+        doi = obj.get('doi')
+        title = obj.get('title') or obj.get('display_name')
+        source = (obj.get('primary_location') or {}).get('source') or {}
+        venue = source.get('display_name')
+        year = obj.get('publication_year')
+        biblio = obj.get('biblio') or {}
+        volume = biblio.get('volume')
+        pages = '-'.join(p for p in (biblio.get('first_page'), biblio.get('last_page')) if p)
+    doi = normalize_doi(doi)
+    if not doi or not title:
+        return None
+    return (doi, title_key(title), _year(year), venue or None, volume or None, pages or None)
+
+def iter_dump(filename):
+    """Works in a JSONL dump; lines may also be Crossref-style {"items": [...]} pages"""
+    opener = gzip.open if filename.endswith('.gz') else open
+    with opener(filename, 'rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            if isinstance(obj.get('items'), list):
+                yield from obj['items']
+            else:
+                yield obj
+
+def build_index(dump_file, index_file=METADATA_INDEX, verbose=True):
+    """Index a JSONL dump into a fresh SQLite file; returns the number of works"""
+    tmp_file = index_file + '.tmp'
+    if os.path.exists(tmp_file):
+        os.unlink(tmp_file)
+    db = sqlite3.connect(tmp_file)
+    try:
+        # Bulk load: nothing to recover if the build dies, the temp file is discarded
+        db.execute("PRAGMA journal_mode=OFF")
+        db.execute("PRAGMA synchronous=OFF")
+        db.execute("PRAGMA cache_size=-262144")  # 256 MB
+        db.executescript(SCHEMA)
+        count, batch = 0, []
+        start = time.perf_counter()
+        for obj in iter_dump(dump_file):
+            row = work_row(obj)
+            if row is None:
+                continue
+            batch.append(row)
+            if len(batch) >= INSERT_BATCH:
+                count += _insert(db, batch)
+                batch = []
+                if verbose:
+                    print(f"  {count} works indexed ({time.perf_counter() - start:.0f}s)")
+        count += _insert(db, batch)
+        # Building the secondary index once after loading beats maintaining it per row
+        db.execute("CREATE INDEX works_title ON works (title_key)")
+        db.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ('version', str(INDEX_VERSION)),
+            ('source', os.path.basename(dump_file)),
+            ('works', str(count)),
+        ])
+        db.commit()
+        db.execute("ANALYZE")
+    except BaseException:
+        db.close()
+        os.unlink(tmp_file)
+        raise
+    db.close()
+    os.replace(tmp_file, index_file)
+    return count
+
+def _insert(db, rows):
+    # First occurrence of a DOI wins, like a dump sorted by relevance
+    before = db.total_changes
+    with db:
+        db.executemany("INSERT OR IGNORE INTO works VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return db.total_changes - before
+
+class MetadataIndex:
+    """Read-only, memory-mapped lookups in an index built by build_index()"""
+
+    def __init__(self, filename=METADATA_INDEX, batch_size=BATCH_SIZE):
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"No metadata index at {filename}; build one with "
+                                    f"python metadata_index.py --build DUMP")
+        self.filename = filename
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(f"file:{os.path.abspath(filename)}?mode=ro", uri=True)
+        self._db.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        version = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if not version or int(version[0]) != INDEX_VERSION:
+            raise ValueError(f"{filename} was built by an incompatible version; rebuild it")
+        self.matched_doi = 0
+        self.matched_title = 0
+
+    def close(self):
+        self._db.close()
+
+    def _query(self, column, keys):
+        """{key: [work dicts]} for a set of DOIs or title keys, in batches"""
+        found = {}
+        # Sorted keys walk the B-tree in order, touching each page once
+        keys = sorted(keys)
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._db.execute(
+                f"SELECT doi, title_key, year, venue, volume, pages FROM works "
+                f"WHERE {column} IN ({placeholders})", chunk)
+            for doi, key, year, venue, volume, pages in rows:
+                work = {'doi': doi, 'year': year, 'venue': venue, 'volume': volume, 'pages': pages}
+                found.setdefault(doi if column == 'doi' else key, []).append(work)
+        return found
+
+    def lookup(self, records):
+        """Matching work (or None) for each record: by DOI, then by title and year"""
+        records = list(records)
+        dois = [record_doi(r) for r in records]
+        by_doi = self._query('doi', {d for d in dois if d})
+
+        matches = [None] * len(records)
+        title_keys = {}
+        for i, (record, doi) in enumerate(zip(records, dois)):
+            if doi in by_doi:
+                matches[i] = by_doi[doi][0]
+                self.matched_doi += 1
+            elif record.get('title'):
+                title_keys[i] = title_key(record['title'])
+        by_title = self._query('title_key', set(title_keys.values()))
+
+        for i, key in title_keys.items():
+            work = _pick_by_year(by_title.get(key, []), records[i].get('year'))
+            if work is not None:
+                matches[i] = work
+                self.matched_title += 1
+        return matches
+
+    def enrich(self, records):
+        """Fill in DOI, venue, volume and pages in place; returns how many records changed"""
+        records = list(records)
+        changed = 0
+        for start in range(0, len(records), self.batch_size):
+            batch = records[start:start + self.batch_size]
+            for record, work in zip(batch, self.lookup(batch)):
+                if work is not None and enrich_record(record, work):
+                    changed += 1
+        return changed
+
+def _pick_by_year(works, year):
+    """The single work with a compatible year; ambiguous titles are left unmatched"""
+    year = _year(year)
+    if year is not None:
+        works = [w for w in works if w['year'] is None or abs(w['year'] - year) <= YEAR_TOLERANCE]
+    return works[0] if len(works) == 1 else None
+
+def is_vague_venue(venue):
+    """Empty, or only a publisher name guessed from a URL host (e.g. "IEEE")"""
+    return not (venue or '').strip() or venue in default_resolver().host_venues
+
+def is_preprint(record):
+    """Typed as a preprint, or with a preprint server as its venue"""
+    return record.get('type') == 'preprint' or classify_type(record.get('venue')) == 'preprint'
+
+def enrich_record(record, work):
+    """Copy a matched work's metadata into a record; returns True if anything changed
+
+    Preprints are left alone: a title match is usually the published version,
+    whose DOI and pages would end up in the preprint's citations. Merging the
+    two is dedupe's job.
+    """
+    if is_preprint(record):
+        return False
+    changed = False
+    links = dict(record.get('links') or {})
+    if not links.get('doi'):
+        links['doi'] = f"https://doi.org/{work['doi']}"
+        record['links'] = links
+        changed = True
+    if work['venue'] and is_vague_venue(record.get('venue')):
+        record['venue'] = work['venue']
+        changed = True
+    for key in ('volume', 'pages'):
+        if work[key] and not record.get(key):
+            record[key] = work[key]
+            changed = True
+    return changed
+
+def enrich_records(records, index, batch_size=BATCH_SIZE):
+    """Lazily enrich an iterable of records, looking them up a batch at a time"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            index.enrich(batch)
+            yield from batch
+            batch = []
+    if batch:
+        index.enrich(batch)
+        yield from batch
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline metadata index from a Crossref/OpenAlex dump")
+    parser.add_argument('--build', metavar='DUMP', required=True,
+                        help="JSONL dump to index (.gz is read compressed)")
+    parser.add_argument('--index', default=METADATA_INDEX,
+                        help=f"SQLite index file to write (default: {METADATA_INDEX})")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    count = build_index(args.build, args.index)
+    print(f"✓ Indexed {count} works into {args.index} in {time.perf_counter() - start:.1f}s")
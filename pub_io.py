@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Reading and writing _data/publications.yml.
+Writes go to a temporary file in the same directory which is then renamed over
+the target, so a crash can never leave a half-written file behind.
+
+YAML is parsed and emitted with libyaml's C loader/dumper when PyYAML was built
+with it, falling back to the pure-Python implementation otherwise. Read-only
+tools can use load_publications(), which keeps a marshal sidecar next to the
+YAML file and only re-parses the YAML when its contents change, and
+iter_publications(), which streams entries one at a time in constant memory.
+"""
+
+import hashlib
+import marshal
+import os
+import stat
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import yaml
+from yaml.events import (AliasEvent, DocumentStartEvent, MappingEndEvent, MappingStartEvent,
+                         ScalarEvent, SequenceEndEvent, SequenceStartEvent)
+from yaml.nodes import ScalarNode
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
+
+PUBLICATIONS_FILE = '_data/publications.yml'
+
+SIDECAR_VERSION = 1
+
+# mkstemp creates files as 0600; replacements get the usual permissions instead
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _file_mode(filename):
+    """Permissions for a replacement: those of the file it replaces, else 0666 minus the umask"""
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+@contextmanager
+def atomic_write(filename, mode='w', encoding='utf-8'):
+    """Open a temp file next to `filename` and rename it into place on success"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(filename) + '.',
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _file_mode(filename))
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def load_yaml(filename=PUBLICATIONS_FILE):
+    """Load a YAML data file"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def dump_yaml(data, stream=None):
+    """Dump data in the repo's house style (returns a string if no stream is given)"""
+    return yaml.dump(data, stream, Dumper=SafeDumper, default_flow_style=False,
+                     allow_unicode=True, sort_keys=False)
+
+def save_yaml(data, filename=PUBLICATIONS_FILE):
+    """Atomically write a YAML data file in the repo's house style"""
+    with atomic_write(filename) as f:
+        dump_yaml(data, f)
+
+def is_site_file(filename):
+    """True if `filename` is the site's own publications.yml
+
+    Tools writing anywhere else are on a trial run and leave the files derived
+    from the site's list (search index, fragments, exports) alone.
+    """
+    return os.path.abspath(filename) == os.path.abspath(PUBLICATIONS_FILE)
+
+def sidecar_path(filename):
+    """Hidden file next to the YAML file (Jekyll ignores dotfiles in _data)"""
+    directory, name = os.path.split(filename)
+    return os.path.join(directory, f".{name}.marshal")
+
+def _sidecar_key(stat, digest):
+    return {
+        'version': SIDECAR_VERSION,
+        'python': list(sys.version_info[:2]),  # marshal's format is version-specific
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha1': digest,
+    }
+
+def load_publications(filename=PUBLICATIONS_FILE, use_sidecar=True):
+    """Load publications.yml for read-only use, via the sidecar when it is current"""
+    if not use_sidecar:
+        return load_yaml(filename)
+
+    with open(filename, 'rb') as f:
+        raw = f.read()
+        stat = os.fstat(f.fileno())
+    key = _sidecar_key(stat, hashlib.sha1(raw).hexdigest())
+
+    sidecar = sidecar_path(filename)
+    try:
+        with open(sidecar, 'rb') as f:
+            if marshal.load(f) == key:
+                return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass  # Missing, stale or from another Python version
+
+    data = yaml.load(raw.decode('utf-8'), Loader=SafeLoader)
+    try:
+        with atomic_write(sidecar, 'wb') as f:
+            marshal.dump(key, f)
+            marshal.dump(data, f)
+    except (OSError, ValueError):
+        pass  # Read-only checkout, or values marshal cannot store (e.g. dates)
+    return data
+
+def _construct_from_events(loader):
+    """Build the next value from parser events, without keeping a node graph around"""
+    event = loader.get_event()
+    if isinstance(event, ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(ScalarNode, event.value, event.implicit)
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        constructor = loader.yaml_constructors.get(tag, loader.yaml_constructors[None])
+        return constructor(loader, node)
+    if isinstance(event, SequenceStartEvent):
+        items = []
+        while not loader.check_event(SequenceEndEvent):
+            items.append(_construct_from_events(loader))
+        loader.get_event()
+        return items
+    if isinstance(event, MappingStartEvent):
+        mapping = {}
+        while not loader.check_event(MappingEndEvent):
+            key = _construct_from_events(loader)
+            mapping[key] = _construct_from_events(loader)
+        loader.get_event()
+        return mapping
+    if isinstance(event, AliasEvent):
+        raise ValueError(f"YAML aliases are not supported when streaming ({event.start_mark})")
+    raise ValueError(f"Unexpected YAML event {event}")
+
+def _construct_entry(loader):
+    """(line, entry, {key: line}) for the next entry; lines are 1-based"""
+    line = loader.peek_event().start_mark.line + 1
+    if not loader.check_event(MappingStartEvent):
+        return line, _construct_from_events(loader), {}
+    loader.get_event()
+    entry, lines = {}, {}
+    while not loader.check_event(MappingEndEvent):
+        key = _construct_from_events(loader)
+        lines[key] = loader.peek_event().start_mark.line + 1
+        entry[key] = _construct_from_events(loader)
+    loader.get_event()
+    return line, entry, lines
+
+def iter_publications(filename=PUBLICATIONS_FILE, lines=False):
+    """Yield the entries of a publications file one at a time
+
+    Only the entry being built is held in memory, so exporting or indexing a
+    merged lab file costs the same memory at any size. With `lines`, yields
+    (line, entry, {key: line}) tuples instead, for error messages.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        loader = SafeLoader(f)
+        try:
+            loader.get_event()  # StreamStart
+            if not loader.check_event(DocumentStartEvent):
+                return  # Empty file
+            loader.get_event()
+            if not loader.check_event(MappingStartEvent):
+                return  # Not a {publications: [...]} document
+            loader.get_event()
+            while not loader.check_event(MappingEndEvent):
+                key = _construct_from_events(loader)
+                if key != 'publications' or not loader.check_event(SequenceStartEvent):
+                    _construct_from_events(loader)  # other top-level keys, or an empty list
+                    continue
+                loader.get_event()
+                while not loader.check_event(SequenceEndEvent):
+                    yield _construct_entry(loader) if lines else _construct_from_events(loader)
+                loader.get_event()
+        finally:
+            loader.dispose()
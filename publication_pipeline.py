@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Single-pass publication pipeline.
+Each record flows through a list of pluggable stages in memory (normalize
+authors, resolve venue, highlight, classify type) and the result is written
+once. fetch_publications.py feeds freshly fetched records through the same
+stages; this script re-runs them over an existing publications.yml. Written
+anywhere but _data/publications.yml, the result is a trial run that leaves
+the site's search index, page fragments and citation exports alone.
+Usage: python publication_pipeline.py [--input FILE] [--output FILE] [--stages a,b,...]
+"""
+
+import argparse
+import time
+from functools import partial
+
+from authors import AuthorMatcher, normalize_authors, profile_people, render_authors
+from dedupe import merge_duplicates
+from export_citations import EXPORT_DIR, export_citations
+from metadata_index import MetadataIndex, enrich_records
+from pub_io import PUBLICATIONS_FILE, is_site_file, save_yaml
+from records import SchemaError, load_records
+from render_publications import write_fragments
+from scholar_profile import YOUR_NAME
+from search_index import SEARCH_INDEX_FILE, write_search_index
+from venues import classify_type, venue_from_links
+
+def normalize_authors_stage(record):
+    """Rebuild broken author fields into a single 'A, B, C' string"""
+    if 'authors' in record:
+        record['authors'] = normalize_authors(record['authors'])
+    return record
+
+def resolve_venue_stage(record):
+    """Fill in a missing venue from the publication's links"""
+    if not (record.get('venue') or '').strip():
+        record['venue'] = venue_from_links(record.get('links')) or ''
+    return record
+
+def highlight_stage(record, matcher):
+    """Index the authors, then render the authors string with our people in bold"""
+    if isinstance(record.get('authors'), str):
+        author_list, members = matcher.index(record['authors'])
+        record['authors'] = render_authors(author_list)
+        record['author_list'] = author_list
+        if members:
+            record['members'] = members
+        else:
+            record.pop('members', None)
+    return record
+
+def classify_type_stage(record):
+    """Set the publication type from the venue, unless it was set by hand"""
+    if not record.get('type'):
+        record['type'] = classify_type(record.get('venue'))
+    return record
+
+# Stages in the order they run; fetching happens before and emitting after
+STAGE_ORDER = ['normalize_authors', 'resolve_venue', 'highlight', 'classify_type']
+
+def build_stages(names=None, your_name=YOUR_NAME, people=None):
+    """Look up stage functions by name
+
+    `people` ({person id: [names]}) defaults to the people in scholar_profile.py.
+    """
+    # Built once per run; highlighting is then one dict lookup per author
+    matcher = AuthorMatcher(people if people is not None else profile_people(your_name))
+    available = {
+        'normalize_authors': normalize_authors_stage,
+        'resolve_venue': resolve_venue_stage,
+        'highlight': partial(highlight_stage, matcher=matcher),
+        'classify_type': classify_type_stage,
+    }
+    names = STAGE_ORDER if names is None else names
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+    return [(n, available[n]) for n in names]
+
+class Pipeline:
+    """Runs records one at a time through a sequence of named stages
+
+    A stage is a callable taking a record dict and returning it (possibly
+    modified in place) or None to drop it. Time spent per stage is
+    accumulated in `timings` so stages can be benchmarked individually.
+    """
+
+    def __init__(self, stages=None):
+        self.stages = list(stages) if stages is not None else build_stages()
+        self.timings = {name: 0.0 for name, _ in self.stages}
+        self.dropped = 0
+
+    def process(self, record):
+        """Run one record through every stage"""
+        for name, stage in self.stages:
+            start = time.perf_counter()
+            record = stage(record)
+            self.timings[name] += time.perf_counter() - start
+            if record is None:
+                self.dropped += 1
+                return None
+        return record
+
+    def run(self, records):
+        """Lazily process an iterable of records"""
+        for record in records:
+            record = self.process(record)
+            if record is not None:
+                yield record
+
+def yaml_source(filename=PUBLICATIONS_FILE):
+    """Yield the records of an existing publications.yml
+
+    The whole file is validated before the first record is yielded (see
+    records.py), so a SchemaError listing every violation is raised before
+    anything gets written.
+    """
+    for record in load_records(filename):
+        yield record.to_dict()
+
+def emit(records, filename=PUBLICATIONS_FILE, search_index=None, fragments=False, export_dir=None):
+    """Write records to publications.yml in one go; returns the count
+
+    With a `search_index` filename, the page's search index is rebuilt from
+    the same records (see search_index.py), with `fragments` so are the
+    pre-rendered page sections (see render_publications.py), and with an
+    `export_dir` the citation exports (see export_citations.py).
+    """
+    publications = list(records)
+    save_yaml({'publications': publications}, filename)
+    if search_index:
+        write_search_index(publications, search_index)
+    if fragments:
+        write_fragments(publications)
+    if export_dir:
+        export_citations(publications, export_dir)
+    return len(publications)
+
+def run_pipeline(input_file=PUBLICATIONS_FILE, output_file=None, stages=None, dedupe=False,
+                 metadata=None, search_index=None, fragments=False, export_dir=None):
+    """Load, process and write publications.yml with a single parse and dump
+
+    With a `metadata` index (see metadata_index.py), records are enriched in
+    batches before the stages run, so venues are only guessed from URLs when
+    the index has no match.
+    With `dedupe`, near-duplicate records are merged before writing; this needs
+    the whole list, so records are collected instead of streamed.
+    """
+    pipeline = Pipeline(stages)
+    records = yaml_source(input_file)
+    if metadata is not None:
+        records = enrich_records(records, metadata)
+    records = pipeline.run(records)
+    if dedupe:
+        records = merge_duplicates(list(records))
+    count = emit(records, output_file or input_file, search_index, fragments, export_dir)
+    return count, pipeline
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run the publication stages over publications.yml")
+    parser.add_argument('--input', default=PUBLICATIONS_FILE,
+                        help=f"publications YAML to read (default: {PUBLICATIONS_FILE})")
+    parser.add_argument('--output', help="where to write the result (default: overwrite --input)")
+    parser.add_argument('--stages', default=','.join(STAGE_ORDER),
+                        help=f"comma-separated stages to run (default: {','.join(STAGE_ORDER)})")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="merge near-duplicate entries such as preprint/published pairs")
+    parser.add_argument('--metadata-index', metavar='FILE',
+                        help="fill in DOIs, venues, volumes and pages from an index built by metadata_index.py")
+    parser.add_argument('--search-index',
+                        help=f"search index for the publications page (default: {SEARCH_INDEX_FILE}; "
+                             f"none when writing to another file than {PUBLICATIONS_FILE})")
+    parser.add_argument('--no-search-index', action='store_true',
+                        help="do not rebuild the publications page search index")
+    parser.add_argument('--no-fragments', action='store_true',
+                        help="do not re-render the publications page fragments")
+    parser.add_argument('--no-export', action='store_true',
+                        help=f"do not update the BibTeX/CSL-JSON/RIS exports in {EXPORT_DIR}")
+    parser.add_argument('--name', default=YOUR_NAME, help=f"name to highlight (default: {YOUR_NAME})")
+    args = parser.parse_args(argv)
+    if not is_site_file(args.output or args.input):
+        # A trial run: the site's fragments and exports stay as they are
+        args.no_fragments = args.no_export = True
+        args.no_search_index = args.no_search_index or args.search_index is None
+    args.search_index = args.search_index or SEARCH_INDEX_FILE
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    stages = build_stages([s for s in args.stages.split(',') if s], your_name=args.name)
+    metadata = MetadataIndex(args.metadata_index) if args.metadata_index else None
+    try:
+        count, pipeline = run_pipeline(args.input, args.output, stages, dedupe=args.dedupe,
+                                       metadata=metadata,
+                                       search_index=None if args.no_search_index else args.search_index,
+                                       fragments=not args.no_fragments,
+                                       export_dir=None if args.no_export else EXPORT_DIR)
+    except SchemaError as e:
+        for line, message in e.errors:
+            print(f"  ✗ {e.filename}:{line}: {message}")
+        print(f"✗ {args.input} was not changed")
+        raise SystemExit(1)
+    print(f"✓ Processed {count} publications into {args.output or args.input}")
+    if metadata is not None:
+        print(f"  Metadata matches: {metadata.matched_doi} by DOI, {metadata.matched_title} by title")
+    for name, seconds in pipeline.timings.items():
+        print(f"  {name:<18} {seconds * 1000:8.2f} ms")
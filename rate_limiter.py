@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Adaptive rate limiting and concurrent filling for Google Scholar requests.
+The limiter is a token bucket that halves its rate when Scholar pushes back
+and slowly climbs back to the configured rate while requests succeed.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Substrings that identify a rate-limit / ban response from scholarly
+RATE_LIMIT_MARKERS = (
+    'maxtriesexceeded',
+    'cannot fetch',
+    'too many requests',
+    '429',
+    'captcha',
+    'rate limit',
+)
+
+def is_rate_limit_error(exc):
+    """Return True if the exception looks like Scholar throttling us"""
+    text = f"{type(exc).__name__} {exc}".lower()
+    return any(marker in text for marker in RATE_LIMIT_MARKERS)
+
+class AdaptiveRateLimiter:
+    """Thread-safe token bucket whose rate adapts to rate-limit errors"""
+
+    def __init__(self, rate=1.0, burst=1, min_rate=0.05, backoff=0.5, recovery=1.1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_rate = rate  # Never recover past the configured rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.backoff = backoff
+        self.recovery = recovery
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        # Totals for run reports: seconds spent waiting for tokens (summed over threads), rate cuts
+        self.waited = 0.0
+        self.backoffs = 0
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+    def on_success(self):
+        """Speed back up towards the configured rate"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate * self.recovery)
+
+    def on_rate_limit(self):
+        """Slow down and drain the bucket so the next request waits"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.backoff)
+            self._tokens = min(self._tokens, 0.0)
+            self.backoffs += 1
+
+def fill_concurrently(items, fill, workers=1, limiter=None, retries=3, on_error=None, cached=None,
+                      on_result=None, on_retry=None):
+    """Call fill(item) for every item on a bounded thread pool.
+
+    Results are returned in the same order as items; entries that still fail
+    after the retries are None. on_error(index, exc) is called for each failure
+    and on_result(index, result) for each success, as soon as it completes.
+    on_retry(index, exc) is called for each rate-limited attempt that is retried.
+    Items for which cached(item) is true do not wait for a rate-limit token.
+    """
+    limiter = limiter or AdaptiveRateLimiter()
+
+    def run(index, item):
+        attempt = 0
+        while True:
+            if not (cached and cached(item)):
+                limiter.acquire()
+            try:
+                result = fill(item)
+            except Exception as e:
+                if is_rate_limit_error(e) and attempt < retries:
+                    attempt += 1
+                    limiter.on_rate_limit()
+                    if on_retry:
+                        on_retry(index, e)
+                    continue
+                if on_error:
+                    on_error(index, e)
+                return None
+            limiter.on_success()
+            if on_result:
+                on_result(index, result)
+            return result
+
+    items = list(items)
+    if workers <= 1:
+        return [run(i, item) for i, item in enumerate(items)]
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [pool.submit(run, i, item) for i, item in enumerate(items)]
+        return [f.result() for f in futures]
+    except BaseException:
+        # Ctrl-C or a crash: don't keep hammering Scholar with queued requests
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown()
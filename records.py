@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Typed publication records.
+Publication, Links and authors.Author are slotted dataclasses: no per-record
+__dict__, so a merged lab file loaded as records takes far less memory than
+the same file as nested dicts. load_records() streams the YAML, checks every
+entry against the schema below and reports all violations at once with their
+line numbers; code that holds records can rely on the field types instead of
+re-checking them. to_dict()/from_dict() convert to and from the publications.yml
+entries the pipeline stages and the site work on; to_dict() always uses the
+fixed key order the pipeline writes, not the order the file had.
+Usage: python records.py [FILE]
+"""
+
+import sys
+from dataclasses import dataclass
+
+from authors import Author
+from pub_io import PUBLICATIONS_FILE, iter_publications
+
+PUB_TYPES = ('journal', 'conference', 'preprint')
+LINK_KEYS = ('pdf', 'arxiv', 'doi', 'code')
+AUTHOR_KEYS = {'given': str, 'family': str, 'member': str, 'highlight': bool}
+
+class SchemaError(ValueError):
+    """Every schema violation in a file; `errors` is a list of (line, message)"""
+
+    def __init__(self, filename, errors):
+        self.filename = filename
+        self.errors = errors
+        super().__init__('\n'.join(f"{filename}:{line}: {message}" for line, message in errors))
+
+@dataclass(slots=True)
+class Links:
+    """Links of a publication; links other than the usual four end up in `extra`"""
+    pdf: str | None = None
+    arxiv: str | None = None
+    doi: str | None = None
+    code: str | None = None
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, links):
+        if links is None:
+            return None
+        extra = {k: v for k, v in links.items() if k not in LINK_KEYS}
+        return cls(links.get('pdf'), links.get('arxiv'), links.get('doi'), links.get('code'),
+                   extra or None)
+
+    def to_dict(self):
+        links = {k: getattr(self, k) for k in LINK_KEYS if getattr(self, k) is not None}
+        if self.extra:
+            links.update(self.extra)
+        return links
+
+@dataclass(slots=True)
+class Publication:
+    """One publications.yml entry; keys the schema does not know are kept in `extra`"""
+    title: str
+    authors: str | list = ''
+    venue: str = ''
+    year: int | None = None
+    type: str | None = None
+    links: Links | None = None
+    volume: str | None = None
+    pages: str | None = None
+    author_list: list | None = None  # [Author]
+    members: list | None = None  # [person id]
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, entry):
+        """From a validated entry"""
+        extra = {k: v for k, v in entry.items() if k not in FIELDS}
+        author_list = entry.get('author_list')
+        return cls(
+            entry['title'], entry.get('authors') or '', entry.get('venue') or '', entry.get('year'),
+            entry.get('type'), Links.from_dict(entry.get('links')), entry.get('volume'),
+            entry.get('pages'),
+            [Author.from_dict(a) for a in author_list] if author_list is not None else None,
+            entry.get('members'), extra or None)
+
+    def to_dict(self):
+        """The entry as a dict: schema fields in fixed order, then any extra keys"""
+        entry = {'title': self.title, 'authors': self.authors, 'venue': self.venue, 'year': self.year,
+                 'type': self.type, 'links': self.links.to_dict() if self.links else None}
+        for key in ('volume', 'pages'):
+            if getattr(self, key) is not None:
+                entry[key] = getattr(self, key)
+        if self.author_list is not None:
+            entry['author_list'] = [a.to_dict() for a in self.author_list]
+        if self.members is not None:
+            entry['members'] = self.members
+        if self.extra:
+            entry.update(self.extra)
+        return entry
+
+def _is_str_list(value):
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+def _check_links(links):
+    if not isinstance(links, dict):
+        return "links must be a mapping of name to URL"
+    bad = [str(k) for k, v in links.items() if not isinstance(k, str) or not isinstance(v, (str, type(None)))]
+    return f"links {', '.join(bad)} must be URL strings" if bad else None
+
+def _check_author_list(author_list):
+    for i, author in enumerate(author_list if isinstance(author_list, list) else [None]):
+        if not isinstance(author, dict) or 'family' not in author:
+            return f"author_list[{i}] must be a mapping with at least a family name"
+        for key, value in author.items():
+            if key not in AUTHOR_KEYS:
+                return f"author_list[{i}] has unknown key {key!r}"
+            if not isinstance(value, AUTHOR_KEYS[key]):
+                return f"author_list[{i}].{key} must be {AUTHOR_KEYS[key].__name__}"
+    return None
+
+# field: (check returning an error message or None for a non-null value, may be null)
+FIELDS = {
+    'title': (lambda v: None if isinstance(v, str) and v.strip() else "title must be a non-empty string",
+              False),
+    'authors': (lambda v: None if isinstance(v, str) or _is_str_list(v)
+                else "authors must be a string or a list of strings", True),
+    'venue': (lambda v: None if isinstance(v, str) else "venue must be a string", True),
+    'year': (lambda v: None if isinstance(v, int) and not isinstance(v, bool)
+             else "year must be a whole number", True),
+    'type': (lambda v: None if v in PUB_TYPES else f"type must be one of {', '.join(PUB_TYPES)}", True),
+    'links': (_check_links, True),
+    'volume': (lambda v: None if isinstance(v, (str, int)) else "volume must be a string", True),
+    'pages': (lambda v: None if isinstance(v, (str, int)) else "pages must be a string", True),
+    'author_list': (_check_author_list, True),
+    'members': (lambda v: None if _is_str_list(v) else "members must be a list of person ids", True),
+}
+
+def validate_entry(entry):
+    """[(field, message)] for everything in one entry that does not fit the schema"""
+    if not isinstance(entry, dict):
+        return [(None, "entry must be a mapping")]
+    errors = []
+    if 'title' not in entry:
+        errors.append((None, "title is missing"))
+    for key, value in entry.items():
+        if key not in FIELDS:
+            continue
+        check, nullable = FIELDS[key]
+        if value is None:
+            if not nullable:
+                errors.append((key, f"{key} must not be empty"))
+            continue
+        message = check(value)
+        if message:
+            errors.append((key, message))
+    return errors
+
+def _coerce(entry):
+    # volume and pages are free text; YAML reads '12' and '3' as numbers
+    for key in ('volume', 'pages'):
+        if isinstance(entry.get(key), int):
+            entry[key] = str(entry[key])
+    return entry
+
+def iter_records(filename=PUBLICATIONS_FILE, errors=None):
+    """Stream Publication records, validating each entry
+
+    Invalid entries are skipped and their violations appended to `errors` as
+    (line, message); without an `errors` list the first one raises SchemaError.
+    """
+    for line, entry, lines in iter_publications(filename, lines=True):
+        problems = [(lines.get(key, line), message) for key, message in validate_entry(entry)]
+        if problems:
+            if errors is None:
+                raise SchemaError(filename, problems)
+            errors.extend(problems)
+            continue
+        yield Publication.from_dict(_coerce(entry))
+
+def validate_file(filename=PUBLICATIONS_FILE):
+    """All schema violations in a file as (line, message), in file order"""
+    errors = []
+    for _ in iter_records(filename, errors):
+        pass
+    return errors
+
+def load_records(filename=PUBLICATIONS_FILE):
+    """All records of a file; raises SchemaError listing every violation"""
+    errors = []
+    records = list(iter_records(filename, errors))
+    if errors:
+        raise SchemaError(filename, errors)
+    return records
+
+if __name__ == "__main__":
+    filename = sys.argv[1] if len(sys.argv) > 1 else PUBLICATIONS_FILE
+    errors = validate_file(filename)
+    for line, message in errors:
+        print(f"  ✗ {filename}:{line}: {message}")
+    if errors:
+        print(f"✗ {len(errors)} schema violation(s)")
+        sys.exit(1)
+    print(f"✓ {filename} matches the publication schema")
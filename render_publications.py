@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered publication list fragments for the publications page.
+Renders the same markup as the Liquid loops in publications.html once per
+year section (plus one for preprints) into _includes/publications/, so Jekyll
+only includes static files instead of evaluating the loops over every entry.
+_data/publication_fragments.yml lists the fragments in page order with the
+content hash of each; a fragment is only rewritten when its hash changes. It
+also records a hash of the publications they were rendered from, which
+--check compares against publications.yml (e.g. in a pre-commit hook or CI).
+The page only uses the fragments when _config.yml sets prerendered_publications.
+Usage: python render_publications.py [--input FILE] [--output-dir DIR] [--manifest FILE] [--check]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+
+from pub_io import PUBLICATIONS_FILE, atomic_write, load_publications, load_yaml, save_yaml
+
+FRAGMENT_DIR = '_includes/publications'
+MANIFEST_FILE = '_data/publication_fragments.yml'
+
+SECTION_HEADING_STYLE = ("font-size: 1.1rem; color: var(--color-text-muted); text-transform: uppercase; "
+                         "letter-spacing: 0.1em; margin-bottom: 1.5rem;")
+
+# Links shown per entry, in order; preprints have no DOI yet
+LINK_LABELS = (('pdf', 'PDF'), ('arxiv', 'arXiv'), ('doi', 'DOI'), ('code', 'Code'))
+PREPRINT_LINK_LABELS = (('pdf', 'PDF'), ('arxiv', 'arXiv'), ('code', 'Code'))
+
+def _text(value):
+    """A field as Liquid prints it (fields may hold markup such as <strong>, so no escaping)"""
+    return '' if value is None else str(value)
+
+def _venue_line(pub, preprint=False):
+    year = f", {pub['year']}" if pub.get('year') else ''
+    venue = _text(pub.get('venue')).strip()
+    if preprint:
+        return f"<em>{venue or 'Preprint'}</em>{year}"
+    if venue:
+        volume = f" {pub['volume']}" if pub.get('volume') else ''
+        pages = f", {pub['pages']}" if pub.get('pages') else ''
+        return f"<em>{venue}</em>{volume}{pages}{year}"
+    if pub.get('type') == 'journal':
+        return f"<em>Journal Article</em>{year}"
+    if pub.get('type') == 'conference':
+        return f"<em>Conference Paper</em>{year}"
+    return _text(pub.get('year'))
+
+def render_item(doc_id, pub, preprint=False):
+    """One <li> of the publication list; `doc_id` is the entry's position in publications.yml"""
+    lines = [
+        f'<li class="pub-item" data-pub-id="{doc_id}" data-year="{_text(pub.get("year"))}" '
+        f'data-type="{_text(pub.get("type"))}">',
+        f'  <div class="pub-title">{_text(pub.get("title"))}</div>',
+        f'  <div class="pub-authors">{_text(pub.get("authors"))}</div>',
+        f'  <div class="pub-venue">{_venue_line(pub, preprint)}</div>',
+    ]
+    links = pub.get('links')
+    if links:
+        lines.append('  <div class="pub-links">')
+        for key, label in PREPRINT_LINK_LABELS if preprint else LINK_LABELS:
+            if links.get(key):
+                href = html.escape(str(links[key]), quote=True)
+                lines.append(f'    <a href="{href}" class="pub-link" target="_blank" rel="noopener">{label}</a>')
+        lines.append('  </div>')
+    lines.append('</li>')
+    return '\n'.join(lines)
+
+def render_section(heading, items, first=False):
+    """A titled <section> holding rendered items"""
+    style = '' if first else ' style="margin-top: 3rem;"'
+    # raw: Jekyll includes are Liquid templates, and titles may contain "{{"
+    return '\n'.join([
+        '{% raw %}',
+        f'<section class="pub-section"{style}>',
+        f'  <h2 style="{SECTION_HEADING_STYLE}">{heading}</h2>',
+        '  <ul class="pub-list">',
+        *items,
+        '  </ul>',
+        '</section>',
+        '{% endraw %}',
+        '',
+    ])
+
+def render_fragments(publications):
+    """[(file name, html)] in page order
+
+    Like the Liquid loops, consecutive non-preprint entries with the same year
+    share a section, and preprints follow in one section of their own.
+    """
+    sections, preprints = [], []
+    current = None
+    for doc_id, pub in enumerate(publications):
+        if pub.get('type') == 'preprint':
+            preprints.append(render_item(doc_id, pub, preprint=True))
+            continue
+        if current is None or current[0] != pub.get('year'):
+            current = (pub.get('year'), [])
+            sections.append(current)
+        current[1].append(render_item(doc_id, pub))
+
+    fragments, used = [], set()
+    for i, (year, items) in enumerate(sections):
+        # A year that shows up again further down (hand-sorted files) gets its own file
+        name, n = f"year-{year or 'unknown'}", 2
+        while name in used:
+            name, n = f"year-{year or 'unknown'}-{n}", n + 1
+        used.add(name)
+        fragments.append((f"{name}.html", render_section(_text(year), items, first=i == 0)))
+    if preprints:
+        fragments.append(('preprints.html', render_section('Preprints & Working Papers', preprints)))
+    return fragments
+
+def source_digest(publications):
+    """Content hash of the publications (not of the file's formatting)"""
+    text = json.dumps(publications, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _load_manifest(filename):
+    try:
+        return load_yaml(filename) or {}
+    except OSError:
+        return {}
+
+def write_fragments(publications, directory=FRAGMENT_DIR, manifest_file=MANIFEST_FILE):
+    """Write changed fragments and the manifest; returns the names of the files written
+
+    Fragments that are no longer part of the page are deleted.
+    """
+    old_manifest = _load_manifest(manifest_file)
+    old = {f['file']: f.get('sha1') for f in old_manifest.get('fragments') or []}
+    os.makedirs(directory, exist_ok=True)
+
+    written, entries = [], []
+    for name, text in render_fragments(publications):
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        path = os.path.join(directory, name)
+        if old.get(name) != digest or not os.path.exists(path):
+            with atomic_write(path) as f:
+                f.write(text)
+            written.append(name)
+        entries.append({'file': name, 'sha1': digest})
+
+    current = {entry['file'] for entry in entries}
+    for name in old:
+        if name not in current and os.path.exists(os.path.join(directory, name)):
+            os.unlink(os.path.join(directory, name))
+
+    # `count` lets publications.html fall back to the Liquid loops on added or removed entries;
+    # `source` lets check_fragments() catch edits to existing ones
+    manifest = {'count': len(publications), 'source': source_digest(publications), 'fragments': entries}
+    if manifest != old_manifest:
+        save_yaml(manifest, manifest_file)
+    return written
+
+def check_fragments(publications, directory=FRAGMENT_DIR, manifest_file=MANIFEST_FILE):
+    """Names of the fragments that are missing or out of date ([] when all are current)"""
+    manifest = _load_manifest(manifest_file)
+    if manifest.get('source') != source_digest(publications):
+        return [os.path.basename(manifest_file)]
+    stale = []
+    for entry in manifest.get('fragments') or []:
+        try:
+            with open(os.path.join(directory, entry['file']), 'rb') as f:
+                current = hashlib.sha1(f.read()).hexdigest() == entry.get('sha1')
+        except OSError:
+            current = False
+        if not current:
+            stale.append(entry['file'])
+    return stale
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render the publications page fragments")
+    parser.add_argument('--input', default=PUBLICATIONS_FILE,
+                        help=f"publications YAML to render (default: {PUBLICATIONS_FILE})")
+    parser.add_argument('--output-dir', default=FRAGMENT_DIR,
+                        help=f"directory for the fragments (default: {FRAGMENT_DIR})")
+    parser.add_argument('--manifest', default=MANIFEST_FILE,
+                        help=f"fragment list read by publications.html (default: {MANIFEST_FILE})")
+    parser.add_argument('--check', action='store_true',
+                        help="only check that the fragments match the YAML; exit 1 if they do not")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    data = load_publications(args.input) or {}
+    publications = data.get('publications') or []
+    if args.check:
+        stale = check_fragments(publications, args.output_dir, args.manifest)
+        if stale:
+            print(f"✗ Out of date: {', '.join(stale)}. Run python render_publications.py")
+            sys.exit(1)
+        print(f"✓ Fragments match {args.input}")
+        sys.exit(0)
+    written = write_fragments(publications, args.output_dir, args.manifest)
+    print(f"✓ Rendered {len(publications)} publications; {len(written)} fragment(s) changed in {args.output_dir}")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Timers, counters and run reports for the fetch scripts.
+A RunMetrics object collects per-stage wall times, call counts and failures
+by kind while a run is going, then writes everything (plus the rate limiter,
+cache and pipeline totals) to a JSON report. Reports from nightly runs can be
+compared to see where a slow refresh spent its time.
+"""
+
+import cProfile
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from pub_io import atomic_write
+from rate_limiter import is_rate_limit_error
+
+REPORT_FILE = '.fetch_report.json'
+REPORT_VERSION = 1
+
+def failure_kind(exc):
+    """Short label for grouping failures: 'rate_limit' or the exception class name"""
+    return 'rate_limit' if is_rate_limit_error(exc) else type(exc).__name__
+
+class RunMetrics:
+    """Thread-safe timers and counters for one run
+
+    Timers accumulate calls, total and slowest seconds under a stage name.
+    Timers entered from several worker threads add up their time, so a timer
+    can exceed the wall time of the stage that contains it.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.timers = {}
+        self.counters = {}
+        self.errors = {}
+        # Extra report sections, e.g. limiter, cache and pipeline totals
+        self.sections = {}
+        self._lock = threading.Lock()
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            timer = self.timers.setdefault(name, {'calls': 0, 'seconds': 0.0, 'max': 0.0})
+            timer['calls'] += 1
+            timer['seconds'] += seconds
+            timer['max'] = max(timer['max'], seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """Time the body of a with block under `name`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def timed(self, name, fn):
+        """Wrap `fn` so every call is timed under `name` (e.g. fills on the worker pool)"""
+        def wrapper(*args, **kwargs):
+            with self.timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def error(self, stage, exc):
+        """Record a failure in `stage`, grouped by failure_kind()"""
+        kind = failure_kind(exc)
+        with self._lock:
+            by_kind = self.errors.setdefault(stage, {})
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+
+    def report(self):
+        """The run as a JSON-serialisable dict"""
+        with self._lock:
+            report = {
+                'version': REPORT_VERSION,
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'duration': round(time.perf_counter() - self._start, 3),
+                'timers': {name: {'calls': t['calls'], 'seconds': round(t['seconds'], 4),
+                                  'max': round(t['max'], 4)}
+                           for name, t in self.timers.items()},
+                'counters': dict(self.counters),
+                'errors': {stage: dict(kinds) for stage, kinds in self.errors.items()},
+            }
+        report.update(self.sections)
+        return report
+
+    def write_report(self, filename=REPORT_FILE):
+        with atomic_write(filename) as f:
+            json.dump(self.report(), f, indent=2)
+            f.write('\n')
+
+    def summary(self):
+        """Lines for the console, slowest stage first"""
+        lines = []
+        for name, t in sorted(self.timers.items(), key=lambda item: -item[1]['seconds']):
+            lines.append(f"  {name:<18} {t['seconds']:8.2f} s  ({t['calls']} calls)")
+        for stage, kinds in self.errors.items():
+            detail = ', '.join(f"{kind}: {n}" for kind, n in sorted(kinds.items()))
+            lines.append(f"  {stage} errors: {detail}")
+        return lines
+
+def limiter_report(limiter):
+    """Totals of an AdaptiveRateLimiter for a run report"""
+    return {'waited_seconds': round(limiter.waited, 3), 'backoffs': limiter.backoffs,
+            'final_rate': round(limiter.rate, 4)}
+
+@contextmanager
+def profiled(filename=None):
+    """Run the body under cProfile and dump the stats to `filename` (no-op without one)
+
+    cProfile only sees the calling thread; with a worker pool the fills show
+    up as waits on their futures, so profile with one worker to see them.
+    """
+    if not filename:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(filename)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for Google Scholar lookups.
+Responses are stored as zlib-compressed JSON in a SQLite file, keyed by a hash
+of the request content, with a per-entry TTL and LRU eviction once the cache
+grows past its size cap. A recorded cache file can be replayed with
+cache_only=True to run the fetcher completely offline.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+CACHE_FILE = '.scholar_cache.sqlite3'
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+# Default time-to-live per request kind, in seconds
+DEFAULT_TTLS = {
+    'author': 12 * 3600,      # profile listing: citation counts move daily
+    'fill': 30 * 24 * 3600,   # filled publication details rarely change
+}
+
+class CacheMiss(Exception):
+    """Raised in cache-only mode when a response was never recorded"""
+
+def request_key(kind, identity):
+    """Content-addressed key for a request"""
+    payload = json.dumps([kind, identity], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """SQLite-backed response cache with TTLs and LRU eviction"""
+
+    def __init__(self, filename=CACHE_FILE, max_bytes=MAX_CACHE_BYTES, ttls=None):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(filename, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY, kind TEXT NOT NULL, value BLOB NOT NULL,'
+            ' size INTEGER NOT NULL, created REAL NOT NULL, expires REAL NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)')
+        self._db.commit()
+
+    def get(self, key, allow_expired=False):
+        """Return the cached value, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                'SELECT value, expires FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (row[1] < now and not allow_expired):
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def contains(self, key):
+        """True if a fresh entry exists (does not touch LRU order)"""
+        with self._lock:
+            row = self._db.execute('SELECT expires FROM responses WHERE key = ?', (key,)).fetchone()
+        return row is not None and row[0] >= time.time()
+
+    def put(self, key, kind, value, ttl=None):
+        """Store a JSON-serialisable value and evict old entries if over the cap"""
+        blob = zlib.compress(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+        now = time.time()
+        ttl = self.ttls.get(kind, DEFAULT_TTLS['fill']) if ttl is None else ttl
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, kind, blob, len(blob), now, now + ttl, now),
+            )
+            self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now):
+        # Expired entries stay around for offline replay until LRU pushes them out
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            'SELECT key, size FROM responses ORDER BY last_access'
+        ).fetchall():
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def author_identity(scholar_id):
+    return {'scholar_id': scholar_id}
+
+def fill_identity(obj):
+    """The parts of a scholarly object that determine what fill() returns"""
+    if obj.get('container_type') == 'Author':
+        return {'author': obj.get('scholar_id')}
+    return {
+        'author_pub_id': obj.get('author_pub_id'),
+        'title': obj.get('bib', {}).get('title'),
+        'num_citations': obj.get('num_citations'),
+    }
+
+class CachedScholar:
+    """Drop-in stand-in for the scholarly module that consults a ResponseCache
+
+    cache_only: never touch the network; a miss raises CacheMiss.
+    refresh: ignore cached values but record the fresh responses.
+    """
+
+    def __init__(self, backend, cache, cache_only=False, refresh=False):
+        self.backend = backend
+        self.cache = cache
+        self.cache_only = cache_only
+        self.refresh = refresh
+
+    def _lookup(self, kind, identity, call):
+        key = request_key(kind, identity)
+        if not self.refresh:
+            value = self.cache.get(key, allow_expired=self.cache_only)
+            if value is not None:
+                return value
+        if self.cache_only:
+            raise CacheMiss(f"{kind} {identity} is not in the cache")
+        value = call()
+        self.cache.put(key, kind, value)
+        return value
+
+    def is_cached(self, obj):
+        """True if fill(obj) will be answered without a Scholar request"""
+        if self.cache_only:
+            return True
+        if self.refresh:
+            return False
+        kind = 'author' if obj.get('container_type') == 'Author' else 'fill'
+        return self.cache.contains(request_key(kind, fill_identity(obj)))
+
+    def search_author_id(self, scholar_id):
+        return self._lookup('author', author_identity(scholar_id),
+                            lambda: self.backend.search_author_id(scholar_id))
+
+    def fill(self, obj):
+        kind = 'author' if obj.get('container_type') == 'Author' else 'fill'
+        return self._lookup(kind, fill_identity(obj), lambda: self.backend.fill(obj))
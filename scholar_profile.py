@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""
+Profile settings shared by the publication scripts.
+"""
+
+# Your Google Scholar user ID
+SCHOLAR_ID = "VywDS3AAAAAJ"
+
+# Your name for highlighting in author lists
+YOUR_NAME = "Shengbo Wang"  # Update this to match how your name appears
+
+# Other ways your name appears in author lists (all of them are highlighted)
+YOUR_ALIASES = []
+
+# Lab members to highlight and index: person id -> names as they appear in author lists
+# e.g. {'jane-doe': ['Jane Doe', 'J. Doe']}
+LAB_MEMBERS = {}
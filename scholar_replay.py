@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Record Google Scholar responses once and replay them offline.
+RecordingScholar wraps a backend and keeps every search_author_id/fill
+response; save() writes them to a JSON fixture. ReplayScholar has the same
+interface and answers from a fixture without scholarly or a network, with a
+configurable latency per request and injected rate-limit errors: at random
+(error_rate) and/or whenever requests arrive faster than a simulated server
+limit (max_rate). That is enough to load-test the fetcher's worker pool,
+retries, adaptive rate limiter and response cache on an air-gapped machine.
+Fixtures use the response cache's request keys, so they can also be
+exported from an existing .scholar_cache.sqlite3.
+Usage: python scholar_replay.py FIXTURE                      (summary)
+       python scholar_replay.py FIXTURE --from-cache [FILE]  (export the cache)
+"""
+
+import argparse
+import collections
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+from pub_io import atomic_write
+from scholar_cache import CACHE_FILE, CacheMiss, author_identity, fill_identity, request_key
+from scholar_profile import SCHOLAR_ID
+
+FIXTURE_VERSION = 1
+
+class RateLimited(Exception):
+    """Injected throttling; worded like scholarly's so rate_limiter treats it the same"""
+
+def request_kind(obj):
+    return 'author' if obj.get('container_type') == 'Author' else 'fill'
+
+def load_fixture(filename):
+    """{request key: {'kind', 'value'}} from a fixture file"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+    if fixture.get('version') != FIXTURE_VERSION:
+        raise ValueError(f"{filename}: unsupported fixture version {fixture.get('version')}")
+    return fixture['responses']
+
+def save_fixture(responses, filename):
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with atomic_write(filename) as f:
+        json.dump({'version': FIXTURE_VERSION, 'responses': responses}, f, ensure_ascii=False,
+                  default=str)
+        f.write('\n')
+
+def fixture_from_cache(cache_file=CACHE_FILE):
+    """Every response in a ResponseCache file, expired ones included"""
+    db = sqlite3.connect(cache_file)
+    try:
+        return {key: {'kind': kind, 'value': json.loads(zlib.decompress(value).decode('utf-8'))}
+                for key, kind, value in db.execute('SELECT key, kind, value FROM responses')}
+    finally:
+        db.close()
+
+def fixture_from_publications(publications, scholar_id=SCHOLAR_ID):
+    """A fixture for one profile listing `publications` (filled scholarly dicts)"""
+    author = {'container_type': 'Author', 'scholar_id': scholar_id, 'filled': []}
+    # Profile listings only carry the id, title and citation count of each paper
+    listing = [{'container_type': 'Publication', 'author_pub_id': pub['author_pub_id'],
+                'num_citations': pub['num_citations'], 'bib': {'title': pub['bib']['title']}}
+               for pub in publications]
+    responses = {
+        request_key('author', author_identity(scholar_id)): {'kind': 'author', 'value': author},
+        request_key('author', fill_identity(author)): {'kind': 'author',
+                                                       'value': dict(author, publications=listing)},
+    }
+    for item, pub in zip(listing, publications):
+        responses[request_key('fill', fill_identity(item))] = {'kind': 'fill', 'value': pub}
+    return responses
+
+class RecordingScholar:
+    """Passes requests through to `backend` and keeps the responses for a fixture"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.responses = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        # is_cached and friends of a wrapped CachedScholar
+        return getattr(self.backend, name)
+
+    def _record(self, kind, identity, value):
+        with self._lock:
+            self.responses[request_key(kind, identity)] = {'kind': kind, 'value': value}
+        return value
+
+    def search_author_id(self, scholar_id):
+        return self._record('author', author_identity(scholar_id),
+                            self.backend.search_author_id(scholar_id))
+
+    def fill(self, obj):
+        return self._record(request_kind(obj), fill_identity(obj), self.backend.fill(obj))
+
+    def save(self, filename):
+        with self._lock:
+            save_fixture(self.responses, filename)
+
+class ReplayScholar:
+    """Answers search_author_id/fill from recorded responses
+
+    Every request sleeps `latency` seconds (plus up to `jitter` more). A
+    publication fill then fails with RateLimited with probability
+    `error_rate`, or when more than `max_rate` fills arrived within the last
+    second; the profile requests are never failed, so a run always gets as far
+    as the worker pool. Faults are drawn from a generator seeded with `seed`.
+    A request that was never recorded raises CacheMiss.
+    """
+
+    def __init__(self, responses, latency=0.0, jitter=0.0, error_rate=0.0, max_rate=None, seed=0):
+        self.responses = responses
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_rate = max_rate
+        self.requests = 0
+        self.rate_limited = 0
+        self.misses = 0
+        self._random = random.Random(seed)
+        self._recent = collections.deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, filename, **options):
+        return cls(load_fixture(filename), **options)
+
+    def _throttled(self, now, faults):
+        """Count a request; (turned away by the simulated server?, seconds it takes)"""
+        with self._lock:
+            self.requests += 1
+            throttled = faults and bool(self.error_rate) and self._random.random() < self.error_rate
+            if faults and self.max_rate:
+                while self._recent and self._recent[0] <= now - 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.max_rate:
+                    throttled = True
+                else:
+                    self._recent.append(now)
+            if throttled:
+                self.rate_limited += 1
+            delay = self.latency + (self._random.random() * self.jitter if self.jitter else 0.0)
+        return throttled, delay
+
+    def _lookup(self, kind, identity):
+        throttled, delay = self._throttled(time.monotonic(), faults=kind == 'fill')
+        if delay:
+            time.sleep(delay)
+        if throttled:
+            raise RateLimited("MaxTriesExceeded: 429 Too Many Requests (injected)")
+        response = self.responses.get(request_key(kind, identity))
+        if response is None:
+            with self._lock:
+                self.misses += 1
+            raise CacheMiss(f"{kind} {identity} was not recorded")
+        return response['value']
+
+    def search_author_id(self, scholar_id):
+        return self._lookup('author', author_identity(scholar_id))
+
+    def fill(self, obj):
+        return self._lookup(request_kind(obj), fill_identity(obj))
+
+    def stats(self):
+        """Request totals for a run report"""
+        with self._lock:
+            return {'requests': self.requests, 'rate_limited': self.rate_limited, 'misses': self.misses}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or create a Scholar replay fixture")
+    parser.add_argument('fixture', help="fixture file (JSON)")
+    parser.add_argument('--from-cache', nargs='?', const=CACHE_FILE, metavar='FILE',
+                        help=f"write the fixture from a response cache (default: {CACHE_FILE})")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.from_cache:
+        save_fixture(fixture_from_cache(args.from_cache), args.fixture)
+        print(f"✓ Exported {args.from_cache} to {args.fixture}")
+    responses = load_fixture(args.fixture)
+    kinds = collections.Counter(r['kind'] for r in responses.values())
+    print(f"{args.fixture}: {kinds['author']} author and {kinds['fill']} publication responses")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Client-side search index for the publications page.
+Builds a compact JSON inverted index over titles, authors and venues plus
+year/type facets from publications.yml, so publications.html can search and
+filter by set operations on document ids instead of re-scanning every entry.
+Document ids are positions in the publications list, which the page exposes
+as data-pub-id on each entry. The index carries a digest of the text the page
+shows for every entry; when a hand edit makes it stale, the page notices and
+indexes its own entries instead.
+Usage: python search_index.py [--input FILE] [--output FILE]
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import unicodedata
+
+from authors import TAG_RE
+from pub_io import PUBLICATIONS_FILE, atomic_write, load_publications
+from render_publications import render_item
+
+SEARCH_INDEX_FILE = 'assets/data/publications-index.json'
+
+INDEX_VERSION = 2
+
+# 32-bit FNV-1a, simple enough to compute identically in the browser
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+# Fields that are searchable; the page searches them all at once
+INDEXED_FIELDS = ('title', 'authors', 'venue')
+
+# Too common to narrow anything down
+STOPWORDS = {'a', 'an', 'and', 'at', 'by', 'for', 'from', 'in', 'of', 'on', 'or', 'the', 'to',
+             'via', 'with'}
+
+_WORD_RE = re.compile(r'[^\W_]+')
+
+def tokenize(text):
+    """Lowercase, accent- and markup-free words of a field
+
+    publications.html tokenizes queries the same way, so both sides agree on
+    what a word is ("Müller" and "muller" match).
+    """
+    text = unicodedata.normalize('NFKD', TAG_RE.sub(' ', str(text or '')).lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return [w for w in _WORD_RE.findall(text) if len(w) > 1 and w not in STOPWORDS]
+
+def page_text(doc_id, pub):
+    """What the page shows for an entry, as publication-search.js reads it back
+
+    That is the entry's text with whitespace collapsed, then its data-year and
+    data-type attributes. The Liquid loops and the fragments render the same.
+    """
+    text = html.unescape(TAG_RE.sub('', render_item(doc_id, pub, pub.get('type') == 'preprint')))
+    year, kind = pub.get('year'), pub.get('type')
+    return '\x1f'.join([' '.join(text.split()), '' if year is None else str(year),
+                         '' if kind is None else str(kind)])
+
+def page_digest(publications):
+    """FNV-1a over the page text of every entry, one line each"""
+    digest = FNV_OFFSET
+    for char in '\n'.join(page_text(doc_id, pub) for doc_id, pub in enumerate(publications)):
+        digest = ((digest ^ ord(char)) * FNV_PRIME) & 0xFFFFFFFF
+    return digest
+
+def _delta_encode(ids):
+    """Sorted ids as gaps ([3, 5, 9] -> [3, 2, 4]), which keeps the JSON small"""
+    previous, gaps = 0, []
+    for doc_id in ids:
+        gaps.append(doc_id - previous)
+        previous = doc_id
+    return gaps
+
+def build_search_index(publications):
+    """The index for a list of publications.yml entries
+
+    `terms` is sorted so the page can find every term starting with a typed
+    prefix by binary search; `postings[i]` holds the delta-encoded ids of the
+    documents containing `terms[i]`. Facets map each year and type to ids.
+    """
+    postings = {}
+    years, types = {}, {}
+    for doc_id, pub in enumerate(publications):
+        words = set()
+        for field in INDEXED_FIELDS:
+            words.update(tokenize(pub.get(field)))
+        for word in words:
+            postings.setdefault(word, []).append(doc_id)
+        year = pub.get('year')
+        years.setdefault(str(year) if year else 'Unknown', []).append(doc_id)
+        types.setdefault(pub.get('type') or 'other', []).append(doc_id)
+
+    # Ids were appended in increasing order, so every list is already sorted
+    terms = sorted(postings)
+    return {
+        'version': INDEX_VERSION,
+        'count': len(publications),
+        'digest': page_digest(publications),
+        'terms': terms,
+        'postings': [_delta_encode(postings[term]) for term in terms],
+        'facets': {
+            'year': {year: _delta_encode(ids)
+                     for year, ids in sorted(years.items(), key=lambda item: (item[0] != 'Unknown', item[0]),
+                                            reverse=True)},
+            'type': {kind: _delta_encode(ids) for kind, ids in sorted(types.items())},
+        },
+    }
+
+def write_search_index(publications, filename=SEARCH_INDEX_FILE):
+    """Write the index for `publications`; returns False if the file was already current"""
+    text = json.dumps(build_search_index(publications), ensure_ascii=False, separators=(',', ':'))
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    with atomic_write(filename) as f:
+        f.write(text)
+    return True
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the publications page search index")
+    parser.add_argument('--input', default=PUBLICATIONS_FILE,
+                        help=f"publications YAML to index (default: {PUBLICATIONS_FILE})")
+    parser.add_argument('--output', default=SEARCH_INDEX_FILE,
+                        help=f"where to write the index (default: {SEARCH_INDEX_FILE})")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    data = load_publications(args.input) or {}
+    publications = data.get('publications') or []
+    if write_search_index(publications, args.output):
+        print(f"✓ Indexed {len(publications)} publications into {args.output}")
+    else:
+        print(f"✓ {args.output} is already up to date")
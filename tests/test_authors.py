@@ -0,0 +1,17 @@
+from authors import normalize_authors, reconstruct_authors_from_chars
+
+def chars(text):
+    """The broken one-character-per-item format, spaces as empty strings"""
+    return ['' if c == ' ' else c for c in text]
+
+def test_mixed_case_surnames_are_kept_whole():
+    assert (normalize_authors("Yann LeCun and Shengbo Wang and Ian McDonald")
+            == "Yann LeCun, Shengbo Wang, Ian McDonald")
+    assert normalize_authors("Ian McDonald, Yann LeCun") == "Ian McDonald, Yann LeCun"
+
+def test_char_list_is_rebuilt():
+    assert (reconstruct_authors_from_chars(chars("Chenyu Tang and Shuo Gao and Cong Li"))
+            == "Chenyu Tang, Shuo Gao, Cong Li")
+
+def test_char_list_splits_run_together_names():
+    assert reconstruct_authors_from_chars(chars("Chenyu TangShuo Gao")) == "Chenyu Tang, Shuo Gao"
@@ -0,0 +1,36 @@
+import random
+from datetime import date, timedelta
+
+from citation_metrics import CitationStore
+
+START = date(2024, 1, 1)
+
+def snapshot(counts):
+    return [{'author_pub_id': f'p{i}', 'num_citations': n, 'bib': {'title': f'Paper {i}'}}
+            for i, n in counts.items()]
+
+def filled_store(days=40, seed=1):
+    rng = random.Random(seed)
+    store = CitationStore(':memory:')
+    counts = {i: rng.randint(0, 30) for i in range(25)}
+    for d in range(days):
+        for i in rng.sample(sorted(counts), 5):
+            counts[i] += rng.randint(0, 4)
+        if d % 7 == 3:
+            counts.pop(rng.choice(sorted(counts)), None)
+        store.record({'cites_per_year': {2024: d}}, snapshot(counts), START + timedelta(days=d))
+    return store
+
+def test_history_matches_metrics_on_each_day():
+    store = filled_store()
+    history = store.history(limit=None)
+    assert len(history) == 40
+    for row in history:
+        assert dict(row, date=None) == dict(store.metrics(date.fromisoformat(row['date'])), date=None)
+
+def test_history_is_capped_and_paged():
+    store = filled_store()
+    every = store.history(limit=None)
+    latest = store.history(limit=10)
+    assert latest == every[-10:]
+    assert store.history(limit=10, before=date.fromisoformat(latest[0]['date'])) == every[-20:-10]
@@ -0,0 +1,43 @@
+from dedupe import merge_duplicates
+
+AUTHORS = "Shengbo Wang, Chenyu Tang, Shuo Gao"
+
+def record(title, year=2023, type='journal', venue='Nature Communications', authors=AUTHORS, **links):
+    return {'title': title, 'authors': authors, 'venue': venue, 'year': year, 'type': type,
+            'links': links or None}
+
+def titles(records):
+    return [r['title'] for r in merge_duplicates(records, verbose=False)]
+
+def test_similar_titles_of_different_papers_are_kept():
+    records = [record("Solving optimization problems with Hopfield neural networks and simulated annealing"),
+               record("Solving optimization problems with Hopfield neural networks and quantum annealing")]
+    assert len(titles(records)) == 2
+
+def test_preprint_merges_into_published_version():
+    records = [record("A memristive crossbar for in-sensor spiking inference", year=2022, type='preprint',
+                      venue='arXiv preprint', pdf='https://arxiv.org/abs/2201.00001'),
+               record("A Memristive Crossbar for In-Sensor Spiking Inference.", year=2024,
+                      doi='https://doi.org/10.1/x')]
+    merged = merge_duplicates(records, verbose=False)
+    assert len(merged) == 1
+    assert merged[0]['type'] == 'journal'
+    assert merged[0]['links']['arxiv'] == 'https://arxiv.org/abs/2201.00001'
+
+def test_same_title_by_other_authors_is_kept():
+    records = [record("Editorial: neuromorphic computing hardware and applications"),
+               record("Editorial: neuromorphic computing hardware and applications",
+                      authors="Ann Lee, Bob Smith")]
+    assert len(titles(records)) == 2
+
+def test_same_title_published_years_apart_is_kept():
+    records = [record("Neuromorphic computing hardware: a review of recent progress", year=2018),
+               record("Neuromorphic computing hardware: a review of recent progress", year=2024)]
+    assert len(titles(records)) == 2
+
+def test_reworded_preprints_only_merge_above_the_threshold():
+    records = [record("A memristive crossbar for in-sensor spiking inference", year=2023, type='preprint',
+                      venue='arXiv preprint'),
+               record("A memristive crossbar array for low-power in-sensor spiking inference", year=2024)]
+    assert len(merge_duplicates(records, verbose=False)) == 2  # Jaccard 0.68 < THRESHOLD
+    assert len(merge_duplicates(records, threshold=0.6, verbose=False)) == 1
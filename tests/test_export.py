@@ -0,0 +1,28 @@
+import os
+
+from export_citations import export_citations
+
+PUBS = [{'title': 'Spiking networks on memristors', 'authors': 'Shengbo Wang, Chenyu Tang',
+         'venue': 'Nature Communications', 'year': 2024, 'type': 'journal', 'links': None}]
+
+def test_exports_are_world_readable(tmp_path):
+    export_citations(PUBS, str(tmp_path))
+    mode = os.stat(tmp_path / 'publications.bib').st_mode & 0o777
+    assert mode == 0o666 & ~_umask()
+
+def test_unchanged_exports_are_left_alone(tmp_path):
+    export_citations(PUBS, str(tmp_path))
+    bib = tmp_path / 'publications.bib'
+    os.chmod(bib, 0o640)
+    os.utime(bib, (0, 0))
+    export_citations(PUBS, str(tmp_path))
+    assert os.stat(bib).st_mtime == 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    export_citations([dict(PUBS[0], year=2025)], str(tmp_path))
+    assert os.stat(bib).st_mtime != 0
+    assert os.stat(bib).st_mode & 0o777 == 0o640
+
+def _umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
@@ -0,0 +1,86 @@
+import os
+
+from fetch_publications import (build_entry, build_yaml_data, fetch_publications, merge_incremental,
+                                parse_args, update_state)
+from fetch_state import STATE_FILE, plan_incremental
+from publication_pipeline import Pipeline, build_stages
+from run_metrics import REPORT_FILE
+from scholar_replay import ReplayScholar, fixture_from_publications
+from search_index import SEARCH_INDEX_FILE
+
+def fetched(author):
+    return {'bib': {'title': 'A paper', 'author': author, 'pub_year': '2024', 'venue': 'Nature'}}
+
+def authors_of(author):
+    return build_entry(fetched(author), Pipeline(build_stages(people={})))['authors']
+
+def test_scholar_and_lists_are_only_split_on_and():
+    assert (authors_of("Yann LeCun and Shengbo Wang and Ian McDonald")
+            == "Yann LeCun, Shengbo Wang, Ian McDonald")
+
+def test_bibtex_family_given_names_stay_together():
+    assert authors_of("Wang, Shengbo and Tang, Chenyu") == "Shengbo Wang, Chenyu Tang"
+
+def test_comma_lists_with_a_final_and():
+    assert authors_of("Shuo Gao, Cong Li and Chenyu Tang") == "Shuo Gao, Cong Li, Chenyu Tang"
+
+def test_site_run_writes_the_site_outputs():
+    args = parse_args([])
+    assert not args.trial
+    assert (args.state_file, args.search_index, args.report) == (STATE_FILE, SEARCH_INDEX_FILE, REPORT_FILE)
+    assert not (args.no_fragments or args.no_export or args.no_search_index or args.no_citations)
+
+def test_trial_runs_leave_the_site_alone():
+    for argv in (['--output', '/tmp/x.yml'], ['--replay', 'fixture.json']):
+        args = parse_args(argv)
+        assert args.trial
+        assert args.no_fragments and args.no_export and args.no_search_index and args.no_citations
+        assert os.path.dirname(args.state_file) == os.path.dirname(args.output)
+        assert os.path.basename(args.journal_file).startswith('.')
+    args = parse_args(['--output', '/tmp/x.yml'])
+    assert (args.state_file, args.report) == ('/tmp/.x.yml.state.json', '/tmp/.x.yml.report.json')
+    args = parse_args(['--output', '/tmp/x.yml', '--search-index', '/tmp/index.json'])
+    assert not args.no_search_index and args.search_index == '/tmp/index.json'
+
+def test_incremental_merge_keeps_hand_edits():
+    pubs = [{'author_pub_id': 'a', 'num_citations': 5, 'bib': {'title': 'Kept paper'}},
+            {'author_pub_id': 'b', 'num_citations': 9, 'bib': {'title': 'Cited more'}},
+            {'author_pub_id': 'd', 'num_citations': 0, 'bib': {'title': 'Brand new'}}]
+    existing = {'publications': [
+        {'title': 'Kept paper', 'authors': 'Shuo Gao', 'links': {'code': 'https://github.com/x'}},
+        {'title': 'Cited more', 'authors': 'Shuo Gao', 'links': {'code': 'https://github.com/y'}},
+        {'title': 'Gone from Scholar', 'authors': 'Shuo Gao', 'links': None},
+        {'title': 'Added by hand', 'authors': 'Shuo Gao', 'links': None},
+    ]}
+    state = {'publications': {}}
+    update_state(state, pubs[:2] + [{'author_pub_id': 'c', 'bib': {'title': 'Gone from Scholar'}}],
+                 {0: existing['publications'][0], 1: existing['publications'][1],
+                  2: existing['publications'][2]})
+    pubs[1]['num_citations'] = 10
+    assert plan_incremental(pubs, state) == ([1, 2], [0])
+
+    new_entries = {1: {'title': 'Cited more', 'authors': 'Shuo Gao, Cong Li',
+                       'links': {'pdf': 'https://example.org/b.pdf'}},
+                   2: {'title': 'Brand new', 'authors': 'Cong Li', 'links': None}}
+    merged = merge_incremental(pubs, new_entries, state, existing)
+    assert [p['title'] for p in merged] == ['Kept paper', 'Cited more', 'Added by hand', 'Brand new']
+    assert merged[0] is existing['publications'][0]
+    assert merged[1]['links'] == {'code': 'https://github.com/y', 'pdf': 'https://example.org/b.pdf'}
+
+def filled(pub_id, title, year=None):
+    bib = {'title': title, 'author': 'Shuo Gao', 'venue': 'Nature'}
+    if year:
+        bib['pub_year'] = year
+    return {'container_type': 'Publication', 'author_pub_id': pub_id, 'num_citations': 0, 'bib': bib}
+
+def test_yearless_fetched_entries_go_last():
+    backend = ReplayScholar(fixture_from_publications(
+        [filled('a', 'Older paper', '2023'), filled('b', 'Undated paper'), filled('c', 'Newer paper', '2025')]))
+    data = fetch_publications(workers=1, rate=1000.0, backend=backend,
+                              pipeline=Pipeline(build_stages(people={})), dedupe=False)
+    assert [(p['title'], p['year']) for p in data['publications']] == [
+        ('Newer paper', 2025), ('Older paper', 2023), ('Undated paper', None)]
+
+def test_hand_entries_without_a_year_go_last():
+    data = build_yaml_data([{'title': 'hand'}, {'title': 'a', 'year': 2024}, {'title': 'b', 'year': 2026}])
+    assert [p['title'] for p in data['publications']] == ['b', 'a', 'hand']
@@ -0,0 +1,34 @@
+from fetch_journal import FetchJournal
+
+def test_resume_reuses_recorded_fills(tmp_path):
+    filename = str(tmp_path / 'journal.jsonl')
+    journal = FetchJournal(filename, scholar_id='abc')
+    journal.record('p1', {'bib': {'title': 'One'}})
+    journal.record('p2', {'bib': {'title': 'Two'}})
+    journal.close()
+    with open(filename, 'a', encoding='utf-8') as f:
+        f.write('{"type": "fill", "key": "p3", "pu')  # killed mid-write
+
+    resumed = FetchJournal(filename, scholar_id='abc', resume=True)
+    assert resumed.completed() == {'p1': {'bib': {'title': 'One'}}, 'p2': {'bib': {'title': 'Two'}}}
+    resumed.record('p4', {'bib': {'title': 'Four'}})
+    resumed.record('p5', {'bib': {'title': 'Five'}})
+    resumed.close()  # crashed again
+
+    again = FetchJournal(filename, scholar_id='abc', resume=True)
+    assert sorted(again.completed()) == ['p1', 'p2', 'p4', 'p5']
+    again.finish()
+    assert not (tmp_path / 'journal.jsonl').exists()
+
+def test_other_profiles_and_fresh_runs_start_empty(tmp_path):
+    filename = str(tmp_path / 'journal.jsonl')
+    journal = FetchJournal(filename, scholar_id='abc')
+    journal.record('p1', {'bib': {'title': 'One'}})
+    journal.close()
+    other = FetchJournal(filename, scholar_id='xyz', resume=True)
+    assert other.completed() == {}
+    other.close()
+    # The other profile's run started the journal over
+    again = FetchJournal(filename, scholar_id='abc', resume=True)
+    assert again.completed() == {}
+    again.close()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from metadata_index import MetadataIndex, build_index
+
+WORKS = [
+    {'DOI': '10.1038/s41467-024-00001-1', 'title': ['Spiking networks on memristors'],
+     'container-title': ['Nature Communications'], 'issued': {'date-parts': [[2024]]},
+     'volume': '15', 'page': '1-9'},
+    {'DOI': '10.1109/tnnls.2023.2', 'title': ['Reservoir computing at the edge'],
+     'container-title': ['IEEE Transactions on Neural Networks'], 'issued': {'date-parts': [[2023]]}},
+    # The same title twice, years apart
+    {'DOI': '10.1000/review.2015', 'title': ['Neuromorphic hardware: a review'],
+     'container-title': ['Proceedings of the IEEE'], 'issued': {'date-parts': [[2015]]}},
+    {'DOI': '10.1000/review.2024', 'title': ['Neuromorphic hardware: a review'],
+     'container-title': ['Nature Electronics'], 'issued': {'date-parts': [[2024]]}},
+    {'DOI': '10.1000/editorial.a', 'title': ['Editorial'], 'issued': {'date-parts': [[2024]]}},
+    {'DOI': '10.1000/editorial.b', 'title': ['Editorial'], 'issued': {'date-parts': [[2024]]}},
+]
+
+@pytest.fixture
+def index(tmp_path):
+    dump = tmp_path / 'works.jsonl'
+    dump.write_text(''.join(json.dumps(w) + '\n' for w in WORKS), encoding='utf-8')
+    build_index(str(dump), str(tmp_path / 'index.sqlite3'), verbose=False)
+    index = MetadataIndex(str(tmp_path / 'index.sqlite3'))
+    yield index
+    index.close()
+
+def record(title, year, venue='', doi=None, type=None):
+    return {'title': title, 'year': year, 'venue': venue, 'type': type,
+            'links': {'doi': doi} if doi else None}
+
+def test_doi_matches_before_title(index):
+    pub = record('Reservoir computing at the edge', 2023, doi='https://doi.org/10.1038/s41467-024-00001-1')
+    (work,) = index.lookup([pub])
+    assert work['doi'] == '10.1038/s41467-024-00001-1'
+    assert (index.matched_doi, index.matched_title) == (1, 0)
+
+def test_title_match_fills_in_metadata(index):
+    pub = record('Spiking Networks on Memristors.', 2024, venue='Nature')
+    assert index.enrich([pub]) == 1
+    assert pub['links'] == {'doi': 'https://doi.org/10.1038/s41467-024-00001-1'}
+    assert (pub['venue'], pub['volume'], pub['pages']) == ('Nature Communications', '15', '1-9')
+
+def test_ambiguous_titles_are_left_unmatched(index):
+    assert index.lookup([record('Editorial', 2024)]) == [None]
+
+def test_year_tolerance(index):
+    found = index.lookup([record('Reservoir computing at the edge', 2024),
+                          record('Reservoir computing at the edge', 2021),
+                          record('Neuromorphic hardware: a review', 2025)])
+    assert [w and w['doi'] for w in found] == ['10.1109/tnnls.2023.2', None, '10.1000/review.2024']
+
+def test_preprints_are_not_enriched(index):
+    preprint = record('Spiking networks on memristors', 2024, venue='arXiv preprint', type='preprint')
+    assert index.enrich([preprint]) == 0
+    assert preprint == record('Spiking networks on memristors', 2024, venue='arXiv preprint', type='preprint')
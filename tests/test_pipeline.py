@@ -0,0 +1,14 @@
+from publication_pipeline import parse_args
+from search_index import SEARCH_INDEX_FILE
+
+def test_rewriting_the_site_file_refreshes_the_derived_files():
+    args = parse_args([])
+    assert not (args.no_search_index or args.no_fragments or args.no_export)
+    assert args.search_index == SEARCH_INDEX_FILE
+
+def test_writing_elsewhere_leaves_the_site_alone():
+    args = parse_args(['--output', '/tmp/o.yml'])
+    assert args.no_search_index and args.no_fragments and args.no_export
+    args = parse_args(['--input', '/tmp/in.yml', '--search-index', '/tmp/index.json'])
+    assert not args.no_search_index and args.search_index == '/tmp/index.json'
+    assert args.no_fragments and args.no_export
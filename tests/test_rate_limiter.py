@@ -0,0 +1,60 @@
+import threading
+
+from rate_limiter import AdaptiveRateLimiter, fill_concurrently, is_rate_limit_error
+
+class Throttled(Exception):
+    pass
+
+def test_rate_limit_errors_are_recognised():
+    assert is_rate_limit_error(Throttled("MaxTriesExceeded: 429 Too Many Requests"))
+    assert not is_rate_limit_error(KeyError('bib'))
+
+def test_backs_off_to_the_floor_and_recovers_to_the_configured_rate():
+    limiter = AdaptiveRateLimiter(rate=4.0, min_rate=0.5)
+    for _ in range(5):
+        limiter.on_rate_limit()
+    assert limiter.rate == 0.5
+    assert limiter.backoffs == 5
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.rate == 4.0
+
+def test_rate_limited_fills_are_retried():
+    attempts = {}
+    lock = threading.Lock()
+
+    def fill(item):
+        with lock:
+            attempts[item] = attempts.get(item, 0) + 1
+            if item % 2 and attempts[item] < 3:
+                raise Throttled("429 Too Many Requests")
+        return item * 10
+
+    retried = []
+    limiter = AdaptiveRateLimiter(rate=1000.0, burst=100)
+    results = fill_concurrently(range(8), fill, workers=4, limiter=limiter,
+                                on_retry=lambda i, e: retried.append(i))
+    assert results == [i * 10 for i in range(8)]
+    assert sorted(retried) == [1, 1, 3, 3, 5, 5, 7, 7]
+    assert limiter.backoffs == 8
+
+def test_other_errors_and_exhausted_retries_give_none():
+    def fill(item):
+        if item == 'bad':
+            raise KeyError('bib')
+        if item == 'banned':
+            raise Throttled("captcha")
+        return item
+
+    errors = []
+    results = fill_concurrently(['ok', 'bad', 'banned'], fill, retries=2,
+                                limiter=AdaptiveRateLimiter(rate=1000.0, burst=10),
+                                on_error=lambda i, e: errors.append(i))
+    assert results == ['ok', None, None]
+    assert errors == [1, 2]
+
+def test_cached_items_do_not_wait_for_a_token():
+    limiter = AdaptiveRateLimiter(rate=0.001)
+    limiter.acquire()  # empties the bucket; another token would take 1000 s
+    results = fill_concurrently([1, 2, 3], lambda item: item, limiter=limiter, cached=lambda item: True)
+    assert results == [1, 2, 3]
@@ -0,0 +1,55 @@
+import pytest
+
+from records import Publication, SchemaError, load_records, validate_file
+
+VALID = """publications:
+- title: Spiking networks on memristors
+  authors: Shengbo Wang, Chenyu Tang
+  venue: Nature Communications
+  year: 2024
+  type: journal
+  links:
+    doi: https://doi.org/10.1/x
+    project: https://example.org
+  volume: 12
+  note: kept as is
+"""
+
+INVALID = """publications:
+- title: Fine
+  year: 2024
+- authors: Shuo Gao
+  year: 2024
+- title: Second
+  year: soon
+  type: letter
+  links:
+    pdf: 3
+"""
+
+def write(tmp_path, text):
+    path = tmp_path / 'publications.yml'
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+def test_valid_entries_round_trip(tmp_path):
+    (pub,) = load_records(write(tmp_path, VALID))
+    assert isinstance(pub, Publication)
+    assert pub.volume == '12'
+    assert pub.links.doi == 'https://doi.org/10.1/x'
+    assert pub.links.extra == {'project': 'https://example.org'}
+    assert pub.to_dict() == {'title': 'Spiking networks on memristors',
+                             'authors': 'Shengbo Wang, Chenyu Tang', 'venue': 'Nature Communications',
+                             'year': 2024, 'type': 'journal',
+                             'links': {'doi': 'https://doi.org/10.1/x', 'project': 'https://example.org'},
+                             'volume': '12', 'note': 'kept as is'}
+
+def test_every_violation_is_reported_with_its_line(tmp_path):
+    filename = write(tmp_path, INVALID)
+    errors = validate_file(filename)
+    assert [line for line, _ in errors] == [4, 7, 8, 10]  # a mapping is reported where it starts
+    assert 'title is missing' in errors[0][1]
+    assert 'year' in errors[1][1] and 'type' in errors[2][1] and 'links' in errors[3][1]
+    with pytest.raises(SchemaError) as e:
+        load_records(filename)
+    assert e.value.errors == errors
@@ -0,0 +1,45 @@
+import time
+
+from scholar_cache import ResponseCache, request_key
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+def cache_with_clock(monkeypatch, **options):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return ResponseCache(':memory:', **options), clock
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    cache, clock = cache_with_clock(monkeypatch, ttls={'fill': 60})
+    key = request_key('fill', 'paper')
+    cache.put(key, 'fill', {'title': 'A paper'})
+    clock.now += 59
+    assert cache.contains(key)
+    assert cache.get(key) == {'title': 'A paper'}
+    clock.now += 2
+    assert not cache.contains(key)
+    assert cache.get(key) is None
+    # Kept for --cache-only runs and replay fixtures
+    assert cache.get(key, allow_expired=True) == {'title': 'A paper'}
+    assert (cache.hits, cache.misses) == (2, 1)
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    cache, clock = cache_with_clock(monkeypatch)
+    keys = [request_key('fill', f'paper {i}') for i in range(3)]
+    for key in keys[:2]:
+        clock.now += 1
+        cache.put(key, 'fill', {'title': key})
+    size = cache._db.execute('SELECT MAX(size) FROM responses').fetchone()[0]
+    cache.max_bytes = 2 * size + size // 2
+    clock.now += 1
+    cache.get(keys[0])  # now used more recently than keys[1]
+    clock.now += 1
+    cache.put(keys[2], 'fill', {'title': keys[2]})
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
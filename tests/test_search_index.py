@@ -0,0 +1,23 @@
+from search_index import build_search_index, page_digest
+
+PUBS = [
+    {'title': 'Spiking networks on memristors', 'authors': 'Shengbo Wang, Chenyu Tang',
+     'venue': 'Nature Communications', 'year': 2024, 'type': 'journal', 'links': None},
+    {'title': 'Reservoir computing at the edge', 'authors': 'Shuo Gao',
+     'venue': '', 'year': 2025, 'type': 'preprint', 'links': {'pdf': 'https://arxiv.org/abs/1'}},
+]
+
+def test_index_records_the_page_digest():
+    index = build_search_index(PUBS)
+    assert index['count'] == 2
+    assert index['digest'] == page_digest(PUBS)
+
+def test_hand_edits_change_the_digest():
+    edited = [dict(PUBS[0], title='Spiking networks on memristor crossbars'), PUBS[1]]
+    assert page_digest(edited) != page_digest(PUBS)
+    retyped = [PUBS[0], dict(PUBS[1], type='conference')]
+    assert page_digest(retyped) != page_digest(PUBS)
+
+def test_markup_does_not_change_the_digest():
+    bold = [dict(PUBS[0], authors='<strong>Shengbo Wang</strong>, Chenyu Tang'), PUBS[1]]
+    assert page_digest(bold) == page_digest(PUBS)
@@ -0,0 +1,67 @@
+import yaml
+
+from pub_io import load_yaml, save_yaml
+from publication_pipeline import Pipeline, build_stages
+from watch_publications import PublicationWatcher, parse_args
+
+ENTRY = {'title': 'Deep learning', 'authors': 'Yann LeCun, Ian McDonald', 'venue': 'Nature',
+         'year': 2015, 'type': 'journal', 'links': None}
+
+def watcher(path):
+    return PublicationWatcher(str(path), Pipeline(build_stages(people={})), search_index=None,
+                              fragments=False, export_dir=None)
+
+def test_fields_the_user_did_not_edit_are_kept(tmp_path):
+    path = tmp_path / 'publications.yml'
+    # Not how normalize_authors would write it, but that is what the user typed
+    save_yaml({'publications': [dict(ENTRY, authors='LeCun, Yann and McDonald, Ian')]}, str(path))
+    w = watcher(path)
+    w.refresh()
+    save_yaml({'publications': [dict(ENTRY, authors='LeCun, Yann and McDonald, Ian', year=2016)]},
+              str(path))
+    w.refresh()
+    (pub,) = load_yaml(str(path))['publications']
+    assert pub['authors'] == 'LeCun, Yann and McDonald, Ian'
+    assert pub['year'] == 2016
+
+def test_edited_and_new_entries_go_through_the_stages(tmp_path):
+    path = tmp_path / 'publications.yml'
+    save_yaml({'publications': [ENTRY]}, str(path))
+    w = watcher(path)
+    w.refresh()
+    added = {'title': 'Neuromorphic sensing', 'authors': 'Shengbo Wang and Chenyu Tang', 'venue': '',
+             'year': 2024, 'type': None, 'links': {'arxiv': 'https://arxiv.org/abs/2401.00001'}}
+    save_yaml({'publications': [dict(ENTRY, authors='Yann LeCun and Ian McDonald'), added]}, str(path))
+    assert w.refresh() == (2, 2)
+    edited, new = load_yaml(str(path))['publications']
+    assert edited['authors'] == 'Yann LeCun, Ian McDonald'
+    assert edited['author_list'][0] == {'given': 'Yann', 'family': 'LeCun'}
+    assert new['authors'] == 'Shengbo Wang, Chenyu Tang'
+    assert new['venue'] and new['type'] == 'preprint'
+
+def test_documents_that_are_not_a_mapping_are_reported(tmp_path, capsys):
+    path = tmp_path / 'publications.yml'
+    path.write_text(yaml.safe_dump([ENTRY]))
+    assert watcher(path).refresh() is None
+    assert 'must be a mapping' in capsys.readouterr().out
+
+def test_run_survives_a_failed_refresh(tmp_path, capsys, monkeypatch):
+    path = tmp_path / 'publications.yml'
+    save_yaml({'publications': [ENTRY]}, str(path))
+    w = watcher(path)
+    polls = iter([OSError('disk full'), KeyboardInterrupt()])
+
+    def poll():
+        raise next(polls)
+    monkeypatch.setattr(w, 'poll', poll)
+    try:
+        w.run(interval=0)
+    except KeyboardInterrupt:
+        pass
+    assert 'failed: OSError: disk full' in capsys.readouterr().out
+
+def test_watching_another_file_leaves_the_site_alone():
+    args = parse_args(['--file', '/tmp/publications.yml'])
+    assert args.no_search_index and args.no_fragments and args.no_export
+    args = parse_args([])
+    assert not (args.no_search_index or args.no_fragments or args.no_export)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Venue detection shared by the publication scripts.
+Maps publisher URLs to journal/conference names and classifies publication types.
+The URL rules are loaded from venue_rules.yml.
+"""
+
+import os
+import re
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from pub_io import load_yaml
+
+VENUE_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'venue_rules.yml')
+
+# Path segments that never name a journal
+GENERIC_PATH_PARTS = {'journals', 'journal', 'articles', 'article'}
+
+class VenueResolver:
+    """Resolves publisher URLs to venue names with rules compiled once
+
+    Host rules live in a trie keyed by reversed domain labels, so a lookup
+    costs one dict step per label no matter how many rules there are. The
+    path rules that apply to a host are folded into a single alternation
+    regex with one named group per rule, compiled when the rules are loaded.
+    """
+
+    def __init__(self, hosts=None, paths=None):
+        self._trie = {}
+        self._node_rules = []
+        # Venues only ever guessed from the host: publisher names such as "IEEE"
+        self.host_venues = set((hosts or {}).values()) - {rule['venue'] for rule in paths or []}
+        for domain, venue in (hosts or {}).items():
+            self._node(domain)['venue'] = venue
+        for index, rule in enumerate(paths or []):
+            re.compile(rule['pattern'])  # Fail on bad rules at load time, not per URL
+            self._node(rule['host']).setdefault('rules', []).append((index, rule))
+        self._compile(self._trie, [])
+        self._lookup_host = lru_cache(maxsize=4096)(self._lookup_host)
+
+    @classmethod
+    def from_file(cls, filename=VENUE_RULES_FILE):
+        """Load rules from a YAML file with `hosts` and `paths` sections"""
+        rules = load_yaml(filename) or {}
+        return cls(rules.get('hosts'), rules.get('paths'))
+
+    def _node(self, domain):
+        node = self._trie
+        for label in reversed(domain.lower().strip('.').split('.')):
+            node = node.setdefault('children', {}).setdefault(label, {})
+        return node
+
+    def _compile(self, node, inherited):
+        # Rules of a parent domain also apply to its subdomains
+        rules = sorted(inherited + node.get('rules', []), key=lambda r: r[0])
+        if rules:
+            # Anchored alternation: the earliest rule in the file that matches wins
+            alternatives = '|'.join(f"(?P<r{i}>.*?(?:{rule['pattern']}))" for i, rule in rules)
+            node['matcher'] = re.compile(f"^(?:{alternatives})", re.IGNORECASE | re.DOTALL)
+            node['venues'] = {f"r{i}": rule['venue'] for i, rule in rules}
+        for child in node.get('children', {}).values():
+            self._compile(child, rules)
+
+    def _lookup_host(self, host):
+        """(host venue, path matcher node) for the most specific matching domain"""
+        venue, matcher_node = None, None
+        node = self._trie
+        for label in reversed(host.split('.')):
+            node = node.get('children', {}).get(label)
+            if node is None:
+                break
+            venue = node.get('venue', venue)
+            if 'matcher' in node:
+                matcher_node = node
+        return venue, matcher_node
+
+    def resolve(self, url):
+        """Venue name for a URL, or None"""
+        if not url:
+            return None
+        
+        parsed = urlparse(url)
+        host = (parsed.hostname or '').lower()
+        
+        venue, matcher_node = self._lookup_host(host)
+        if matcher_node is not None:
+            rest = parsed.path + ('?' + parsed.query if parsed.query else '')
+            match = matcher_node['matcher'].match(rest)
+            if match:
+                return matcher_node['venues'][match.lastgroup]
+        if venue:
+            return venue
+        
+        # Try to extract from path
+        path = parsed.path.lower()
+        if 'journal' in path:
+            # Try to extract journal name from path
+            parts = [p for p in path.split('/') if p and p not in GENERIC_PATH_PARTS]
+            if parts:
+                # Capitalize first letter of each word
+                return ' '.join(word.capitalize() for word in parts[0].replace('-', ' ').split())
+        
+        return None
+
+_default_resolver = None
+
+def default_resolver():
+    """The resolver for venue_rules.yml, loaded on first use"""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = VenueResolver.from_file()
+    return _default_resolver
+
+def extract_venue_from_url(url):
+    """Extract venue name from URL"""
+    try:
+        return default_resolver().resolve(url)
+    except ValueError as e:
+        print(f"  Error parsing URL {url}: {e}")
+        return None
+
+def venue_from_links(links):
+    """Guess the venue from a publication's links"""
+    if not links:
+        return None
+    if links.get('pdf'):
+        return extract_venue_from_url(links['pdf'])
+    if links.get('arxiv'):
+        return 'arXiv preprint'
+    if links.get('doi'):
+        return extract_venue_from_url(links['doi'])
+    return None
+
+def classify_type(venue):
+    """Publication type (journal, conference or preprint) implied by a venue name"""
+    venue_lower = (venue or '').lower()
+    if any(word in venue_lower for word in ['conference', 'proceedings', 'workshop']):
+        return "conference"
+    if any(word in venue_lower for word in ['arxiv', 'preprint']):
+        return "preprint"
+    return "journal"
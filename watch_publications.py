@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Watch publications.yml and keep everything derived from it up to date.
+Polls the file's mtime and size a few times a second. On a change, only the
+entries whose content changed are run through the pipeline stages (authors,
+venue, highlighting, type), and a stage may only touch the fields that were
+edited, added or left empty; hand-written text elsewhere is never rewritten.
+The YAML is written back only when a stage actually changed one of them, and
+then the search index, page fragments and citation exports are refreshed.
+All of those are skipped when their contents would not change, so a `jekyll
+serve` preview picks up an edit within a second. Watching a file other than
+_data/publications.yml leaves them alone (bar an explicit --search-index).
+Usage: python watch_publications.py [--file FILE] [--interval SECONDS] [--stages a,b,...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import yaml
+
+from export_citations import EXPORT_DIR, export_citations
+from pub_io import PUBLICATIONS_FILE, SafeLoader, is_site_file, save_yaml
+from publication_pipeline import STAGE_ORDER, Pipeline, build_stages
+from records import validate_entry, validate_file
+from render_publications import write_fragments
+from search_index import SEARCH_INDEX_FILE, write_search_index
+
+DEFAULT_INTERVAL = 0.25  # seconds between stat() polls
+
+# Fields the stages derive from another one; they follow their source's edits
+DERIVED_FIELDS = {'author_list': 'authors', 'members': 'authors'}
+
+def entry_hash(pub):
+    """Content hash of one entry, independent of key order"""
+    return hashlib.sha1(json.dumps(pub, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def edited_fields(pub, previous):
+    """Fields of `pub` that differ from its previous version (all of them for a new entry)"""
+    if previous is None:
+        return set(pub)
+    return {key for key in set(pub) | set(previous) if pub.get(key) != previous.get(key)}
+
+def previous_version(pub, index, replaced):
+    """The entry of `replaced` ([(index, entry)]) that `pub` took the place of, or None"""
+    for i, old in replaced:
+        if old.get('title') == pub.get('title'):
+            return old
+    return next((old for i, old in replaced if i == index), None)
+
+def apply_stages(pub, processed, edited):
+    """`pub` with the stage output for the fields the user edited, added or left empty"""
+    result = dict(pub)
+    for key in set(pub) | set(processed):
+        if not (key in edited or DERIVED_FIELDS.get(key) in edited
+                or pub.get(key) is None or pub.get(key) == ''):
+            continue
+        if key in processed:
+            result[key] = processed[key]
+        else:
+            result.pop(key)
+    return result
+
+class PublicationWatcher:
+    """Re-processes the changed entries of a publications file and refreshes derived files
+
+    Entries are identified by content, so an edit, an insertion or a moved
+    entry only costs the entries that are actually new. An edited entry is
+    paired with the entry it replaced (same title, else same position) to see
+    which of its fields the user changed.
+    """
+
+    def __init__(self, filename=PUBLICATIONS_FILE, pipeline=None, search_index=SEARCH_INDEX_FILE,
+                 fragments=True, export_dir=EXPORT_DIR):
+        self.filename = filename
+        self.pipeline = pipeline or Pipeline()
+        self.search_index = search_index
+        self.fragments = fragments
+        self.export_dir = export_dir
+        self._signature = None
+        self._digest = None
+        self._hashes = None
+        self._entries = None  # the publications as of the last refresh
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self):
+        """Refresh if the file changed since the last poll; returns refresh()'s result or None"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        return self.refresh()
+
+    def refresh(self):
+        """Process the current file; returns (entries processed, entries changed by stages)
+
+        The first call only records what is there and brings the derived
+        files up to date. Returns None if the contents are what we last saw
+        or wrote (e.g. our own write-back), or the file does not parse or
+        match the publication schema yet (the violations are printed).
+        """
+        with open(self.filename, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha1(raw).hexdigest()
+        if digest == self._digest:
+            return None
+        try:
+            data = yaml.load(raw.decode('utf-8'), Loader=SafeLoader) or {}
+        except yaml.YAMLError as e:
+            # Usually a save in the middle of an edit; the next save fixes it
+            print(f"  ✗ {self.filename} does not parse yet: {e}")
+            return None
+        publications = (data.get('publications') or []) if isinstance(data, dict) else None
+        if not isinstance(publications, list):
+            print(f"  ✗ {self.filename} must be a mapping with a list of publications")
+            return None
+        self._digest = digest
+
+        hashes = [entry_hash(pub) for pub in publications]
+        known = set(self._hashes or ())
+        new = [i for i, h in enumerate(hashes) if h not in known]
+        if any(validate_entry(publications[i]) for i in new):
+            # Line numbers take another pass over the file, only paid for when something is wrong
+            for line, message in validate_file(self.filename):
+                print(f"  ✗ {self.filename}:{line}: {message}")
+            return None
+        pending = new if self._hashes is not None else []
+
+        # Entries of the last refresh that are gone now, i.e. were edited or removed
+        current = set(hashes)
+        replaced = [(i, old) for i, old in enumerate(self._entries or [])
+                    if isinstance(old, dict) and entry_hash(old) not in current]
+        fixed = 0
+        for i in pending:
+            processed = self.pipeline.process(dict(publications[i]))
+            if processed is None:
+                continue
+            previous = previous_version(publications[i], i, replaced)
+            processed = apply_stages(publications[i], processed, edited_fields(publications[i], previous))
+            if entry_hash(processed) != hashes[i]:
+                publications[i] = processed
+                hashes[i] = entry_hash(processed)
+                fixed += 1
+        if fixed:
+            save_yaml(data, self.filename)
+            with open(self.filename, 'rb') as f:
+                self._digest = hashlib.sha1(f.read()).hexdigest()
+            self._signature = self._stat()
+        self._hashes = hashes
+        self._entries = publications
+
+        if self.search_index:
+            write_search_index(publications, self.search_index)
+        if self.fragments:
+            write_fragments(publications)
+        if self.export_dir:
+            export_citations(publications, self.export_dir)
+        return len(pending), fixed
+
+    def run(self, interval=DEFAULT_INTERVAL):
+        """Poll until interrupted; a failed refresh is reported and retried on the next save"""
+        while True:
+            start = time.perf_counter()
+            try:
+                result = self.poll()
+            except Exception as e:
+                print(f"  ✗ Refresh of {self.filename} failed: {type(e).__name__}: {e}")
+                self._digest = None
+                result = None
+            if result is not None:
+                processed, fixed = result
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"{time.strftime('%H:%M:%S')}  {processed} changed entr{'y' if processed == 1 else 'ies'}, "
+                      f"{fixed} fixed up, derived files refreshed in {elapsed:.0f} ms")
+            time.sleep(interval)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate derived data whenever publications.yml changes")
+    parser.add_argument('--file', default=PUBLICATIONS_FILE,
+                        help=f"publications YAML to watch (default: {PUBLICATIONS_FILE})")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f"seconds between checks (default: {DEFAULT_INTERVAL})")
+    parser.add_argument('--stages', default=','.join(STAGE_ORDER),
+                        help=f"stages to run on changed entries (default: {','.join(STAGE_ORDER)})")
+    parser.add_argument('--search-index',
+                        help=f"search index to refresh (default: {SEARCH_INDEX_FILE}; "
+                             f"none when watching another file than {PUBLICATIONS_FILE})")
+    parser.add_argument('--no-search-index', action='store_true', help="do not refresh the search index")
+    parser.add_argument('--no-fragments', action='store_true', help="do not re-render the page fragments")
+    parser.add_argument('--no-export', action='store_true', help="do not refresh the citation exports")
+    args = parser.parse_args(argv)
+    if not is_site_file(args.file):
+        # Not the site's list: its fragments and exports stay as they are
+        args.no_fragments = args.no_export = True
+        args.no_search_index = args.no_search_index or args.search_index is None
+    args.search_index = args.search_index or SEARCH_INDEX_FILE
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    watcher = PublicationWatcher(
+        args.file, Pipeline(build_stages([s for s in args.stages.split(',') if s])),
+        search_index=None if args.no_search_index else args.search_index,
+        fragments=not args.no_fragments, export_dir=None if args.no_export else EXPORT_DIR)
+    print(f"Watching {args.file} (Ctrl-C to stop)")
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped.")